@@ -0,0 +1,70 @@
+"""Benchmark per-row vs factorized string feature computation.
+
+Compares hashing every row with hashing each distinct value once
+(pd.factorize + broadcast) on low- and high-cardinality inputs.
+
+Usage:
+    python benchmarks/bench_factorize.py --rows 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from src.data.load import generate_sample_data
+from src.data.preprocess import preprocess_data
+from src.features.build_features import _hash_column, build_features, hash_feature
+
+STRING_COLUMNS = ["seller_id", "brand", "subcategory"]
+
+
+def make_scenarios(n_rows: int) -> dict:
+    """Low-cardinality (synthetic default) and high-cardinality variants."""
+    low = preprocess_data(generate_sample_data(n_samples=n_rows))
+    low["title"] = low["title"].str.rsplit(" ", n=1).str[0]
+
+    high = low.copy()
+    high["seller_id"] = [f"SELLER_{i:09d}" for i in range(n_rows)]
+    high["title"] = high["title"] + " " + np.arange(n_rows).astype(str)
+    return {"low": low, "high": high}
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'scenario':>9} {'unique sellers':>15} {'unique titles':>14} "
+        f"{'per-row hash':>13} {'factorized':>11} {'build_features':>15}"
+    )
+    for name, data in make_scenarios(args.rows).items():
+        per_row = timed(
+            lambda: [data[col].apply(hash_feature) for col in STRING_COLUMNS]
+        )
+        factorized = timed(
+            lambda: [_hash_column(data[col], 1000) for col in STRING_COLUMNS]
+        )
+        total = timed(lambda: build_features(data))
+        print(
+            f"{name:>9} {data['seller_id'].nunique():>15,} "
+            f"{data['title'].nunique():>14,} {per_row:>12.2f}s "
+            f"{factorized:>10.2f}s {total:>14.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
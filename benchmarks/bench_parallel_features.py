@@ -0,0 +1,59 @@
+"""Benchmark build_features_parallel scaling from 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_parallel_features.py --rows 1000000 --max-jobs 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.load import generate_sample_data
+from src.data.preprocess import preprocess_data
+from src.features.build_features import build_features
+from src.features.parallel import build_features_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows} rows...")
+    data = preprocess_data(generate_sample_data(n_samples=args.rows))
+
+    start = time.perf_counter()
+    build_features(data)
+    serial_time = time.perf_counter() - start
+    print(f"build_features (serial): {serial_time:.2f}s")
+
+    jobs = [1]
+    while jobs[-1] * 2 <= args.max_jobs:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != args.max_jobs:
+        jobs.append(args.max_jobs)
+
+    print(f"\n{'n_jobs':>6} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    for n_jobs in jobs:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            build_features_parallel(data, n_jobs=n_jobs, min_rows_per_shard=1)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        print(
+            f"{n_jobs:>6} {best:>9.2f} {len(data) / best:>12,.0f} "
+            f"{serial_time / best:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark object vs Arrow-backed vs categorical string columns.
+
+Writes a synthetic Parquet dataset, then for each string_dtype loads it with
+load_data, runs preprocess_data and build_features, and reports the frame
+memory (DataFrame.memory_usage(deep=True)) and the time of each step.
+
+Results on a 1-CPU, 5 GB container with 2,000,000 rows. A 10M-row
+object frame plus the copies made along the way does not fit in 5 GB, so
+10M rows were not measured here; frame memory and the per-step times grow
+linearly with rows, about 5x the figures below:
+
+        dtype     memory    load  preprocess  build_features
+       object     862 MB   2.40s       3.05s          15.33s
+      pyarrow     470 MB   2.67s       2.70s           7.33s
+     category     368 MB   2.89s       2.94s           6.21s
+
+string[pyarrow] roughly halves the frame, and categoricals for the
+low-cardinality brand, seller_id and subcategory columns save another
+fifth. Loading costs about the same since Parquet strings are wrapped
+without going through Python objects. build_features is about twice as fast
+because the title keyword and length features run on Arrow kernels.
+Timings vary by about 20% between runs.
+
+Usage:
+    python benchmarks/bench_string_dtype.py --rows 2000000
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.load import load_data
+from src.data.preprocess import preprocess_data
+from src.data.synthetic import generate_to_files
+from src.features.build_features import build_features
+
+STRING_DTYPES = [None, "pyarrow", "category"]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generate_to_files(args.rows, temp_dir, n_jobs=1)
+
+        print(
+            f"{'dtype':>9} {'memory':>10} {'load':>7} {'preprocess':>11} "
+            f"{'build_features':>15}"
+        )
+        for string_dtype in STRING_DTYPES:
+            data, load_time = timed(
+                lambda: load_data(
+                    temp_dir, auto_generate=False, string_dtype=string_dtype
+                )
+            )
+            memory_mb = data.memory_usage(deep=True).sum() / 1e6
+            data, preprocess_time = timed(lambda: preprocess_data(data, inplace=True))
+            _, features_time = timed(lambda: build_features(data))
+            print(
+                f"{string_dtype or 'object':>9} {memory_mb:>7.0f} MB "
+                f"{load_time:>6.2f}s {preprocess_time:>10.2f}s "
+                f"{features_time:>14.2f}s"
+            )
+            del data
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
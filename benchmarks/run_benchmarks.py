@@ -0,0 +1,181 @@
+"""Feature pipeline micro-benchmark suite with stored baselines.
+
+Times hash_feature, build_features, preprocess_data, split_data and
+rebalance_data on data from generate_sample_data, and records throughput
+(rows/s) and peak traced memory per function and size in a JSON file.
+
+Usage:
+    # Record a baseline
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+
+    # Compare against it (exit code 1 on regressions beyond the threshold)
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+
+from src.data.load import generate_sample_data
+from src.data.preprocess import preprocess_data, split_data
+from src.data.rebalancing import rebalance_data
+from src.features.build_features import build_features, hash_feature
+
+DEFAULT_SIZES = [1, 100, 10_000, 1_000_000, 10_000_000]
+
+
+def _imbalanced(features: pd.DataFrame, y: pd.Series):
+    """Keep every row of half the classes and 1 in 5 rows of the others."""
+    classes = sorted(y.unique())
+    rare = y.isin(classes[: len(classes) // 2])
+    keep = ~rare | (pd.Series(range(len(y)), index=y.index) % 5 == 0)
+    return features[keep], y[keep]
+
+
+def make_cases(n_rows: int) -> Dict[str, Callable[[], Any]]:
+    """Benchmark callables for one dataset size (setup is not timed)."""
+    raw = generate_sample_data(n_samples=n_rows)
+    processed = preprocess_data(raw)
+    features = build_features(processed)
+    labelled = features.assign(category=processed["category"])
+    X_imb, y_imb = _imbalanced(features, processed["category"])
+    sellers = processed["seller_id"].tolist()
+
+    return {
+        "hash_feature": lambda: [hash_feature(value) for value in sellers],
+        "build_features": lambda: build_features(processed),
+        "preprocess_data": lambda: preprocess_data(raw),
+        "split_data": lambda: split_data(labelled),
+        "rebalance_data": lambda: rebalance_data(X_imb, y_imb, method="oversample"),
+    }
+
+
+def measure(func: Callable[[], Any], n_rows: int, repeat: int) -> Dict[str, float]:
+    """Best-of-repeat throughput, then one traced run for peak memory."""
+    times = []
+    # Pipeline functions print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    best = min(times)
+
+    return {
+        "seconds": best,
+        "rows_per_s": n_rows / best if best > 0 else float("inf"),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def run_suite(sizes: List[int], repeat: int, only: List[str] = None) -> Dict:
+    """Run all benchmarks and return results keyed by benchmark and size."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for n_rows in sizes:
+        print(f"\n--- {n_rows:,} rows ---")
+        for name, func in make_cases(n_rows).items():
+            if only and name not in only:
+                continue
+            try:
+                stats = measure(func, n_rows, repeat)
+            except ValueError as e:
+                # e.g. stratified split_data needs at least 2 rows per class
+                stats = {"skipped": str(e)}
+                print(f"{name:>16}: skipped ({e})")
+            else:
+                print(
+                    f"{name:>16}: {stats['rows_per_s']:>14,.0f} rows/s "
+                    f"{stats['peak_mb']:>10.1f} MB peak"
+                )
+            results.setdefault(name, {})[str(n_rows)] = stats
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """List regressions where throughput dropped or memory grew beyond threshold."""
+    regressions = []
+    for name, sizes in current.items():
+        for size, stats in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if not base or "skipped" in base or "skipped" in stats:
+                continue
+            slowdown = 1 - stats["rows_per_s"] / base["rows_per_s"]
+            growth = stats["peak_mb"] / base["peak_mb"] - 1 if base["peak_mb"] else 0
+            if slowdown > threshold:
+                regressions.append(
+                    f"{name} @ {size} rows: throughput -{slowdown:.0%} "
+                    f"({base['rows_per_s']:,.0f} -> {stats['rows_per_s']:,.0f} rows/s)"
+                )
+            if growth > threshold:
+                regressions.append(
+                    f"{name} @ {size} rows: peak memory +{growth:.0%} "
+                    f"({base['peak_mb']:.1f} -> {stats['peak_mb']:.1f} MB)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only these benchmarks")
+    parser.add_argument("--output", help="Write results to this baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative change that counts as a regression (default 0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeat, args.only)
+
+    if args.output:
+        payload = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "pandas": pd.__version__,
+            },
+            "results": results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\n✓ Baseline written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
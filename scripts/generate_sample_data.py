@@ -1,4 +1,19 @@
-"""Script to generate sample data for testing."""
+"""Script to generate sample data for testing.
+
+By default writes 10,000 rows to data/raw/products.csv. With --output-dir,
+large datasets are generated shard by shard in worker processes and streamed
+to part files. The default load_data() only reads files directly in data/raw,
+so pass the directory to read the parts as one dataset:
+
+    python scripts/generate_sample_data.py --n-samples 100000000 --output-dir data/raw/products
+    load_data("data/raw/products")
+
+--profile skewed, --drift and --period shape the data for cache and drift
+benchmarks, and --requests writes a replayable JSONL request stream instead:
+
+    python scripts/generate_sample_data.py --profile skewed --drift new_brands --period 3 --requests data/cache/requests.jsonl --repeat-ratio 0.3
+"""
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -10,16 +25,79 @@ sys.path.insert(0, str(project_root))
 # Set PYTHONPATH environment variable
 os.environ['PYTHONPATH'] = str(project_root)
 
-from src.data.load import generate_sample_data
+from src.data.synthetic import (
+    DEFAULT_SHARD_SIZE,
+    DRIFT_SCENARIOS,
+    SKEWED_PROFILE,
+    generate_products,
+    generate_request_stream,
+    generate_to_files,
+    resolve_profile,
+)
 import pandas as pd
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-samples", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Write sharded part files here instead of data/raw/products.csv",
+    )
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--profile", choices=["uniform", "skewed"], default="uniform")
+    parser.add_argument("--drift", choices=sorted(DRIFT_SCENARIOS), default=None)
+    parser.add_argument("--period", type=int, default=0)
+    parser.add_argument(
+        "--requests",
+        default=None,
+        help="Write a JSONL request stream of --n-samples requests to this path",
+    )
+    parser.add_argument("--repeat-ratio", type=float, default=0.0)
+    return parser.parse_args()
+
+
 def main():
     """Generate sample data and save to data/raw/"""
+    args = parse_args()
+    profile = resolve_profile(
+        SKEWED_PROFILE if args.profile == "skewed" else None, args.drift
+    )
+
+    if args.requests:
+        generate_request_stream(
+            args.n_samples,
+            args.requests,
+            seed=args.seed,
+            profile=profile,
+            period=args.period,
+            repeat_ratio=args.repeat_ratio,
+        )
+        return
+
+    if args.output_dir:
+        # Output depends only on seed and shard size, not on --n-jobs
+        generate_to_files(
+            args.n_samples,
+            args.output_dir,
+            seed=args.seed,
+            shard_size=args.shard_size,
+            n_jobs=args.n_jobs,
+            file_format=args.format,
+            profile=profile,
+            period=args.period,
+        )
+        return
+
     print("Generating sample product data...")
     
-    # Generate 10,000 samples
-    data = generate_sample_data(n_samples=10000)
+    data = generate_products(
+        args.n_samples, seed=args.seed, profile=profile, period=args.period
+    )
     
     # Save to data/raw/
     output_path = Path(__file__).parent.parent / "data" / "raw" / "products.csv"
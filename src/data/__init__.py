@@ -1,12 +1,33 @@
 """Data loading and preprocessing modules."""
 
-from src.data.load import generate_sample_data, load_data, save_data
+from src.data.download import download_dataset
+from src.data.ingest import IngestStore
+from src.data.load import (
+    apply_string_dtype,
+    discover_partitions,
+    generate_sample_data,
+    iter_data_chunks,
+    load_data,
+    load_partitioned,
+    read_dataset,
+    save_data,
+)
 from src.data.preprocess import preprocess_data, split_data
+from src.data.splits import DatasetSplit, load_or_create_splits
 
 __all__ = [
     "load_data",
+    "load_partitioned",
+    "discover_partitions",
+    "read_dataset",
+    "apply_string_dtype",
+    "iter_data_chunks",
     "generate_sample_data",
     "save_data",
+    "download_dataset",
+    "IngestStore",
     "preprocess_data",
     "split_data",
+    "DatasetSplit",
+    "load_or_create_splits",
 ]
@@ -0,0 +1,117 @@
+"""Binary cache for parsed raw datasets."""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = "data/cache"
+
+# Process-wide counters, reported by get_cache_stats()
+_stats: Dict[str, Any] = {"hits": 0, "misses": 0, "seconds_saved": 0.0}
+_stats_lock = threading.Lock()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Cache hits, misses and parse time saved by hits in this process."""
+    return dict(_stats)
+
+
+def file_content_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """BLAKE2b digest of a file's contents, read in blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(file_path: Path, cache_dir: Path):
+    """Cache data and metadata paths for a source file."""
+    path_key = hashlib.sha256(str(file_path.resolve()).encode()).hexdigest()[:16]
+    stem = f"{file_path.stem}-{path_key}"
+    return cache_dir / f"{stem}.feather", cache_dir / f"{stem}.json"
+
+
+def load_csv_cached(file_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Load a CSV file through a Feather (Arrow IPC) cache.
+
+    The cache is keyed on the source path. It is valid while the source has
+    the same size and mtime; if only the mtime changed, the content hash
+    decides. Hits are read memory-mapped; misses parse the CSV and rewrite
+    the cache.
+
+    Args:
+        file_path: Path to the CSV file
+        cache_dir: Directory for cache files
+
+    Returns:
+        Parsed DataFrame
+    """
+    source = Path(file_path)
+    cache_path, meta_path = _cache_paths(source, Path(cache_dir))
+    stat = source.stat()
+
+    meta = None
+    if cache_path.exists() and meta_path.exists():
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    valid = False
+    if meta is not None and meta["size"] == stat.st_size:
+        if meta["mtime_ns"] == stat.st_mtime_ns:
+            valid = True
+        elif meta["content_hash"] == file_content_hash(file_path):
+            # Touched but unchanged: refresh the mtime and keep the cache
+            meta["mtime_ns"] = stat.st_mtime_ns
+            with open(meta_path, "w") as f:
+                json.dump(meta, f, indent=2)
+            valid = True
+
+    if valid:
+        import pyarrow.feather as feather
+
+        start = time.perf_counter()
+        data = feather.read_table(str(cache_path), memory_map=True).to_pandas()
+        elapsed = time.perf_counter() - start
+        saved = max(meta["parse_seconds"] - elapsed, 0.0)
+        with _stats_lock:
+            _stats["hits"] += 1
+            _stats["seconds_saved"] += saved
+        print(
+            f"✓ Cache hit: {cache_path.name} read in {elapsed:.2f}s "
+            f"(CSV parse took {meta['parse_seconds']:.2f}s, saved {saved:.2f}s)"
+        )
+        return data
+
+    start = time.perf_counter()
+    data = pd.read_csv(file_path)
+    parse_seconds = time.perf_counter() - start
+    with _stats_lock:
+        _stats["misses"] += 1
+    print(f"Cache miss: parsed {source.name} in {parse_seconds:.2f}s")
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data.reset_index(drop=True).to_feather(cache_path, compression="uncompressed")
+        with open(meta_path, "w") as f:
+            json.dump(
+                {
+                    "source": str(source.resolve()),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "content_hash": file_content_hash(file_path),
+                    "parse_seconds": parse_seconds,
+                },
+                f,
+                indent=2,
+            )
+    except Exception as e:
+        print(f"Warning: could not write dataset cache: {e}")
+
+    return data
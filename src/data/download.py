@@ -0,0 +1,234 @@
+"""Streaming, resumable dataset downloads into a content-addressed cache."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_DOWNLOAD_DIR = "data/cache/downloads"
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Suffixes decompressed on the fly with decompress="auto"
+GZIP_SUFFIXES = (".gz", ".gzip")
+
+_index_lock = threading.Lock()
+
+
+def _url_key(url: str) -> str:
+    """Stable file name stem for a URL's partial download."""
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def _read_index(cache_dir: Path) -> Dict[str, Dict]:
+    """URL -> cache entry mapping stored in cache_dir/urls.json."""
+    index_path = cache_dir / "urls.json"
+    if not index_path.exists():
+        return {}
+    with open(index_path) as f:
+        return json.load(f)
+
+
+def _update_index(cache_dir: Path, url: str, entry: Dict) -> None:
+    """Record a finished download, replacing urls.json atomically."""
+    with _index_lock:
+        index = _read_index(cache_dir)
+        index[url] = entry
+        tmp_path = cache_dir / "urls.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        tmp_path.replace(cache_dir / "urls.json")
+
+
+def _open(url: str, offset: int, timeout: float):
+    """
+    Open url for reading from byte offset.
+
+    Returns:
+        (stream, resumed, total_size) where resumed is False if the source
+        ignored the range and sends the whole file again, and total_size is
+        the size of the whole file (None when unknown)
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        # Local stand-in for an HTTP server with range support
+        path = urllib.request.url2pathname(parsed.path)
+        stream = open(path, "rb")
+        stream.seek(offset)
+        return stream, True, os.path.getsize(path)
+
+    request = urllib.request.Request(url)
+    if offset > 0:
+        request.add_header("Range", f"bytes={offset}-")
+    response = urllib.request.urlopen(request, timeout=timeout)
+    resumed = offset > 0 and response.status == 206
+    total_size = None
+    content_range = response.headers.get("Content-Range", "")
+    content_length = response.headers.get("Content-Length")
+    if resumed and content_range.rpartition("/")[2].isdigit():
+        total_size = int(content_range.rpartition("/")[2])
+    elif content_length is not None:
+        total_size = int(content_length) + (offset if resumed else 0)
+    return response, resumed, total_size
+
+
+def _stored_suffix(url: str, decompress: bool) -> str:
+    """Suffix of the cached file, e.g. .csv for products.csv.gz."""
+    name = Path(urlparse(url).path).name
+    if decompress and name.lower().endswith(GZIP_SUFFIXES):
+        name = name[: name.rfind(".")]
+    return Path(name).suffix.lower() or ".csv"
+
+
+def download_dataset(
+    url: str,
+    cache_dir: str = DEFAULT_DOWNLOAD_DIR,
+    sha256: Optional[str] = None,
+    decompress: str = "auto",
+    refresh: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timeout: float = 60.0,
+) -> Path:
+    """
+    Download a dataset into a content-addressed cache.
+
+    The file is streamed in chunk_size blocks, never held in memory. Raw
+    bytes go to a .part file in cache_dir/partial, so an interrupted download
+    continues with an HTTP Range request the next time (servers that ignore
+    the range send the whole file and the download starts over). Gzip files
+    are decompressed while they stream in.
+
+    The finished file is stored as cache_dir/<sha256 of contents><suffix>,
+    so identical datasets under different URLs share one copy and the path
+    only changes when the contents do. urls.json maps each URL to its file;
+    later calls for the same URL return that file without any network
+    access until refresh=True.
+
+    Args:
+        url: http(s):// or file:// URL of a CSV, Parquet or Feather file,
+            optionally gzip-compressed
+        cache_dir: Directory for cached files
+        sha256: Expected SHA-256 of the bytes as served (before
+            decompression); the download is rejected if it differs
+        decompress: "auto" (gzip by URL suffix), "gzip" or "none"
+        refresh: Download again even if the URL is cached
+        chunk_size: Bytes read per network call
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Path of the cached file
+
+    Raises:
+        IOError: If the connection closed before the whole file arrived (the
+            .part file is kept for the next call)
+        ValueError: If the downloaded bytes do not match sha256
+    """
+    if decompress not in ("auto", "gzip", "none"):
+        raise ValueError(f"Unknown decompress mode: {decompress}")
+    cache_root = Path(cache_dir)
+
+    entry = _read_index(cache_root).get(url)
+    if entry is not None and not refresh:
+        cached_path = cache_root / entry["file"]
+        expected = sha256 is None or sha256.lower() == entry["source_sha256"]
+        if cached_path.exists() and expected:
+            print(f"✓ Using cached download: {cached_path}")
+            return cached_path
+
+    use_gzip = decompress == "gzip" or (
+        decompress == "auto"
+        and Path(urlparse(url).path).name.lower().endswith(GZIP_SUFFIXES)
+    )
+    partial_dir = cache_root / "partial"
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    part_path = partial_dir / f"{_url_key(url)}.part"
+    output_tmp = partial_dir / f"{_url_key(url)}.out"
+    if refresh and part_path.exists():
+        part_path.unlink()
+
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    print(f"Downloading dataset from {url}...")
+    start = time.perf_counter()
+    stream, resumed, total_size = _open(url, offset, timeout)
+    if offset > 0 and not resumed:
+        print("Server ignored the range request, restarting download")
+        offset = 0
+    elif offset > 0:
+        print(f"Resuming download at {offset / 1e6:.1f} MB")
+
+    source_digest = hashlib.sha256()
+    content_digest = hashlib.sha256()
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if use_gzip else None
+
+    def write_output(block: bytes, output) -> None:
+        if decompressor is not None:
+            block = decompressor.decompress(block)
+        content_digest.update(block)
+        output.write(block)
+
+    received = 0
+    with stream, open(part_path, "r+b" if offset else "w+b") as part, open(
+        output_tmp, "wb"
+    ) as output:
+        part.truncate(offset)
+        # Replay the bytes already on disk to rebuild the hashes and output
+        for block in iter(lambda: part.read(chunk_size), b""):
+            source_digest.update(block)
+            write_output(block, output)
+
+        for block in iter(lambda: stream.read(chunk_size), b""):
+            part.write(block)
+            source_digest.update(block)
+            write_output(block, output)
+            received += len(block)
+
+        if decompressor is not None:
+            tail = decompressor.flush()
+            content_digest.update(tail)
+            output.write(tail)
+
+    size = offset + received
+    if total_size is not None and size < total_size:
+        raise IOError(
+            f"Download of {url} stopped at {size} of {total_size} bytes; "
+            "call again to resume"
+        )
+
+    source_sha256 = source_digest.hexdigest()
+    if sha256 is not None and source_sha256 != sha256.lower():
+        part_path.unlink()
+        output_tmp.unlink()
+        raise ValueError(
+            f"Checksum mismatch for {url}: expected {sha256}, got {source_sha256}"
+        )
+
+    content_sha256 = content_digest.hexdigest()
+    cached_path = cache_root / f"{content_sha256}{_stored_suffix(url, use_gzip)}"
+    if cached_path.exists():
+        output_tmp.unlink()
+    else:
+        output_tmp.replace(cached_path)
+    part_path.unlink()
+
+    _update_index(
+        cache_root,
+        url,
+        {
+            "file": cached_path.name,
+            "source_sha256": source_sha256,
+            "content_sha256": content_sha256,
+            "source_size": size,
+            "downloaded_at": time.time(),
+        },
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"✓ Downloaded {received / 1e6:.1f} MB in {elapsed:.2f}s " f"to {cached_path}"
+    )
+    return cached_path
@@ -1,37 +1,311 @@
 """Data loading utilities for e-commerce product classification."""
 
+import glob
 import os
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
 
+from src.data.cache import DEFAULT_CACHE_DIR, load_csv_cached
+from src.data.download import download_dataset
 
-def download_dataset(url: str, output_path: Path) -> bool:
+# Columns the pipeline uses; columnar formats read only these
+PIPELINE_COLUMNS = [
+    "product_id",
+    "title",
+    "seller_id",
+    "brand",
+    "subcategory",
+    "price",
+    "rating",
+    "reviews_count",
+    "category",
+]
+
+# Numeric dtypes applied to columnar reads (string columns stay object).
+# They are the dtypes pd.read_csv infers, so features built from Parquet or
+# Feather match those built from the same data in CSV; integer columns with
+# missing values become float64, as in CSV.
+COLUMN_DTYPES: Dict[str, str] = {
+    "price": "float64",
+    "rating": "float64",
+    "reviews_count": "int64",
+}
+
+# String columns converted by load_data(string_dtype=...)
+STRING_COLUMNS = ["title", "seller_id", "brand", "subcategory"]
+
+# With string_dtype="category", columns with at most this share of distinct
+# values become categoricals; the rest use string[pyarrow]
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+FEATHER_SUFFIXES = (".feather", ".arrow", ".ipc")
+DATA_SUFFIXES = (".csv",) + PARQUET_SUFFIXES + FEATHER_SUFFIXES
+
+
+def _find_data_files(directory: Path) -> List[Path]:
+    """Supported dataset files (CSV, Parquet, Feather) in a directory, sorted."""
+    return sorted(
+        path for path in directory.iterdir() if path.suffix.lower() in DATA_SUFFIXES
+    )
+
+
+def _projected_columns(available: List[str], columns: Optional[List[str]]) -> List[str]:
+    """Requested columns that exist in the file, in file order."""
+    wanted = set(PIPELINE_COLUMNS if columns is None else columns)
+    return [col for col in available if col in wanted]
+
+
+def _apply_schema(data: pd.DataFrame) -> pd.DataFrame:
+    """Cast numeric columns to the COLUMN_DTYPES schema."""
+    dtypes = {
+        col: "float64" if dtype == "int64" and data[col].isna().any() else dtype
+        for col, dtype in COLUMN_DTYPES.items()
+        if col in data
+    }
+    return data.astype(dtypes) if dtypes else data
+
+
+def apply_string_dtype(data: pd.DataFrame, string_dtype: str) -> pd.DataFrame:
     """
-    Download dataset from URL.
+    Convert STRING_COLUMNS to Arrow-backed strings or categoricals.
+
+    Both keep missing values missing, and preprocess_data and build_features
+    work on them without converting back to object.
 
     Args:
-        url: URL to download from
-        output_path: Path where to save the file
+        data: DataFrame with object string columns
+        string_dtype: "pyarrow" for string[pyarrow], or "category" for
+            categoricals on low-cardinality columns (see
+            CATEGORY_MAX_UNIQUE_RATIO) and string[pyarrow] elsewhere
 
     Returns:
-        True if successful, False otherwise
+        DataFrame with converted string columns
+    """
+    if string_dtype not in ("pyarrow", "category"):
+        raise ValueError(f"Unknown string_dtype: {string_dtype}")
+
+    dtypes = {}
+    for col in STRING_COLUMNS:
+        if col not in data.columns:
+            continue
+        low_cardinality = data[col].nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(data)
+        if string_dtype == "category" and low_cardinality:
+            dtypes[col] = "category"
+        else:
+            dtypes[col] = "string[pyarrow]"
+    return data.astype(dtypes) if dtypes else data
+
+
+def _table_to_pandas(table, arrow_strings: bool) -> pd.DataFrame:
+    """
+    Convert a pyarrow Table, optionally keeping STRING_COLUMNS Arrow-backed.
+
+    Wrapping the Arrow string arrays directly avoids building a Python
+    object per value only to convert it back.
+    """
+    if not arrow_strings:
+        return table.to_pandas()
+
+    import pyarrow as pa
+
+    string_columns = [
+        col
+        for col in STRING_COLUMNS
+        if col in table.column_names
+        and (
+            pa.types.is_string(table.schema.field(col).type)
+            or pa.types.is_large_string(table.schema.field(col).type)
+        )
+    ]
+    data = table.drop_columns(string_columns).to_pandas()
+    for col in string_columns:
+        data[col] = pd.arrays.ArrowStringArray(table.column(col))
+    return data[table.column_names]
+
+
+def read_dataset(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    string_dtype: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read a dataset file, choosing the reader from its extension.
+
+    CSV files are read whole with inferred dtypes. Parquet and Feather/Arrow
+    IPC files only read the requested columns (PIPELINE_COLUMNS by default)
+    and cast them to COLUMN_DTYPES.
+
+    Args:
+        file_path: Path to a .csv, .parquet/.pq or .feather/.arrow/.ipc file
+        columns: Columns to read from columnar files
+        string_dtype: If set, STRING_COLUMNS of columnar files are read
+            straight into string[pyarrow] (see apply_string_dtype for the
+            final conversion)
+
+    Returns:
+        DataFrame with the file contents
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        available = pq.read_schema(file_path).names
+        table = pq.read_table(file_path, columns=_projected_columns(available, columns))
+        return _apply_schema(_table_to_pandas(table, string_dtype is not None))
+
+    if suffix in FEATHER_SUFFIXES:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        with pa.memory_map(str(file_path)) as source:
+            available = pa.ipc.open_file(source).schema.names
+        table = feather.read_table(
+            str(file_path),
+            columns=_projected_columns(available, columns),
+            memory_map=True,
+        )
+        return _apply_schema(_table_to_pandas(table, string_dtype is not None))
+
+    return pd.read_csv(file_path)
+
+
+def _partition_keys(path: Path) -> Dict[str, str]:
+    """Hive-style partition keys (``key=value`` directories) in a file path."""
+    keys = {}
+    for part in path.parent.parts:
+        if "=" in part:
+            key, value = part.split("=", 1)
+            keys[key] = value
+    return keys
+
+
+def _matches_filter(
+    keys: Dict[str, str],
+    partition_filter: Dict[str, Union[str, List[str], Callable[[str], bool]]],
+) -> bool:
+    """Whether a file's partition keys satisfy every filter condition."""
+    for key, condition in partition_filter.items():
+        if key not in keys:
+            return False
+        value = keys[key]
+        if callable(condition):
+            if not condition(value):
+                return False
+        elif isinstance(condition, (list, tuple, set)):
+            if value not in {str(item) for item in condition}:
+                return False
+        elif value != str(condition):
+            return False
+    return True
+
+
+def discover_partitions(path: str) -> List[Tuple[Path, Dict[str, str]]]:
+    """
+    Find the dataset files of a partitioned dataset.
+
+    Args:
+        path: Directory (searched recursively) or glob pattern
+
+    Returns:
+        Sorted (file path, partition keys) pairs
+    """
+    if os.path.isdir(path):
+        files = Path(path).rglob("*")
+    else:
+        files = (Path(name) for name in glob.glob(path, recursive=True))
+    files = sorted(
+        file
+        for file in files
+        if file.is_file()
+        and file.suffix.lower() in DATA_SUFFIXES
+        and not file.name.startswith(("_", "."))
+    )
+    return [(file, _partition_keys(file)) for file in files]
+
+
+def load_partitioned(
+    path: str,
+    columns: Optional[List[str]] = None,
+    partition_filter: Optional[
+        Dict[str, Union[str, List[str], Callable[[str], bool]]]
+    ] = None,
+    n_jobs: Optional[int] = None,
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    string_dtype: Optional[str] = None,
+) -> pd.DataFrame:
     """
-    try:
-        print(f"Downloading dataset from {url}...")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        urllib.request.urlretrieve(url, output_path)
-        print(f"✓ Dataset downloaded to {output_path}")
-        return True
-    except Exception as e:
-        print(f"✗ Failed to download dataset: {e}")
-        return False
+    Load every file of a partitioned dataset in parallel.
+
+    Files are found under a directory or by glob pattern and may mix CSV,
+    Parquet and Feather. Hive-style ``key=value`` directories become string
+    columns, and partition_filter is applied to them before any file is
+    read, so only matching partitions are loaded. Files are read in a
+    thread pool (the readers release the GIL) and concatenated in path
+    order; columns missing from some files are filled with NaN and the
+    numeric columns are cast to COLUMN_DTYPES.
+
+    Args:
+        path: Directory or glob pattern (e.g. "data/raw/date=2024-*/*.parquet")
+        columns: Columns to read from Parquet/Feather files
+        partition_filter: Partition key conditions, each a value, a list of
+            values or a predicate on the string value
+            (e.g. {"date": lambda d: d >= "2024-01-01"})
+        n_jobs: Number of reader threads (defaults to the executor default)
+        use_cache: Read CSV files through the binary cache
+        cache_dir: Directory for the binary cache
+        string_dtype: Convert string columns (see apply_string_dtype); done
+            after concatenation so categoricals share one category set
+
+    Returns:
+        Concatenated DataFrame
+    """
+    partitions = discover_partitions(path)
+    if not partitions:
+        raise FileNotFoundError(f"No dataset files found for {path}")
+
+    total = len(partitions)
+    if partition_filter:
+        partitions = [
+            (file, keys)
+            for file, keys in partitions
+            if _matches_filter(keys, partition_filter)
+        ]
+    print(f"✓ Reading {len(partitions)} of {total} partition files from {path}")
+    if not partitions:
+        return pd.DataFrame(columns=columns or [])
+
+    def read_partition(partition: Tuple[Path, Dict[str, str]]) -> pd.DataFrame:
+        file, keys = partition
+        if use_cache and file.suffix.lower() == ".csv":
+            data = load_csv_cached(str(file), cache_dir)
+        else:
+            data = read_dataset(str(file), columns, string_dtype)
+        for key, value in keys.items():
+            if key not in data:
+                data[key] = value
+        return data
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        frames = list(executor.map(read_partition, partitions))
+
+    data = _apply_schema(pd.concat(frames, ignore_index=True, sort=False))
+    if string_dtype is not None:
+        data = apply_string_dtype(data, string_dtype)
+    return data
 
 
 def load_data(
-    file_path: Optional[str] = None, auto_generate: bool = True
+    file_path: Optional[str] = None,
+    auto_generate: bool = True,
+    columns: Optional[List[str]] = None,
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    string_dtype: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Load e-commerce product dataset.
@@ -40,20 +314,49 @@ def load_data(
     If no file exists, generates sample data for testing.
 
     Args:
-        file_path: Path to the CSV file. If None, searches in data/raw/
+        file_path: Path to a CSV, Parquet or Feather file, or a directory or
+            glob pattern of partition files (see load_partitioned), or an
+            http(s):// or file:// URL of a file (downloaded once into
+            cache_dir/downloads, see src.data.download). If None, searches
+            in data/raw/
+        columns: Columns to read from Parquet/Feather files (defaults to
+            PIPELINE_COLUMNS); CSV files are always read whole
+        use_cache: Read CSV files through the binary cache in cache_dir
+            (see src.data.cache), re-parsing only when the file changes
+        cache_dir: Directory for the binary cache and downloads
+        string_dtype: Load STRING_COLUMNS as "pyarrow" strings or
+            "category"/pyarrow by cardinality (see apply_string_dtype)
+            instead of object
 
     Returns:
         DataFrame with product data including: title, seller_id, brand,
         subcategory, price, and category (target)
     """
+    data = _load_data(
+        file_path, auto_generate, columns, use_cache, cache_dir, string_dtype
+    )
+    if string_dtype is not None:
+        data = apply_string_dtype(data, string_dtype)
+    return data
+
+
+def _load_data(
+    file_path: Optional[str],
+    auto_generate: bool,
+    columns: Optional[List[str]],
+    use_cache: bool,
+    cache_dir: str,
+    string_dtype: Optional[str],
+) -> pd.DataFrame:
+    """Body of load_data; string_dtype is only passed on to the readers."""
     if file_path is None:
         # Try to find data in the standard location
         project_root = Path(__file__).parent.parent.parent.parent
         raw_data_dir = project_root / "data" / "raw"
         raw_data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Look for CSV files in raw data directory
-        csv_files = list(raw_data_dir.glob("*.csv"))
+        # Look for dataset files in raw data directory
+        csv_files = _find_data_files(raw_data_dir)
         if csv_files:
             file_path = str(csv_files[0])
             print(f"✓ Found existing dataset: {file_path}")
@@ -74,45 +377,75 @@ def load_data(
 
     # Check if file_path is actually a directory
     if os.path.isdir(file_path):
-        # If it's a directory, look for CSV files in it
+        # If it's a directory, look for dataset files in it
         dir_path = Path(file_path)
-        csv_files = list(dir_path.glob("*.csv"))
-        if csv_files:
-            file_path = str(csv_files[0])
+        partitions = discover_partitions(file_path)
+        if len(partitions) > 1 or (partitions and partitions[0][1]):
+            data = load_partitioned(
+                file_path,
+                columns,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                string_dtype=string_dtype,
+            )
+            print(f"✓ Loaded {len(data)} rows, {len(data.columns)} columns")
+            return data
+        elif partitions:
+            file_path = str(partitions[0][0])
             print(f"✓ Found dataset in directory: {file_path}")
         else:
             # Generate sample data if no CSV files found
             if auto_generate:
-                print("No CSV files found in directory. Generating sample data...")
+                print("No dataset files found in directory. Generating sample data...")
                 data = generate_sample_data(n_samples=10000)
                 output_path = dir_path / "products.csv"
                 data.to_csv(output_path, index=False)
                 print(f"✓ Generated and saved {len(data)} samples to {output_path}")
                 return data
             else:
-                raise FileNotFoundError(f"No CSV files found in {file_path}")
+                raise FileNotFoundError(f"No dataset files found in {file_path}")
 
     # Check if file_path is a URL
-    if file_path and file_path.startswith(("http://", "https://")):
-        # Download from URL
-        project_root = Path(__file__).parent.parent.parent.parent
-        output_path = project_root / "data" / "raw" / "downloaded_products.csv"
-        if download_dataset(file_path, output_path):
-            file_path = str(output_path)
-        else:
+    if file_path and file_path.startswith(("http://", "https://", "file://")):
+        # Download once into the content-addressed cache, resuming if needed
+        try:
+            file_path = str(
+                download_dataset(
+                    file_path, cache_dir=str(Path(cache_dir) / "downloads")
+                )
+            )
+        except Exception as e:
+            print(f"✗ Failed to download dataset: {e}")
             if auto_generate:
                 print("Download failed. Generating sample data instead...")
                 data = generate_sample_data(n_samples=10000)
+                output_path = Path(__file__).parent.parent.parent.parent
+                output_path = output_path / "data" / "raw" / "products.csv"
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-                data.to_csv(output_path.parent / "products.csv", index=False)
+                data.to_csv(output_path, index=False)
                 return data
             else:
-                raise Exception(f"Failed to download dataset from {file_path}")
+                raise Exception(f"Failed to download dataset from {file_path}") from e
+
+    # Glob patterns load every matching file as one dataset
+    if glob.has_magic(file_path):
+        data = load_partitioned(
+            file_path,
+            columns,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            string_dtype=string_dtype,
+        )
+        print(f"✓ Loaded {len(data)} rows, {len(data.columns)} columns")
+        return data
 
     # Now check if it's a valid file
     if os.path.exists(file_path) and os.path.isfile(file_path):
         print(f"✓ Loading dataset from: {file_path}")
-        data = pd.read_csv(file_path)
+        if use_cache and Path(file_path).suffix.lower() == ".csv":
+            data = load_csv_cached(file_path, cache_dir)
+        else:
+            data = read_dataset(file_path, columns, string_dtype)
         print(f"✓ Loaded {len(data)} rows, {len(data.columns)} columns")
         return data
     else:
@@ -123,8 +456,7 @@ def load_data(
             # Try to save it where expected
             if file_path:
                 try:
-                    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-                    data.to_csv(file_path, index=False)
+                    save_data(data, file_path)
                     print(f"✓ Generated and saved to {file_path}")
                 except:
                     pass
@@ -133,144 +465,98 @@ def load_data(
             raise FileNotFoundError(f"Dataset file not found: {file_path}")
 
 
-def generate_sample_data(n_samples: int = 10000) -> pd.DataFrame:
+def iter_data_chunks(
+    file_path: str, chunksize: int = 100_000, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
     """
-    Generate sample e-commerce product data for testing.
+    Read a dataset file in chunks instead of loading it all at once.
+
+    Parquet files are read batch by batch and Feather files through a
+    memory map, so neither is ever fully materialized.
 
     Args:
-        n_samples: Number of samples to generate
+        file_path: Path to a CSV, Parquet or Feather file
+        chunksize: Number of rows per chunk
+        columns: Only read these columns (missing ones are ignored)
 
-    Returns:
-        DataFrame with synthetic product data
+    Yields:
+        DataFrames with at most chunksize rows, in file order
     """
-    import numpy as np
-
-    np.random.seed(42)
-
-    # High-cardinality features
-    seller_ids = [f"SELLER_{i:05d}" for i in range(1, 5001)]  # 5000 unique sellers
-    brands = [
-        "Nike",
-        "Adidas",
-        "Samsung",
-        "Apple",
-        "Sony",
-        "LG",
-        "HP",
-        "Dell",
-        "Canon",
-        "Nikon",
-        "Microsoft",
-        "Google",
-        "Amazon",
-        "Lenovo",
-        "Asus",
-        "Acer",
-        "Toshiba",
-        "Panasonic",
-        "Philips",
-        "Bosch",
-        "Whirlpool",
-        "KitchenAid",
-        "Dyson",
-        "Shark",
-        "Bissell",
-        "iRobot",
-        "Roomba",
-        "Fitbit",
-        "Garmin",
-        "Polar",
-        "UnderArmour",
-        "Puma",
-        "Reebok",
-        "NewBalance",
-        "Vans",
-        "Converse",
-        "Timberland",
-        "Columbia",
-        "NorthFace",
-    ]
-    subcategories = [
-        "Electronics",
-        "Clothing",
-        "Home & Kitchen",
-        "Sports & Outdoors",
-        "Books",
-        "Toys & Games",
-        "Beauty & Personal Care",
-        "Automotive",
-        "Garden & Tools",
-        "Pet Supplies",
-        "Baby Products",
-        "Office Products",
-    ]
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Dataset file not found: {file_path}")
 
-    # Product categories (target variable)
-    categories = [
-        "Electronics",
-        "Clothing",
-        "Home & Kitchen",
-        "Sports & Outdoors",
-        "Books",
-        "Toys & Games",
-        "Beauty",
-        "Automotive",
-        "Garden",
-        "Pet Supplies",
-        "Baby",
-        "Office",
-    ]
+    suffix = Path(file_path).suffix.lower()
+    if suffix in PARQUET_SUFFIXES or suffix in FEATHER_SUFFIXES:
+        yield from _iter_columnar_chunks(file_path, chunksize, columns)
+        return
 
-    # Generate data
-    data = pd.DataFrame(
-        {
-            "product_id": [f"PROD_{i:06d}" for i in range(1, n_samples + 1)],
-            "title": [
-                f"{np.random.choice(brands)} {np.random.choice(['Pro', 'Premium', 'Classic', 'Elite', 'Standard'])} "
-                f"{np.random.choice(['Product', 'Item', 'Device', 'Tool', 'Accessory'])} "
-                f"{np.random.randint(100, 9999)}"
-                for _ in range(n_samples)
-            ],
-            "seller_id": np.random.choice(seller_ids, n_samples),
-            "brand": np.random.choice(brands, n_samples),
-            "subcategory": np.random.choice(subcategories, n_samples),
-            "price": np.random.uniform(9.99, 999.99, n_samples).round(2),
-            "rating": np.random.uniform(3.0, 5.0, n_samples).round(1),
-            "reviews_count": np.random.randint(0, 10000, n_samples),
-        }
-    )
+    usecols = None if columns is None else (lambda col: col in columns)
+    with pd.read_csv(file_path, chunksize=chunksize, usecols=usecols) as reader:
+        for chunk in reader:
+            yield chunk
 
-    # Create category based on subcategory (with some noise)
-    category_mapping = {
-        "Electronics": "Electronics",
-        "Clothing": "Clothing",
-        "Home & Kitchen": "Home & Kitchen",
-        "Sports & Outdoors": "Sports & Outdoors",
-        "Books": "Books",
-        "Toys & Games": "Toys & Games",
-        "Beauty & Personal Care": "Beauty",
-        "Automotive": "Automotive",
-        "Garden & Tools": "Garden",
-        "Pet Supplies": "Pet Supplies",
-        "Baby Products": "Baby",
-        "Office Products": "Office",
-    }
 
-    data["category"] = data["subcategory"].map(category_mapping)
-    # Add some noise (10% misclassification)
-    noise_mask = np.random.random(n_samples) < 0.1
-    data.loc[noise_mask, "category"] = np.random.choice(categories, noise_mask.sum())
+def _iter_columnar_chunks(
+    file_path: str, chunksize: int, columns: Optional[List[str]]
+) -> Iterator[pd.DataFrame]:
+    """
+    Chunked reads of Parquet/Feather files with the COLUMN_DTYPES schema.
 
-    return data
+    Feather files are read one record batch at a time, so a compressed file
+    (pandas writes lz4 by default) is decompressed batch by batch; batches
+    larger than chunksize are split.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if Path(file_path).suffix.lower() in PARQUET_SUFFIXES:
+        parquet_file = pq.ParquetFile(file_path)
+        projected = _projected_columns(parquet_file.schema_arrow.names, columns)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=projected):
+            yield _apply_schema(batch.to_pandas())
+        return
+
+    with pa.memory_map(str(file_path)) as source:
+        reader = pa.ipc.open_file(source)
+        projected = _projected_columns(reader.schema.names, columns)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i).select(projected)
+            for start in range(0, batch.num_rows, chunksize):
+                yield _apply_schema(batch.slice(start, chunksize).to_pandas())
+
+
+def generate_sample_data(n_samples: int = 10000, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate sample e-commerce product data for testing.
+
+    Args:
+        n_samples: Number of samples to generate
+        seed: Random seed
+
+    Returns:
+        DataFrame with synthetic product data (see src.data.synthetic)
+    """
+    from src.data.synthetic import generate_products
+
+    return generate_products(n_samples, seed=seed)
 
 
 def save_data(data: pd.DataFrame, file_path: str) -> None:
     """
-    Save DataFrame to CSV file.
+    Save DataFrame to a CSV, Parquet or Feather file.
+
+    The format is chosen from the extension like in read_dataset; anything
+    other than .parquet/.pq or .feather/.arrow/.ipc is written as CSV.
 
     Args:
         data: DataFrame to save
         file_path: Path where to save the file
     """
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    data.to_csv(file_path, index=False)
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    suffix = Path(file_path).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        data.to_parquet(file_path, index=False)
+    elif suffix in FEATHER_SUFFIXES:
+        data.reset_index(drop=True).to_feather(file_path)
+    else:
+        data.to_csv(file_path, index=False)
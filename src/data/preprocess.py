@@ -1,34 +1,173 @@
 """Data preprocessing utilities for e-commerce product classification."""
 
-from typing import Tuple
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from src.data.ingest import product_id_hashes
 
-def preprocess_data(raw_data: pd.DataFrame) -> pd.DataFrame:
+# Numeric columns filled with their median
+FILL_COLUMNS = ("price", "rating")
+
+MISSING_TITLE = "Unknown Product"
+
+# Rows of the seen-id index rewritten per step when merging in a chunk
+_INDEX_BLOCK_ROWS = 1_000_000
+
+
+def median_from_counts(counts: pd.Series) -> float:
+    """Median of a column given its value counts (same result as Series.median)."""
+    counts = counts.sort_index()
+    cumulative = counts.to_numpy().cumsum()
+    total = cumulative[-1]
+    values = counts.index.to_numpy(dtype=float)
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, total // 2, side="right")]
+    return float((lower + upper) / 2)
+
+
+def fit_fill_values(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+) -> Dict[str, float]:
+    """
+    Fit the median fill values of FILL_COLUMNS in one pass.
+
+    Chunks are reduced to value counts, so memory grows with the number of
+    distinct values rather than rows, and the result equals the medians of
+    the concatenated data.
+
+    Args:
+        data: Raw DataFrame or iterable of raw DataFrame chunks
+
+    Returns:
+        Dictionary of column -> median, for preprocess_data(fill_values=...)
+    """
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    value_counts: Dict[str, pd.Series] = {}
+    for chunk in chunks:
+        for col in FILL_COLUMNS:
+            if col not in chunk.columns:
+                continue
+            counts = chunk[col].value_counts()
+            if col in value_counts:
+                counts = value_counts[col].add(counts, fill_value=0)
+            value_counts[col] = counts
+    return {
+        col: median_from_counts(counts)
+        for col, counts in value_counts.items()
+        if len(counts) > 0
+    }
+
+
+def save_fill_values(fill_values: Dict[str, float], path: str) -> None:
+    """Save fitted fill values as JSON."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(fill_values, f, indent=2)
+
+
+def load_fill_values(path: str) -> Dict[str, float]:
+    """Load fill values saved by save_fill_values."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _normalize_title(title: Any) -> str:
+    """Lowercase, strip and collapse whitespace (split() splits on runs)."""
+    return " ".join(str(title).split()).lower()
+
+
+def _fill_strings(values: pd.Series, fill_value: str) -> pd.Series:
+    """fillna that also works on categoricals lacking fill_value."""
+    if not values.hasnans:
+        return values
+    if (
+        isinstance(values.dtype, pd.CategoricalDtype)
+        and fill_value not in values.cat.categories
+    ):
+        values = values.cat.add_categories([fill_value])
+    return values.fillna(fill_value)
+
+
+def normalize_titles(titles: pd.Series) -> pd.Series:
+    """
+    Fill, lowercase, strip and collapse whitespace in titles in one pass.
+
+    Each distinct title is normalized once and the results are broadcast
+    back through the factorized codes. Categorical and string[pyarrow]
+    columns keep their dtype.
+
+    Args:
+        titles: Raw title column
+
+    Returns:
+        Normalized titles with the same index
+    """
+    if isinstance(titles.dtype, pd.CategoricalDtype):
+        # Normalize the categories; titles that become equal share a category
+        normalized = [_normalize_title(title) for title in titles.cat.categories]
+        category_codes, categories = pd.factorize(
+            np.array(normalized + [MISSING_TITLE.lower()], dtype=object)
+        )
+        # Missing titles have code -1, which indexes the appended placeholder
+        codes = category_codes[titles.cat.codes.to_numpy()]
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories),
+            index=titles.index,
+            name=titles.name,
+        )
+
+    codes, uniques = pd.factorize(titles)
+    # Iterating an object view of Arrow uniques is much faster than the array
+    normalized = [
+        _normalize_title(title) for title in np.asarray(uniques, dtype=object)
+    ]
+    normalized.append(MISSING_TITLE.lower())
+    if isinstance(titles.dtype, pd.StringDtype):
+        # Negative codes index from the end, like the numpy path below
+        values = pd.array(normalized, dtype=titles.dtype).take(codes)
+    else:
+        values = np.array(normalized, dtype=object)[codes]
+    return pd.Series(values, index=titles.index, name=titles.name)
+
+
+def preprocess_data(
+    raw_data: pd.DataFrame,
+    fill_values: Optional[Dict[str, float]] = None,
+    inplace: bool = False,
+) -> pd.DataFrame:
     """
     Clean and preprocess raw product data.
 
     Args:
         raw_data: Raw DataFrame with product data
+        fill_values: Fitted fill values for numeric columns (e.g. from
+            fit_fill_values or FeatureTransformer). Columns without an entry
+            fall back to the median of raw_data, which differs between chunks
+            of one dataset.
+        inplace: Modify raw_data instead of working on a copy. Duplicate
+            product_ids are still dropped, so use the returned frame.
 
     Returns:
         Preprocessed DataFrame
     """
-    data = raw_data.copy()
+    data = raw_data if inplace else raw_data.copy()
+    fill_values = fill_values or {}
 
-    # Handle missing values
-    # Fill missing titles with placeholder
+    # Fill missing titles with placeholder and clean text (remove extra
+    # spaces, convert to lowercase)
     if "title" in data.columns:
-        data["title"] = data["title"].fillna("Unknown Product")
-
-    # Fill missing prices with median
-    if "price" in data.columns:
-        data["price"] = data["price"].fillna(data["price"].median())
+        data["title"] = normalize_titles(data["title"])
 
-    # Fill missing ratings with median
-    if "rating" in data.columns:
-        data["rating"] = data["rating"].fillna(data["rating"].median())
+    # Fill missing prices and ratings with median
+    for col in FILL_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].fillna(fill_values.get(col, data[col].median()))
 
     # Fill missing reviews_count with 0
     if "reviews_count" in data.columns:
@@ -37,20 +176,108 @@ def preprocess_data(raw_data: pd.DataFrame) -> pd.DataFrame:
     # Fill missing seller_id, brand, subcategory with "Unknown"
     for col in ["seller_id", "brand", "subcategory"]:
         if col in data.columns:
-            data[col] = data[col].fillna("Unknown")
-
-    # Clean text in title (remove extra spaces, convert to lowercase)
-    if "title" in data.columns:
-        data["title"] = data["title"].str.lower().str.strip()
-        data["title"] = data["title"].str.replace(r"\s+", " ", regex=True)
+            data[col] = _fill_strings(data[col], "Unknown")
 
     # Remove duplicates based on product_id if it exists
     if "product_id" in data.columns:
-        data = data.drop_duplicates(subset=["product_id"], keep="first")
+        duplicated = data["product_id"].duplicated(keep="first")
+        if duplicated.any():
+            data = data[~duplicated]
 
     return data
 
 
+class _SeenProductIds:
+    """
+    Sorted 64-bit product_id hashes kept in an .npy file in directory.
+
+    Lookups binary-search a read-only memory map of the file, and each added
+    chunk is merged into a new file block by block, so memory is bounded by
+    the chunk and _INDEX_BLOCK_ROWS rather than the number of ids seen.
+    """
+
+    def __init__(self, directory: str):
+        self.path = Path(directory) / "_id_hashes.npy"
+        self.size = 0
+
+    def _load(self) -> np.ndarray:
+        return np.load(self.path, mmap_mode="r")
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Whether each hash has been added before."""
+        if self.size == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        seen = self._load()
+        positions = np.minimum(np.searchsorted(seen, hashes), self.size - 1)
+        return np.asarray(seen[positions] == hashes)
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add unique hashes that are not in the index yet."""
+        new = np.sort(hashes)
+        if len(new) == 0:
+            return
+        if self.size == 0:
+            np.save(self.path, new)
+            self.size = len(new)
+            return
+
+        seen = self._load()
+        # Old and new hashes shift each other right by the number of smaller
+        # hashes from the other array
+        positions = np.searchsorted(seen, new)
+        temp_path = self.path.with_name("_id_hashes.tmp.npy")
+        merged = np.lib.format.open_memmap(
+            temp_path, mode="w+", dtype=np.uint64, shape=(self.size + len(new),)
+        )
+        merged[positions + np.arange(len(new))] = new
+        for start in range(0, self.size, _INDEX_BLOCK_ROWS):
+            rows = np.arange(start, min(start + _INDEX_BLOCK_ROWS, self.size))
+            merged[rows + np.searchsorted(positions, rows, side="right")] = seen[
+                start : start + len(rows)
+            ]
+        merged.flush()
+        del merged, seen
+        os.replace(temp_path, self.path)
+        self.size += len(new)
+
+
+def preprocess_chunks(
+    chunks: Iterable[pd.DataFrame],
+    fill_values: Dict[str, float],
+    inplace: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Preprocess a stream of raw chunks with fixed fill values.
+
+    Duplicate product_ids are dropped across chunks, keeping the first
+    occurrence as preprocess_data does for a single frame. The ids seen so
+    far are kept as sorted 64-bit hashes (as in IngestStore) in a temporary
+    .npy file rather than in memory; merging each chunk into it costs one
+    pass over the file. Chunks are modified in place by default, since
+    readers such as iter_data_chunks hand out fresh frames.
+
+    Args:
+        chunks: Iterable of raw DataFrame chunks
+        fill_values: Fill values fitted on the whole dataset
+            (see fit_fill_values)
+        inplace: Modify each chunk instead of copying it
+
+    Yields:
+        Preprocessed DataFrame chunks
+    """
+    with tempfile.TemporaryDirectory(prefix="seen_ids_") as temp_dir:
+        seen_ids = _SeenProductIds(temp_dir)
+        for chunk in chunks:
+            processed = preprocess_data(chunk, fill_values, inplace=inplace)
+            if "product_id" in processed.columns:
+                hashes = product_id_hashes(processed["product_id"])
+                is_new = ~seen_ids.contains(hashes)
+                if not is_new.all():
+                    processed = processed[is_new]
+                seen_ids.add(hashes[is_new])
+            yield processed
+
+
 def split_data(
     data: pd.DataFrame,
     target_column: str = "category",
@@ -1,10 +1,11 @@
 """Reframing & Rebalancing pattern for handling class imbalance."""
 
 from collections import Counter
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 
 def check_class_imbalance(y: pd.Series, threshold: float = 0.5) -> Dict[str, Any]:
@@ -108,6 +109,296 @@ def reframe_problem(
         return X, y
 
 
+def resample_indices(
+    y: pd.Series, method: str = "oversample", random_state: int = 42
+) -> np.ndarray:
+    """
+    Row positions of a class-balanced resample, in random order.
+
+    Rows are grouped by class in one pass (factorize plus a sort on a random
+    key), so the cost does not grow with the number of classes.
+    "oversample" keeps every row and draws extra rows with replacement until
+    each class matches the largest one; "undersample" keeps a random subset
+    of each class the size of the smallest one.
+
+    Args:
+        y: Target labels
+        method: "oversample" or "undersample"
+        random_state: Random seed
+
+    Returns:
+        int64 positions into y (and the matching feature rows)
+    """
+    if method not in ("oversample", "undersample"):
+        raise ValueError(f"Unknown resampling method: {method}")
+    rng = np.random.default_rng(random_state)
+    codes, _ = pd.factorize(np.asarray(y), use_na_sentinel=False)
+    # Rows grouped by class, in random order within each class
+    order = np.lexsort((rng.random(len(codes)), codes))
+    class_sizes = np.bincount(codes)
+    class_starts = np.concatenate([[0], np.cumsum(class_sizes)[:-1]])
+
+    if method == "undersample":
+        rank = np.arange(len(codes)) - class_starts[codes[order]]
+        indices = order[rank < class_sizes.min()]
+    else:
+        extra = class_sizes.max() - class_sizes
+        extra_classes = np.repeat(np.arange(len(class_sizes)), extra)
+        offsets = (rng.random(len(extra_classes)) * class_sizes[extra_classes]).astype(
+            np.int64
+        )
+        indices = np.concatenate([order, order[class_starts[extra_classes] + offsets]])
+    return rng.permutation(indices)
+
+
+def take_rows(X: Any, indices: np.ndarray) -> Any:
+    """Gather rows of a DataFrame (with a fresh index), array or sparse matrix."""
+    if isinstance(X, pd.DataFrame):
+        return X.take(indices).reset_index(drop=True)
+    return X[indices]
+
+
+SAMPLING_STRATEGIES = ("balanced", "proportional", "capped")
+
+
+def stratified_reservoir_sample(
+    chunks: Iterable[pd.DataFrame],
+    sample_size: int,
+    strategy: str = "balanced",
+    target_column: str = "category",
+    class_cap: Optional[int] = None,
+    quotas: Optional[Dict[Any, int]] = None,
+    random_state: int = 42,
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Draw a stratified sample from a stream of chunks in one pass.
+
+    Every row gets a uniform random key, and each class keeps the rows with
+    its smallest keys (a bottom-k reservoir), so each class's sample is a
+    uniform sample of that class whatever the chunk order. Quotas:
+    - "balanced": sample_size // (classes seen so far) rows per class; the
+      quota shrinks as new classes appear, which only drops rows with the
+      largest keys
+    - "proportional": the sample_size rows with the smallest keys overall,
+      i.e. a uniform sample in which classes keep their share
+    - "capped": proportional, but no class keeps more than class_cap rows
+
+    quotas overrides the quota of individual classes (0 drops a class).
+    Only the reservoir and the current chunk are held in memory, so memory
+    is bounded by sample_size plus one chunk, not by the dataset.
+
+    Args:
+        chunks: Iterable of DataFrames with target_column (e.g. from
+            iter_chunked_features or iter_data_chunks)
+        sample_size: Maximum number of rows in the sample
+        strategy: "balanced", "proportional" or "capped"
+        target_column: Column holding the class labels
+        class_cap: Per-class maximum for strategy="capped"
+        quotas: Per-class quotas taking precedence over the strategy
+        random_state: Random seed
+
+    Returns:
+        Tuple of (X, y) in random order, ready for train_model
+    """
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(
+            f"strategy must be one of {SAMPLING_STRATEGIES}, got {strategy!r}"
+        )
+    if strategy == "capped" and class_cap is None:
+        raise ValueError('strategy="capped" needs class_cap')
+    quotas = quotas or {}
+
+    rng = np.random.default_rng(random_state)
+    reservoir: Optional[pd.DataFrame] = None
+    reservoir_keys = np.empty(0)
+    seen_classes = set()
+    n_rows = 0
+
+    for chunk in chunks:
+        n_rows += len(chunk)
+        keys = np.concatenate([reservoir_keys, rng.random(len(chunk))])
+        pool = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        labels = pool[target_column]
+        codes, classes = pd.factorize(labels, use_na_sentinel=False)
+        seen_classes.update(classes)
+
+        if strategy == "balanced":
+            default_quota = sample_size // len(seen_classes)
+        elif strategy == "capped":
+            default_quota = class_cap
+        else:
+            default_quota = sample_size
+        class_quotas = np.array([quotas.get(cls, default_quota) for cls in classes])
+
+        # Rank rows within their class by key and keep each class's quota
+        order = np.lexsort((keys, codes))
+        class_starts = np.searchsorted(codes[order], np.arange(len(classes)))
+        rank = np.arange(len(order)) - class_starts[codes[order]]
+        kept = order[rank < class_quotas[codes[order]]]
+
+        # Then the sample_size smallest keys overall
+        if len(kept) > sample_size:
+            smallest = np.argpartition(keys[kept], sample_size - 1)[:sample_size]
+            kept = kept[smallest]
+        kept.sort()
+        reservoir = pool.take(kept)
+        reservoir_keys = keys[kept]
+
+    if reservoir is None:
+        raise ValueError("No chunks to sample from")
+
+    sample = reservoir.take(np.argsort(reservoir_keys)).reset_index(drop=True)
+    y = sample.pop(target_column)
+    print(
+        f"Sampling: kept {len(sample)} of {n_rows} rows ({strategy}), "
+        f"{y.value_counts().to_dict()}"
+    )
+    return sample, y
+
+
+def nearest_neighbors(X: Any, k: int, block_elements: int = 1 << 24) -> np.ndarray:
+    """
+    Indices of the k nearest other rows of each row (Euclidean).
+
+    Distances are computed in blocks of rows against all rows, so at most
+    block_elements distances are held at a time.
+
+    Args:
+        X: (n, d) float matrix, dense or scipy sparse
+        k: Number of neighbours (less than n)
+        block_elements: Distance matrix entries per block
+
+    Returns:
+        (n, k) int64 neighbour indices, nearest first
+    """
+    n = X.shape[0]
+    if sp.issparse(X):
+        squared_norms = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    else:
+        squared_norms = np.einsum("ij,ij->i", X, X)
+    neighbors = np.empty((n, k), dtype=np.int64)
+    block_rows = max(1, block_elements // n)
+    for start in range(0, n, block_rows):
+        block = X[start : start + block_rows]
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, without the constant |a|^2
+        products = block @ X.T
+        if sp.issparse(products):
+            products = products.toarray()
+        distances = squared_norms[None, :] - 2.0 * products
+        rows = np.arange(block.shape[0])
+        distances[rows, start + rows] = np.inf
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+        neighbors[start : start + len(rows)] = np.take_along_axis(
+            nearest, order, axis=1
+        )
+    return neighbors
+
+
+def smote_oversample(
+    X: Any,
+    y: pd.Series,
+    k_neighbors: int = 5,
+    random_state: int = 42,
+    block_elements: int = 1 << 24,
+    batch_size: int = 100_000,
+) -> Tuple[Any, pd.Series]:
+    """
+    Oversample every class to the size of the largest one with SMOTE.
+
+    Each synthetic row lies at a random point between a row of the class and
+    one of its k_neighbors nearest neighbours within the class. Neighbours
+    are found with blockwise NumPy distances (see nearest_neighbors) and the
+    synthetic rows are written in batches straight into the output matrix.
+    Sparse input (e.g. title n-grams from build_sparse_features) stays
+    sparse: synthetic rows are built as sparse batches and stacked under
+    the original rows. Classes with a single row are duplicated. Integer
+    columns are rounded back to integers. The result is deterministic for a
+    given random_state.
+
+    Args:
+        X: Numeric features (DataFrame, array or scipy sparse matrix)
+        y: Target labels
+        k_neighbors: Neighbours to interpolate towards
+        random_state: Random seed
+        block_elements: Distance matrix entries computed at a time
+        batch_size: Synthetic rows generated at a time
+
+    Returns:
+        Tuple of (X, y): the original rows followed by the synthetic ones, X
+        as a DataFrame, or as a CSR matrix for sparse input
+    """
+    rng = np.random.default_rng(random_state)
+    float_dtype = np.float32 if _all_float32(X) else np.float64
+    sparse = sp.issparse(X)
+    if sparse:
+        values = sp.csr_matrix(X, dtype=float_dtype)
+    else:
+        values = np.asarray(X, dtype=float_dtype)
+    n_rows = values.shape[0]
+    labels = np.asarray(y)
+    codes, classes = pd.factorize(labels, sort=True)
+    class_sizes = np.bincount(codes)
+    n_extra = class_sizes.max() - class_sizes
+
+    if sparse:
+        synthetic = []
+    else:
+        output = np.empty((n_rows + n_extra.sum(), values.shape[1]), float_dtype)
+        output[:n_rows] = values
+    output_codes = np.concatenate([codes, np.repeat(np.arange(len(classes)), n_extra)])
+
+    # Rows grouped by class in one pass
+    class_rows = np.split(np.argsort(codes, kind="stable"), np.cumsum(class_sizes)[:-1])
+    position = n_rows
+    for code in np.flatnonzero(n_extra):
+        members = class_rows[code]
+        class_values = values[members]
+        k = min(k_neighbors, len(members) - 1)
+        neighbors = nearest_neighbors(class_values, k, block_elements) if k else None
+        for start in range(0, n_extra[code], batch_size):
+            n_batch = min(batch_size, n_extra[code] - start)
+            base = rng.integers(0, len(members), n_batch)
+            if neighbors is not None:
+                neighbor = neighbors[base, rng.integers(0, k, n_batch)]
+                gap = rng.random((n_batch, 1), dtype=float_dtype)
+            if sparse:
+                batch = class_values[base]
+                if neighbors is not None:
+                    batch = batch + (class_values[neighbor] - batch).multiply(gap)
+                synthetic.append(sp.csr_matrix(batch))
+            else:
+                batch = output[position : position + n_batch]
+                batch[:] = class_values[base]
+                if neighbors is not None:
+                    batch += gap * (class_values[neighbor] - batch)
+            position += n_batch
+        print(f"  SMOTE {classes[code]}: {len(members)} -> {class_sizes.max()}")
+
+    y_resampled = pd.Series(classes[output_codes], name=y.name)
+    if sparse:
+        return sp.vstack([values] + synthetic, format="csr"), y_resampled
+
+    columns = X.columns if isinstance(X, pd.DataFrame) else None
+    X_resampled = pd.DataFrame(output, columns=columns)
+    if isinstance(X, pd.DataFrame):
+        for col, dtype in X.dtypes.items():
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(
+                dtype
+            ):
+                X_resampled[col] = X_resampled[col].round().astype(dtype)
+    return X_resampled, y_resampled
+
+
+def _all_float32(X: Any) -> bool:
+    """Whether every column of X is float32 (so SMOTE can stay in float32)."""
+    if isinstance(X, pd.DataFrame):
+        return all(dtype == np.float32 for dtype in X.dtypes)
+    if sp.issparse(X):
+        return X.dtype == np.float32
+    return np.asarray(X).dtype == np.float32
+
+
 def rebalance_data(
     X: pd.DataFrame, y: pd.Series, method: str = "class_weight", random_state: int = 42
 ) -> Tuple[pd.DataFrame, pd.Series]:
@@ -150,120 +441,29 @@ def rebalance_data(
         )
         return X, y
 
-    elif method == "oversample":
-        # Oversample minority classes
-        from sklearn.utils import resample
-
-        class_counts = Counter(y)
-        max_count = max(class_counts.values())
-
-        X_resampled = []
-        y_resampled = []
-
-        for cls in class_counts.keys():
-            cls_mask = y == cls
-            X_cls = X[cls_mask]
-            y_cls = y[cls_mask]
-
-            if len(X_cls) < max_count:
-                # Oversample
-                X_cls_resampled, y_cls_resampled = resample(
-                    X_cls,
-                    y_cls,
-                    replace=True,
-                    n_samples=max_count,
-                    random_state=random_state,
-                )
-                print(f"  Oversampled {cls}: {len(X_cls)} -> {len(X_cls_resampled)}")
-            else:
-                X_cls_resampled, y_cls_resampled = X_cls, y_cls
-
-            X_resampled.append(X_cls_resampled)
-            y_resampled.append(y_cls_resampled)
-
-        X_balanced = pd.concat(X_resampled, ignore_index=True)
-        y_balanced = pd.concat(y_resampled, ignore_index=True)
-
-        # Shuffle
-        indices = np.random.RandomState(random_state).permutation(len(X_balanced))
-        X_balanced = X_balanced.iloc[indices].reset_index(drop=True)
-        y_balanced = y_balanced.iloc[indices].reset_index(drop=True)
+    elif method in ("oversample", "undersample"):
+        indices = resample_indices(y, method, random_state)
+        X_balanced = take_rows(X, indices)
+        y_balanced = y.iloc[indices].reset_index(drop=True)
 
+        verb = "Oversampl" if method == "oversample" else "Undersampl"
+        after = y_balanced.value_counts()
+        for cls, count in imbalance_info["class_distribution"].items():
+            if after[cls] != count:
+                print(f"  {verb}ed {cls}: {count} -> {after[cls]}")
         print(
-            f"Rebalancing: Oversampling complete ({len(X)} -> {len(X_balanced)} samples)"
+            f"Rebalancing: {verb}ing complete "
+            f"({len(y)} -> {len(y_balanced)} samples)"
         )
         return X_balanced, y_balanced
 
-    elif method == "undersample":
-        # Undersample majority classes
-        from sklearn.utils import resample
-
-        class_counts = Counter(y)
-        min_count = min(class_counts.values())
-
-        X_resampled = []
-        y_resampled = []
-
-        for cls in class_counts.keys():
-            cls_mask = y == cls
-            X_cls = X[cls_mask]
-            y_cls = y[cls_mask]
-
-            if len(X_cls) > min_count:
-                # Undersample
-                X_cls_resampled, y_cls_resampled = resample(
-                    X_cls,
-                    y_cls,
-                    replace=False,
-                    n_samples=min_count,
-                    random_state=random_state,
-                )
-                print(f"  Undersampled {cls}: {len(X_cls)} -> {len(X_cls_resampled)}")
-            else:
-                X_cls_resampled, y_cls_resampled = X_cls, y_cls
-
-            X_resampled.append(X_cls_resampled)
-            y_resampled.append(y_cls_resampled)
-
-        X_balanced = pd.concat(X_resampled, ignore_index=True)
-        y_balanced = pd.concat(y_resampled, ignore_index=True)
-
-        # Shuffle
-        indices = np.random.RandomState(random_state).permutation(len(X_balanced))
-        X_balanced = X_balanced.iloc[indices].reset_index(drop=True)
-        y_balanced = y_balanced.iloc[indices].reset_index(drop=True)
-
+    elif method == "SMOTE":
+        X_resampled, y_resampled = smote_oversample(X, y, random_state=random_state)
         print(
-            f"Rebalancing: Undersampling complete ({len(X)} -> {len(X_balanced)} samples)"
+            f"Rebalancing: SMOTE complete "
+            f"({X.shape[0]} -> {X_resampled.shape[0]} samples)"
         )
-        return X_balanced, y_balanced
-
-    elif method == "SMOTE":
-        # Use SMOTE for oversampling (requires imbalanced-learn)
-        try:
-            from imblearn.over_sampling import SMOTE
-
-            # Convert to numeric for SMOTE
-            label_to_idx = {label: idx for idx, label in enumerate(sorted(y.unique()))}
-            y_numeric = y.map(label_to_idx)
-
-            smote = SMOTE(random_state=random_state)
-            X_resampled, y_resampled_numeric = smote.fit_resample(X, y_numeric)
-
-            # Convert back to labels
-            idx_to_label = {idx: label for label, idx in label_to_idx.items()}
-            y_resampled = pd.Series([idx_to_label[idx] for idx in y_resampled_numeric])
-            X_resampled = pd.DataFrame(X_resampled, columns=X.columns)
-
-            print(
-                f"Rebalancing: SMOTE complete ({len(X)} -> {len(X_resampled)} samples)"
-            )
-            return X_resampled, y_resampled
-        except ImportError:
-            print(
-                "Warning: imbalanced-learn not installed, falling back to class_weight"
-            )
-            return X, y
+        return X_resampled, y_resampled
 
     else:
         print(f"Rebalancing: Unknown method '{method}', returning original data")
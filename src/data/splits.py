@@ -0,0 +1,306 @@
+"""Stratified train/val/test splits as persisted row index arrays."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SPLIT_NAMES = ("train", "val", "test")
+
+# File written next to a chunked feature dataset by split_chunked_features
+SPLITS_FILE = "_splits.npz"
+
+# Splits of in-memory datasets, one file per dataset (see load_or_create_splits)
+DEFAULT_SPLITS_DIR = "data/cache/splits"
+
+
+def _labels_hash(y: pd.Series) -> str:
+    """Content hash of the labels, used to detect stale persisted splits."""
+    hashed = pd.util.hash_pandas_object(pd.Series(np.asarray(y)), index=False)
+    return hashlib.sha256(hashed.to_numpy(dtype=np.uint64).tobytes()).hexdigest()
+
+
+class DatasetSplit:
+    """
+    Row positions of the train, val and test sets.
+
+    The index arrays are sorted positional indices into the dataset, so the
+    same split can be applied to a DataFrame, a NumPy or sparse matrix, or
+    to on-disk chunks (see iter_split_chunks). Nothing is copied until a
+    consumer asks for one set with take().
+    """
+
+    def __init__(self, indices: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        """
+        Initialize split.
+
+        Args:
+            indices: Sorted int64 row positions for "train", "val" and "test"
+            meta: Parameters the split was computed with
+        """
+        self.indices = indices
+        self.meta = meta
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.indices[name]
+
+    def sizes(self) -> Dict[str, int]:
+        """Number of rows in each set."""
+        return {name: len(self.indices[name]) for name in SPLIT_NAMES}
+
+    def take(self, data: Any, name: str) -> Any:
+        """
+        Rows of one set.
+
+        Args:
+            data: DataFrame, Series, NumPy array or scipy sparse matrix with
+                one row per dataset row
+            name: "train", "val" or "test"
+
+        Returns:
+            The selected rows (a copy; pandas objects keep their index)
+        """
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.take(self.indices[name])
+        return data[self.indices[name]]
+
+    def train_val_test(
+        self, data: pd.DataFrame, target_column: str = "category"
+    ) -> Dict[str, Any]:
+        """
+        Split a DataFrame with a target column into X and y per set.
+
+        Each set is gathered once, with the target left out by column
+        position rather than by dropping it from a copy of the frame.
+
+        Args:
+            data: DataFrame with feature columns and target_column
+            target_column: Name of the target column
+
+        Returns:
+            Dictionary with X_train, X_val, X_test, y_train, y_val, y_test
+        """
+        feature_positions = np.flatnonzero(data.columns != target_column)
+        target = data[target_column]
+        result = {}
+        for name in SPLIT_NAMES:
+            result[f"X_{name}"] = data.iloc[self.indices[name], feature_positions]
+            result[f"y_{name}"] = self.take(target, name)
+        return result
+
+    def save(self, path: str) -> None:
+        """Save the index arrays and parameters to an .npz file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, meta=json.dumps(self.meta), **self.indices)
+
+    @staticmethod
+    def load(path: str) -> "DatasetSplit":
+        """Load a split saved by save()."""
+        with np.load(path) as saved:
+            indices = {name: saved[name] for name in SPLIT_NAMES}
+            meta = json.loads(str(saved["meta"]))
+        return DatasetSplit(indices, meta)
+
+
+def stratified_split_indices(
+    y: pd.Series,
+    test_size: float = 0.2,
+    val_size: float = 0.2,
+    random_seed: int = 42,
+) -> DatasetSplit:
+    """
+    Compute stratified train/val/test row positions in one pass.
+
+    Rows are ordered by (class, random key); within each class the first
+    round(n * test_size) rows go to test and the next
+    round((n - n_test) * val_size) to val, so val_size is a share of the
+    rows left after the test split, as with two chained train_test_split
+    calls.
+
+    Args:
+        y: Labels, one per dataset row
+        test_size: Share of each class used for testing
+        val_size: Share of each class's remaining rows used for validation
+        random_seed: Random seed for reproducibility
+
+    Returns:
+        DatasetSplit
+    """
+    codes, _ = pd.factorize(np.asarray(y), use_na_sentinel=False)
+    rng = np.random.default_rng(random_seed)
+    order = np.lexsort((rng.random(len(codes)), codes))
+
+    class_sizes = np.bincount(codes)
+    class_starts = np.concatenate([[0], np.cumsum(class_sizes)[:-1]])
+    sorted_codes = codes[order]
+    rank = np.arange(len(codes)) - class_starts[sorted_codes]
+
+    n_test = np.round(class_sizes * test_size).astype(np.int64)
+    n_val = np.round((class_sizes - n_test) * val_size).astype(np.int64)
+    is_test = rank < n_test[sorted_codes]
+    is_val = ~is_test & (rank < (n_test + n_val)[sorted_codes])
+
+    indices = {
+        "train": np.sort(order[~is_test & ~is_val]),
+        "val": np.sort(order[is_val]),
+        "test": np.sort(order[is_test]),
+    }
+    meta = {
+        "n_rows": int(len(codes)),
+        "test_size": test_size,
+        "val_size": val_size,
+        "random_seed": random_seed,
+        "labels_hash": _labels_hash(y),
+    }
+    return DatasetSplit(indices, meta)
+
+
+def stratified_fold_indices(
+    y: pd.Series, n_folds: int = 5, random_seed: int = 42
+) -> np.ndarray:
+    """
+    Assign every row to one of n_folds stratified cross-validation folds.
+
+    Rows are ordered by (class, random key) as in stratified_split_indices
+    and dealt round-robin, so each class is spread over the folds as evenly
+    as its size allows.
+
+    Args:
+        y: Labels, one per dataset row
+        n_folds: Number of folds
+        random_seed: Random seed for reproducibility
+
+    Returns:
+        Array with the fold number (0 to n_folds - 1) of each row
+    """
+    if n_folds < 2:
+        raise ValueError(f"Need at least 2 folds, got {n_folds}")
+    codes, _ = pd.factorize(np.asarray(y), use_na_sentinel=False)
+    rng = np.random.default_rng(random_seed)
+    order = np.lexsort((rng.random(len(codes)), codes))
+
+    class_sizes = np.bincount(codes)
+    class_starts = np.concatenate([[0], np.cumsum(class_sizes)[:-1]])
+    rank = np.arange(len(codes)) - class_starts[codes[order]]
+
+    folds = np.empty(len(codes), dtype=np.int64)
+    folds[order] = rank % n_folds
+    return folds
+
+
+def load_or_create_splits(
+    y: pd.Series,
+    path: Optional[str] = None,
+    test_size: float = 0.2,
+    val_size: float = 0.2,
+    random_seed: int = 42,
+    cache_dir: Optional[str] = None,
+) -> DatasetSplit:
+    """
+    Reuse the split persisted at path, or compute and save a new one.
+
+    A saved split is reused only if it was computed with the same
+    parameters on the same labels.
+
+    Args:
+        y: Labels, one per dataset row
+        path: .npz file to reuse or write (None to skip persistence)
+        test_size: Share of each class used for testing
+        val_size: Share of each class's remaining rows used for validation
+        random_seed: Random seed for reproducibility
+        cache_dir: If path is None, persist to a file in this directory
+            named by the labels hash, so each dataset keeps its own split
+
+    Returns:
+        DatasetSplit
+    """
+    labels_hash = _labels_hash(y)
+    expected = {
+        "n_rows": int(len(y)),
+        "test_size": test_size,
+        "val_size": val_size,
+        "random_seed": random_seed,
+        "labels_hash": labels_hash,
+    }
+    if path is None and cache_dir is not None:
+        path = str(Path(cache_dir) / f"{labels_hash[:16]}{SPLITS_FILE}")
+    if path is not None and Path(path).exists():
+        splits = DatasetSplit.load(path)
+        if splits.meta == expected:
+            print(f"✓ Reusing data splits from {path}")
+            return splits
+        print(f"Data splits in {path} are stale, recomputing")
+
+    splits = stratified_split_indices(y, test_size, val_size, random_seed)
+    if path is not None:
+        splits.save(path)
+    return splits
+
+
+def split_chunked_features(
+    store_dir: str,
+    test_size: float = 0.2,
+    val_size: float = 0.2,
+    random_seed: int = 42,
+) -> DatasetSplit:
+    """
+    Split a dataset written by build_features_chunked.
+
+    Only the target column is read; the split is saved as SPLITS_FILE in
+    store_dir and reused while the labels are unchanged.
+
+    Args:
+        store_dir: Directory written by build_features_chunked
+        test_size: Share of each class used for testing
+        val_size: Share of each class's remaining rows used for validation
+        random_seed: Random seed for reproducibility
+
+    Returns:
+        DatasetSplit over the rows of the chunked dataset
+    """
+    from src.features.streaming import load_chunked_features, read_chunked_metadata
+
+    target_column = read_chunked_metadata(store_dir)["target_column"]
+    y = load_chunked_features(store_dir, columns=[target_column], dtype=None)[
+        target_column
+    ]
+    return load_or_create_splits(
+        y, str(Path(store_dir) / SPLITS_FILE), test_size, val_size, random_seed
+    )
+
+
+def iter_split_chunks(
+    store_dir: str,
+    splits: DatasetSplit,
+    name: str,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over the rows of one set, chunk by chunk, from a chunked dataset.
+
+    Args:
+        store_dir: Directory written by build_features_chunked
+        splits: Split of that dataset (see split_chunked_features)
+        name: "train", "val" or "test"
+        columns: Only read these columns
+
+    Yields:
+        Feature DataFrames with the selected rows of each chunk, indexed by
+        their row position in the dataset
+    """
+    from src.features.streaming import iter_chunked_features
+
+    indices = splits[name]
+    offset = 0
+    for chunk in iter_chunked_features(store_dir, columns):
+        start, stop = np.searchsorted(indices, [offset, offset + len(chunk)])
+        selected = chunk.iloc[indices[start:stop] - offset]
+        # Label rows with their position in the whole dataset, like take()
+        selected.index = indices[start:stop]
+        offset += len(chunk)
+        if len(selected) > 0:
+            yield selected
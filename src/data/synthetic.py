@@ -0,0 +1,485 @@
+"""Vectorized and sharded synthetic product data generation."""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# High-cardinality features
+N_SELLERS = 5000
+BRANDS = [
+    "Nike",
+    "Adidas",
+    "Samsung",
+    "Apple",
+    "Sony",
+    "LG",
+    "HP",
+    "Dell",
+    "Canon",
+    "Nikon",
+    "Microsoft",
+    "Google",
+    "Amazon",
+    "Lenovo",
+    "Asus",
+    "Acer",
+    "Toshiba",
+    "Panasonic",
+    "Philips",
+    "Bosch",
+    "Whirlpool",
+    "KitchenAid",
+    "Dyson",
+    "Shark",
+    "Bissell",
+    "iRobot",
+    "Roomba",
+    "Fitbit",
+    "Garmin",
+    "Polar",
+    "UnderArmour",
+    "Puma",
+    "Reebok",
+    "NewBalance",
+    "Vans",
+    "Converse",
+    "Timberland",
+    "Columbia",
+    "NorthFace",
+]
+TITLE_TIERS = ["Pro", "Premium", "Classic", "Elite", "Standard"]
+TITLE_NOUNS = ["Product", "Item", "Device", "Tool", "Accessory"]
+
+# Subcategory -> product category (target variable)
+CATEGORY_MAPPING: Dict[str, str] = {
+    "Electronics": "Electronics",
+    "Clothing": "Clothing",
+    "Home & Kitchen": "Home & Kitchen",
+    "Sports & Outdoors": "Sports & Outdoors",
+    "Books": "Books",
+    "Toys & Games": "Toys & Games",
+    "Beauty & Personal Care": "Beauty",
+    "Automotive": "Automotive",
+    "Garden & Tools": "Garden",
+    "Pet Supplies": "Pet Supplies",
+    "Baby Products": "Baby",
+    "Office Products": "Office",
+}
+SUBCATEGORIES = list(CATEGORY_MAPPING)
+CATEGORIES = list(CATEGORY_MAPPING.values())
+
+# Share of rows whose category is replaced by a random one
+LABEL_NOISE = 0.1
+
+# Sampling profile. The defaults reproduce the uniform generator; the skew
+# options draw sellers and brands from Zipf popularity (exponent, None for
+# uniform) and prices from a log-normal. The drift options scale with the
+# period argument: prices inflate per period, new brands appear and take
+# new_brand_share of rows, and shift_subcategory gains category_shift of the
+# subcategory mix per period.
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "seller_zipf": None,
+    "brand_zipf": None,
+    "price_distribution": "uniform",
+    "price_mu": 4.0,
+    "price_sigma": 1.0,
+    "price_inflation": 0.0,
+    "new_brands_per_period": 0,
+    "new_brand_share": 0.0,
+    "category_shift": 0.0,
+    "shift_subcategory": "Electronics",
+}
+
+# Production-like traffic: a few sellers and brands dominate
+SKEWED_PROFILE: Dict[str, Any] = {
+    **DEFAULT_PROFILE,
+    "seller_zipf": 1.1,
+    "brand_zipf": 1.2,
+    "price_distribution": "lognormal",
+}
+
+# Drift scenarios, applied on top of a profile
+DRIFT_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "price_inflation": {"price_inflation": 0.05},
+    "new_brands": {"new_brands_per_period": 3, "new_brand_share": 0.2},
+    "category_shift": {"category_shift": 0.1},
+}
+
+# Columns of an API request body (see src.inference.api.ProductRequest)
+REQUEST_COLUMNS = [
+    "title",
+    "seller_id",
+    "brand",
+    "subcategory",
+    "price",
+    "rating",
+    "reviews_count",
+]
+
+# Id prefix and seed tag of request stream products. The tag enters the
+# products' SeedSequence, so no dataset seed reproduces them.
+REQUEST_ID_PREFIX = "REQ_"
+REQUEST_STREAM_TAG = 0x52455153
+
+# Rows per shard; shards are the unit of seeding, so output for a given seed
+# depends on the shard size but not on how many workers generate it
+DEFAULT_SHARD_SIZE = 1_000_000
+
+
+def _prefixed_ids(prefix: str, numbers: np.ndarray, width: int) -> np.ndarray:
+    """Vectorized f"{prefix}{n:0{width}d}" over an integer array."""
+    digits = np.char.zfill(numbers.astype(np.str_), width)
+    return np.char.add(prefix, digits).astype(object)
+
+
+def _zipf_choice(
+    rng: np.random.Generator, n_items: int, exponent: Optional[float], size: int
+) -> np.ndarray:
+    """Item indices with Zipf popularity by position (uniform if exponent is None)."""
+    if exponent is None:
+        return rng.integers(0, n_items, size)
+    weights = 1.0 / np.arange(1, n_items + 1) ** exponent
+    return rng.choice(n_items, size, p=weights / weights.sum())
+
+
+def _sample_brands(
+    rng: np.random.Generator, profile: Dict[str, Any], period: int, size: int
+) -> np.ndarray:
+    """Brand column, including brands introduced by the new_brands drift."""
+    brands = np.array(BRANDS, dtype=object)[
+        _zipf_choice(rng, len(BRANDS), profile["brand_zipf"], size)
+    ]
+    n_new = profile["new_brands_per_period"] * period
+    if n_new and profile["new_brand_share"]:
+        new_brands = np.array([f"NewBrand_{i:03d}" for i in range(n_new)], dtype=object)
+        new_mask = rng.random(size) < profile["new_brand_share"]
+        brands[new_mask] = new_brands[rng.integers(0, n_new, new_mask.sum())]
+    return brands
+
+
+def _sample_subcategories(
+    rng: np.random.Generator, profile: Dict[str, Any], period: int, size: int
+) -> np.ndarray:
+    """Subcategory indices, shifted toward shift_subcategory by the drift."""
+    shift = min(profile["category_shift"] * period, 1.0)
+    if not shift:
+        return rng.integers(0, len(SUBCATEGORIES), size)
+    weights = np.full(len(SUBCATEGORIES), (1.0 - shift) / len(SUBCATEGORIES))
+    weights[SUBCATEGORIES.index(profile["shift_subcategory"])] += shift
+    return rng.choice(len(SUBCATEGORIES), size, p=weights)
+
+
+def _sample_prices(
+    rng: np.random.Generator, profile: Dict[str, Any], period: int, size: int
+) -> np.ndarray:
+    """Prices from the profile's distribution, inflated per period."""
+    if profile["price_distribution"] == "lognormal":
+        prices = np.clip(
+            rng.lognormal(profile["price_mu"], profile["price_sigma"], size),
+            0.99,
+            9999.99,
+        )
+    elif profile["price_distribution"] == "uniform":
+        prices = rng.uniform(9.99, 999.99, size)
+    else:
+        raise ValueError(f"Unknown price_distribution: {profile['price_distribution']}")
+    if profile["price_inflation"]:
+        prices = prices * (1.0 + profile["price_inflation"]) ** period
+    return prices.round(2)
+
+
+def resolve_profile(
+    profile: Optional[Dict[str, Any]] = None, drift: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Complete a sampling profile with defaults and a named drift scenario.
+
+    Args:
+        profile: Profile overrides (see DEFAULT_PROFILE)
+        drift: Name of a DRIFT_SCENARIOS entry to apply on top
+
+    Returns:
+        Complete profile dictionary
+    """
+    unknown = set(profile or {}) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"Unknown profile options: {sorted(unknown)}")
+    resolved = {**DEFAULT_PROFILE, **(profile or {})}
+    if drift is not None:
+        if drift not in DRIFT_SCENARIOS:
+            raise ValueError(
+                f"Unknown drift scenario: {drift}. "
+                f"Choose from {sorted(DRIFT_SCENARIOS)}"
+            )
+        resolved.update(DRIFT_SCENARIOS[drift])
+    return resolved
+
+
+def generate_shard(
+    shard_index: int,
+    n_rows: int,
+    seed: int = 42,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    profile: Optional[Dict[str, Any]] = None,
+    period: int = 0,
+    id_prefix: str = "PROD_",
+) -> pd.DataFrame:
+    """
+    Generate one shard of synthetic product data.
+
+    The shard's random stream is seeded from (seed, shard_index) plus the
+    period when it is non-zero, and its product ids continue from the rows of
+    earlier shards. Later periods get their own id prefix (PROD_<period>_).
+
+    Args:
+        shard_index: Position of the shard in the dataset
+        n_rows: Rows in this shard (at most shard_size)
+        seed: Dataset seed
+        shard_size: Rows per full shard, used to number product ids
+        profile: Sampling profile (see DEFAULT_PROFILE and resolve_profile)
+        period: Time period the drift options are evaluated at
+        id_prefix: Product id prefix
+
+    Returns:
+        DataFrame with synthetic product data
+    """
+    profile = resolve_profile(profile)
+    rng = np.random.default_rng(
+        [seed, shard_index] if period == 0 else [seed, shard_index, period]
+    )
+
+    # Titles: "<brand> <tier> <noun> <model number>", built from a small
+    # table of prefixes instead of formatting each row
+    prefixes = np.array(
+        [
+            f"{brand} {tier} {noun} "
+            for brand in BRANDS
+            for tier in TITLE_TIERS
+            for noun in TITLE_NOUNS
+        ]
+    )
+    title_prefix = prefixes[rng.integers(0, len(prefixes), n_rows)]
+    model_number = rng.integers(100, 9999, n_rows).astype(np.str_)
+    titles = np.char.add(title_prefix, model_number).astype(object)
+
+    subcategory_idx = _sample_subcategories(rng, profile, period, n_rows)
+    category_idx = subcategory_idx.copy()
+    noise_mask = rng.random(n_rows) < LABEL_NOISE
+    category_idx[noise_mask] = rng.integers(0, len(CATEGORIES), noise_mask.sum())
+
+    first_id = shard_index * shard_size + 1
+    if period != 0:
+        id_prefix = f"{id_prefix}{period}_"
+    return pd.DataFrame(
+        {
+            "product_id": _prefixed_ids(
+                id_prefix, np.arange(first_id, first_id + n_rows), 6
+            ),
+            "title": titles,
+            "seller_id": _prefixed_ids(
+                "SELLER_",
+                _zipf_choice(rng, N_SELLERS, profile["seller_zipf"], n_rows) + 1,
+                5,
+            ),
+            "brand": _sample_brands(rng, profile, period, n_rows),
+            "subcategory": np.array(SUBCATEGORIES, dtype=object)[subcategory_idx],
+            "price": _sample_prices(rng, profile, period, n_rows),
+            "rating": rng.uniform(3.0, 5.0, n_rows).round(1),
+            "reviews_count": rng.integers(0, 10000, n_rows),
+            "category": np.array(CATEGORIES, dtype=object)[category_idx],
+        }
+    )
+
+
+def _shard_sizes(n_rows: int, shard_size: int):
+    """(shard index, rows) pairs covering n_rows."""
+    return [
+        (index, min(shard_size, n_rows - start))
+        for index, start in enumerate(range(0, n_rows, shard_size))
+    ]
+
+
+def generate_products(
+    n_rows: int,
+    seed: int = 42,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    profile: Optional[Dict[str, Any]] = None,
+    period: int = 0,
+    id_prefix: str = "PROD_",
+) -> pd.DataFrame:
+    """
+    Generate synthetic product data in memory.
+
+    Args:
+        n_rows: Number of rows
+        seed: Dataset seed
+        shard_size: Rows per shard
+        profile: Sampling profile (see DEFAULT_PROFILE and resolve_profile)
+        period: Time period the drift options are evaluated at
+        id_prefix: Product id prefix (see generate_shard)
+
+    Returns:
+        DataFrame with synthetic product data, identical to the concatenated
+        shards written by generate_to_files with the same seed and shard_size
+    """
+    shards = [
+        generate_shard(index, rows, seed, shard_size, profile, period, id_prefix)
+        for index, rows in _shard_sizes(n_rows, shard_size)
+    ]
+    if len(shards) == 1:
+        return shards[0]
+    return pd.concat(shards, ignore_index=True)
+
+
+def _write_shard(
+    shard_index: int,
+    n_rows: int,
+    seed: int,
+    shard_size: int,
+    output_dir: str,
+    file_format: str,
+    profile: Optional[Dict[str, Any]],
+    period: int,
+) -> int:
+    """Generate one shard and write it to output_dir; returns its row count."""
+    data = generate_shard(shard_index, n_rows, seed, shard_size, profile, period)
+    path = Path(output_dir) / f"part-{shard_index:05d}.{file_format}"
+    if file_format == "parquet":
+        data.to_parquet(path, index=False)
+    else:
+        data.to_csv(path, index=False)
+    return len(data)
+
+
+def generate_to_files(
+    n_rows: int,
+    output_dir: str,
+    seed: int = 42,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    n_jobs: Optional[int] = None,
+    file_format: str = "parquet",
+    profile: Optional[Dict[str, Any]] = None,
+    period: int = 0,
+) -> int:
+    """
+    Generate synthetic product data straight to shard files.
+
+    Each shard is generated and written by a worker process, so memory use
+    is bounded by the shard size times the number of workers. The files
+    (part-00000.parquet, ...) form a partitioned dataset that load_data can
+    read as a directory.
+
+    Args:
+        n_rows: Number of rows
+        output_dir: Directory for the shard files
+        seed: Dataset seed
+        shard_size: Rows per shard
+        n_jobs: Number of worker processes (defaults to os.cpu_count())
+        file_format: "parquet" or "csv"
+        profile: Sampling profile (see DEFAULT_PROFILE and resolve_profile)
+        period: Time period the drift options are evaluated at
+
+    Returns:
+        Number of rows written
+    """
+    if file_format not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported file_format: {file_format}")
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    shards = _shard_sizes(n_rows, shard_size)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(shards))
+    args = [
+        (index, rows, seed, shard_size, output_dir, file_format, profile, period)
+        for index, rows in shards
+    ]
+
+    print(f"Generating {n_rows} rows in {len(shards)} shards with {n_jobs} workers")
+    if n_jobs <= 1:
+        written = sum(_write_shard(*shard_args) for shard_args in args)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            written = sum(executor.map(_write_shard, *zip(*args)))
+
+    print(f"✓ Wrote {written} rows to {output_dir}")
+    return written
+
+
+def generate_request_stream(
+    n_requests: int,
+    output_path: str,
+    seed: int = 42,
+    profile: Optional[Dict[str, Any]] = None,
+    period: int = 0,
+    repeat_ratio: float = 0.0,
+) -> int:
+    """
+    Write a replayable stream of API requests as JSON lines.
+
+    Each line is {"product_id", "request", "category"}, where "request" is a
+    ProductRequest body for /predict, "category" the true label and
+    "product_id" identifies the product within the stream. A share
+    repeat_ratio of requests re-send a product seen earlier in the stream,
+    picked uniformly from those before it, which exercises response and
+    feature caches. The stream depends only on its arguments.
+
+    Args:
+        n_requests: Number of requests
+        output_path: JSONL file to write
+        seed: Stream seed
+        profile: Sampling profile (see DEFAULT_PROFILE and resolve_profile)
+        period: Time period the drift options are evaluated at
+        repeat_ratio: Expected share of repeated requests
+
+    Returns:
+        Number of requests written
+    """
+    if not 0.0 <= repeat_ratio < 1.0:
+        raise ValueError("repeat_ratio must be in [0, 1)")
+
+    rng = np.random.default_rng([seed, period, n_requests])
+    repeat_mask = rng.random(n_requests) < repeat_ratio
+    repeat_mask[0] = False
+    n_unique = int((~repeat_mask).sum())
+
+    # Row i sends unique product i if new, else one of the products before it
+    seen_before = np.cumsum(~repeat_mask) - 1
+    rows = seen_before.copy()
+    rows[repeat_mask] = np.floor(
+        rng.random(repeat_mask.sum()) * (seen_before[repeat_mask] + 1)
+    ).astype(np.int64)
+
+    # Tagged seed and own id prefix, so requests never replay training rows
+    product_seed = int(
+        np.random.SeedSequence([seed, REQUEST_STREAM_TAG]).generate_state(1)[0]
+    )
+    products = generate_products(
+        n_unique,
+        product_seed,
+        profile=profile,
+        period=period,
+        id_prefix=REQUEST_ID_PREFIX,
+    )
+    requests = products[REQUEST_COLUMNS].to_dict("records")
+    product_ids = products["product_id"].tolist()
+    categories = products["category"].tolist()
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        for row in rows:
+            record = {
+                "product_id": product_ids[row],
+                "request": requests[row],
+                "category": categories[row],
+            }
+            f.write(json.dumps(record) + "\n")
+
+    print(
+        f"✓ Wrote {n_requests} requests ({n_requests - n_unique} repeats) "
+        f"to {output_path}"
+    )
+    return n_requests
@@ -0,0 +1,251 @@
+"""Row-level validation of raw product data against a declarative schema."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Rules applied by DataValidator() unless a schema is given. Each rule checks
+# one column: "range" rejects values outside [min, max] (missing values pass,
+# preprocess_data fills them), "not_blank" rejects missing or whitespace-only
+# strings and "max_length" rejects strings longer than max.
+DEFAULT_SCHEMA: List[Dict[str, Any]] = [
+    {"name": "price_negative", "column": "price", "kind": "range", "min": 0.0},
+    {
+        "name": "rating_out_of_range",
+        "column": "rating",
+        "kind": "range",
+        "min": 0.0,
+        "max": 5.0,
+    },
+    {
+        "name": "reviews_count_implausible",
+        "column": "reviews_count",
+        "kind": "range",
+        "min": 0,
+        "max": 10_000_000,
+    },
+    {"name": "title_empty", "column": "title", "kind": "not_blank"},
+    {"name": "title_too_long", "column": "title", "kind": "max_length", "max": 1000},
+]
+
+RULE_KINDS = ("range", "not_blank", "max_length")
+
+# Column listing the failed rules of each quarantined row
+VIOLATIONS_COLUMN = "_violations"
+
+
+def _arrow_strings(values: pd.Series):
+    """
+    Arrow string array of a column, for the string rules.
+
+    string[pyarrow] columns are wrapped without a copy and categoricals are
+    reduced to their categories, so the rules run once per category.
+
+    Returns:
+        (array, codes) where codes maps rows to array positions for
+        categoricals (missing values index a trailing null) and is None
+        otherwise
+    """
+    import pyarrow as pa
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories.astype(str).tolist() + [None]
+        return pa.array(categories, type=pa.string()), values.cat.codes.to_numpy()
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed object columns, e.g. numeric titles parsed from CSV
+        strings = values.astype(str).where(values.notna())
+        return pa.array(strings, type=pa.string(), from_pandas=True), None
+
+
+def _compile_rule(rule: Dict[str, Any]) -> Tuple[Callable, bool]:
+    """
+    Turn a schema rule into a violation check.
+
+    Returns:
+        (check, on_strings): check maps the column (or, if on_strings, the
+        Arrow strings from _arrow_strings) to a boolean violation array
+    """
+    kind = rule["kind"]
+    if kind == "range":
+        low = rule.get("min", -np.inf)
+        high = rule.get("max", np.inf)
+
+        def check(values: pd.Series) -> np.ndarray:
+            numbers = pd.to_numeric(values, errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            # NaN compares False on both sides, so missing values pass
+            return (numbers < low) | (numbers > high)
+
+        return check, False
+
+    import pyarrow.compute as pc
+
+    if kind == "not_blank":
+
+        def check(strings) -> np.ndarray:
+            blank = pc.equal(pc.utf8_length(pc.utf8_trim_whitespace(strings)), 0)
+            return pc.fill_null(blank, True).to_numpy(zero_copy_only=False)
+
+    elif kind == "max_length":
+        max_length = rule["max"]
+
+        def check(strings) -> np.ndarray:
+            too_long = pc.greater(pc.utf8_length(strings), max_length)
+            return pc.fill_null(too_long, False).to_numpy(zero_copy_only=False)
+
+    else:
+        raise ValueError(f"Unknown rule kind {kind!r}, expected one of {RULE_KINDS}")
+    return check, True
+
+
+class DataValidator:
+    """
+    Validate raw product rows against a declarative schema.
+
+    The schema is compiled once into one function per rule. Each function
+    checks a whole column at once: numeric rules with NumPy masks, string
+    rules with Arrow compute kernels (once per category for categoricals),
+    so no rule loops over rows in Python. Rules whose column is missing
+    from the data are skipped.
+    """
+
+    def __init__(self, schema: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize validator.
+
+        Args:
+            schema: List of rules with name, column, kind and kind-specific
+                options (defaults to DEFAULT_SCHEMA)
+        """
+        self.schema = DEFAULT_SCHEMA if schema is None else schema
+        self.rules: List[Tuple[str, str, Callable, bool]] = [
+            (rule["name"], rule["column"], *_compile_rule(rule)) for rule in self.schema
+        ]
+
+    def violations(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Violation mask of every rule whose column is present in data."""
+        masks = {}
+        strings: Dict[str, Any] = {}
+        for name, column, check, on_strings in self.rules:
+            if column not in data.columns:
+                continue
+            if not on_strings:
+                masks[name] = check(data[column])
+                continue
+            # Converted once per column and shared by its string rules
+            if column not in strings:
+                strings[column] = _arrow_strings(data[column])
+            array, codes = strings[column]
+            mask = check(array)
+            masks[name] = mask if codes is None else mask[codes]
+        return masks
+
+    def validate(
+        self,
+        data: pd.DataFrame,
+        quarantine_path: Optional[str] = None,
+        append: bool = False,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Split data into valid rows and rejected rows.
+
+        Args:
+            data: Raw DataFrame
+            quarantine_path: CSV file receiving the rejected rows, with the
+                names of the failed rules in VIOLATIONS_COLUMN (written even
+                if no row is rejected, unless appending)
+            append: Append to an existing quarantine file (for chunks)
+                instead of replacing it
+
+        Returns:
+            Tuple of (valid rows, report). The report holds n_rows,
+            n_rejected and violations (rule name -> number of rows failing
+            that rule; a row can fail several rules).
+        """
+        masks = self.violations(data)
+        rejected = np.zeros(len(data), dtype=bool)
+        for mask in masks.values():
+            rejected |= mask
+
+        report = {
+            "n_rows": int(len(data)),
+            "n_rejected": int(rejected.sum()),
+            "violations": {name: int(mask.sum()) for name, mask in masks.items()},
+        }
+        if quarantine_path is not None and (rejected.any() or not append):
+            self._write_quarantine(data, masks, rejected, quarantine_path, append)
+        if not rejected.any():
+            return data, report
+        # take() returns an independent frame that callers may modify in place
+        return data.take(np.flatnonzero(~rejected)), report
+
+    @staticmethod
+    def _write_quarantine(
+        data: pd.DataFrame,
+        masks: Dict[str, np.ndarray],
+        rejected: np.ndarray,
+        quarantine_path: str,
+        append: bool,
+    ) -> None:
+        """Write the rejected rows and their failed rule names to CSV."""
+        quarantined = data[rejected].copy()
+        reasons = np.full(len(quarantined), "", dtype=object)
+        for name, mask in masks.items():
+            reasons[mask[rejected]] += name + ";"
+        quarantined[VIOLATIONS_COLUMN] = [reason[:-1] for reason in reasons]
+
+        path = Path(quarantine_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not (append and path.exists())
+        quarantined.to_csv(
+            path, mode="a" if append else "w", header=write_header, index=False
+        )
+
+
+def print_validation_report(report: Dict[str, Any]) -> None:
+    """Print the rejected row count and per-rule violation counts."""
+    print(f"✓ Validated {report['n_rows']} rows, rejected {report['n_rejected']}")
+    for name, count in report["violations"].items():
+        if count:
+            print(f"  {name}: {count}")
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the reports of several chunks."""
+    merged: Dict[str, Any] = {"n_rows": 0, "n_rejected": 0, "violations": {}}
+    for report in reports:
+        merged["n_rows"] += report["n_rows"]
+        merged["n_rejected"] += report["n_rejected"]
+        for name, count in report["violations"].items():
+            merged["violations"][name] = merged["violations"].get(name, 0) + count
+    return merged
+
+
+def validate_chunks(
+    chunks: Iterable[pd.DataFrame],
+    validator: DataValidator,
+    quarantine_path: Optional[str] = None,
+    reports: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Validate a stream of raw chunks, appending rejected rows to quarantine_path.
+
+    Args:
+        chunks: Iterable of raw DataFrame chunks
+        validator: Validator to apply
+        quarantine_path: CSV file the rejected rows are appended to
+        reports: List receiving each chunk's report (see merge_reports)
+
+    Yields:
+        Valid rows of each chunk
+    """
+    for chunk in chunks:
+        valid, report = validator.validate(chunk, quarantine_path, append=True)
+        if reports is not None:
+            reports.append(report)
+        yield valid
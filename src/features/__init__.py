@@ -1,5 +1,26 @@
 """Feature engineering modules."""
 
-from src.features.build_features import build_features, get_feature_names, hash_feature
+from src.features.build_features import (
+    FeatureTransformer,
+    build_features,
+    build_sparse_features,
+    get_feature_names,
+    hash_feature,
+)
+from src.features.feature_store import FeatureStore
+from src.features.parallel import build_features_parallel
+from src.features.streaming import build_features_chunked, load_chunked_features
+from src.features.vocabulary import VocabularyEncoder
 
-__all__ = ["build_features", "hash_feature", "get_feature_names"]
+__all__ = [
+    "build_features",
+    "build_sparse_features",
+    "hash_feature",
+    "get_feature_names",
+    "FeatureTransformer",
+    "build_features_parallel",
+    "FeatureStore",
+    "build_features_chunked",
+    "load_chunked_features",
+    "VocabularyEncoder",
+]
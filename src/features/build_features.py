@@ -1,10 +1,25 @@
 """Feature engineering for e-commerce product classification."""
 
 import hashlib
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+import joblib
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+
+from src.data.preprocess import median_from_counts, preprocess_data
+from src.features.vocabulary import DEFAULT_VOCAB_COLUMNS, VocabularyEncoder
+
+# Bump whenever feature definitions change; invalidates persisted feature stores
+FEATURE_VERSION = "1"
+
+DEFAULT_FEATURE_CONFIG = {"hash_buckets": 1000, "price_bins": 5, "title_max_words": 10}
+
+# Sparse title n-gram columns are named f"{TITLE_NGRAM_PREFIX}{i}"
+TITLE_NGRAM_PREFIX = "title_ngram_"
+DEFAULT_TITLE_NGRAM_DIM = 2**12
 
 
 def hash_feature(value: str, n_buckets: int = 1000) -> int:
@@ -26,6 +41,61 @@ def hash_feature(value: str, n_buckets: int = 1000) -> int:
     return hash_value % n_buckets
 
 
+def _broadcast(
+    unique_values: np.ndarray, codes: np.ndarray, missing: Any
+) -> np.ndarray:
+    """
+    Map per-unique results back to rows through pd.factorize codes.
+
+    Missing values have code -1, which indexes the appended missing value.
+    """
+    return np.append(unique_values, missing)[codes]
+
+
+def _hash_column(values: pd.Series, n_buckets: int) -> np.ndarray:
+    """hash_feature for every row, computed once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    hashed = np.fromiter(
+        (hash_feature(value, n_buckets) for value in np.asarray(uniques, dtype=object)),
+        dtype=np.int64,
+        count=len(uniques),
+    )
+    return _broadcast(hashed, codes, 0)
+
+
+def _title_features(titles: pd.Series) -> Dict[str, np.ndarray]:
+    """Length, word count and keyword flags, computed once per distinct title."""
+    codes, uniques = pd.factorize(titles)
+    # Keeps string[pyarrow] uniques Arrow-backed for the .str kernels
+    unique_titles = (
+        pd.Series(np.asarray(uniques, dtype=object))
+        if isinstance(titles.dtype, pd.CategoricalDtype)
+        else pd.Series(uniques)
+    )
+
+    columns = {
+        "title_length": _broadcast(
+            unique_titles.str.len().to_numpy(dtype=float, na_value=np.nan),
+            codes,
+            np.nan,
+        ),
+        "title_word_count": _broadcast(
+            unique_titles.str.split().str.len().to_numpy(dtype=float, na_value=np.nan),
+            codes,
+            np.nan,
+        ),
+    }
+
+    # Check for common words (simple keyword features)
+    keywords = ["pro", "premium", "deluxe", "standard", "basic", "new", "sale"]
+    for keyword in keywords:
+        has_keyword = unique_titles.str.contains(keyword, case=False, na=False)
+        columns[f"title_has_{keyword}"] = _broadcast(
+            has_keyword.to_numpy(dtype=int), codes, 0
+        )
+    return columns
+
+
 def build_features(
     data: pd.DataFrame, feature_config: Dict[str, Any] = None
 ) -> pd.DataFrame:
@@ -38,6 +108,17 @@ def build_features(
     - Text features from product title
     - Numerical features
 
+    With feature_config["categorical_encoding"] == "vocabulary" the hashed
+    seller_id, brand and subcategory columns are skipped; FeatureTransformer
+    adds learned vocabulary codes in their place.
+
+    Price ranges are cut into feature_config["price_bins"] equal-width bins
+    over the price range of data, unless feature_config["price_bin_edges"]
+    supplies fitted edges (see FeatureTransformer).
+
+    String columns are factorized first, so hashing and title features are
+    computed once per distinct value and broadcast back to the rows.
+
     Args:
         data: Preprocessed DataFrame
         feature_config: Configuration dictionary for feature engineering
@@ -46,42 +127,60 @@ def build_features(
         DataFrame with engineered features
     """
     if feature_config is None:
-        feature_config = {"hash_buckets": 1000, "price_bins": 5, "title_max_words": 10}
+        feature_config = DEFAULT_FEATURE_CONFIG
 
     features = pd.DataFrame(index=data.index)
+    hash_categoricals = feature_config.get("categorical_encoding", "hash") == "hash"
 
     # 1. Hashed features for high-cardinality categoricals
-    if "seller_id" in data.columns:
-        features["seller_id_hashed"] = data["seller_id"].apply(
-            lambda x: hash_feature(x, feature_config["hash_buckets"])
+    if "seller_id" in data.columns and hash_categoricals:
+        features["seller_id_hashed"] = _hash_column(
+            data["seller_id"], feature_config["hash_buckets"]
         )
 
-    if "brand" in data.columns:
-        features["brand_hashed"] = data["brand"].apply(
-            lambda x: hash_feature(x, feature_config["hash_buckets"])
+    if "brand" in data.columns and hash_categoricals:
+        features["brand_hashed"] = _hash_column(
+            data["brand"], feature_config["hash_buckets"]
         )
 
     # 2. Feature cross: brand × price_range
     if "brand" in data.columns and "price" in data.columns:
         # Create price ranges
+        bins = feature_config.get("price_bin_edges")
+        if bins is None:
+            bins = feature_config["price_bins"]
+            n_bins = bins
+        else:
+            n_bins = len(bins) - 1
         price_bins = pd.cut(
             data["price"],
-            bins=feature_config["price_bins"],
-            labels=[f"price_range_{i}" for i in range(feature_config["price_bins"])],
+            bins=bins,
+            labels=[f"price_range_{i}" for i in range(n_bins)],
         )
 
-        # Create feature cross
-        brand_price_cross = data["brand"].astype(str) + "_" + price_bins.astype(str)
-        features["brand_price_cross_hashed"] = brand_price_cross.apply(
-            lambda x: hash_feature(x, feature_config["hash_buckets"])
+        # Create feature cross on (brand, price range) code pairs, so only
+        # the distinct pairs are turned into strings and hashed
+        brand_codes, brands = pd.factorize(data["brand"], use_na_sentinel=False)
+        range_codes = price_bins.cat.codes.to_numpy().astype(np.int64)
+        range_labels = ["nan"] + [str(label) for label in price_bins.cat.categories]
+        stride = n_bins + 1
+        pair_codes, pairs = pd.factorize(brand_codes * stride + range_codes + 1)
+        cross_values = (
+            f"{brands[pair // stride]}_{range_labels[pair % stride]}" for pair in pairs
         )
+        cross_hashed = np.fromiter(
+            (
+                hash_feature(value, feature_config["hash_buckets"])
+                for value in cross_values
+            ),
+            dtype=np.int64,
+            count=len(pairs),
+        )
+        features["brand_price_cross_hashed"] = cross_hashed[pair_codes]
 
         # Also keep price range as separate feature
-        price_range_cat = pd.cut(
-            data["price"], bins=feature_config["price_bins"], labels=False
-        )
-        features["price_range"] = (
-            pd.to_numeric(price_range_cat, errors="coerce").fillna(0).astype(float)
+        features["price_range"] = np.where(range_codes >= 0, range_codes, 0).astype(
+            float
         )
 
     # 3. Numerical features
@@ -98,22 +197,14 @@ def build_features(
 
     # 4. Text features from title
     if "title" in data.columns:
-        # Title length
-        features["title_length"] = data["title"].str.len()
-        features["title_word_count"] = data["title"].str.split().str.len()
-
-        # Check for common words (simple keyword features)
-        keywords = ["pro", "premium", "deluxe", "standard", "basic", "new", "sale"]
-        for keyword in keywords:
-            features[f"title_has_{keyword}"] = (
-                data["title"].str.contains(keyword, case=False, na=False).astype(int)
-            )
+        for name, values in _title_features(data["title"]).items():
+            features[name] = values
 
     # 5. Subcategory encoding (one-hot for low cardinality, hash for high)
-    if "subcategory" in data.columns:
+    if "subcategory" in data.columns and hash_categoricals:
         # Use hash encoding since subcategory might have many unique values
-        features["subcategory_hashed"] = data["subcategory"].apply(
-            lambda x: hash_feature(x, feature_config["hash_buckets"])
+        features["subcategory_hashed"] = _hash_column(
+            data["subcategory"], feature_config["hash_buckets"]
         )
 
     # Fill any remaining NaN values
@@ -139,6 +230,231 @@ def build_features(
     return features
 
 
+def build_title_ngram_features(
+    titles: pd.Series, n_features: int = DEFAULT_TITLE_NGRAM_DIM
+) -> sp.csr_matrix:
+    """
+    Hashed token and bigram counts of product titles as a sparse matrix.
+
+    Args:
+        titles: Product titles
+        n_features: Number of hash buckets (columns)
+
+    Returns:
+        CSR matrix of shape (len(titles), n_features)
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    vectorizer = HashingVectorizer(
+        n_features=n_features,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+    # Vectorize each distinct title once; missing titles get an empty row
+    codes, uniques = pd.factorize(titles)
+    unique_ngrams = vectorizer.transform(pd.Series(uniques, dtype=object).astype(str))
+    unique_ngrams = sp.vstack(
+        [unique_ngrams, sp.csr_matrix((1, n_features), dtype=np.float32)],
+        format="csr",
+    )
+    return unique_ngrams[codes]
+
+
+def build_sparse_features(
+    data: pd.DataFrame, feature_config: Dict[str, Any] = None
+) -> Tuple[sp.csr_matrix, List[str]]:
+    """
+    Build dense features plus hashed title n-grams as one CSR matrix.
+
+    The n-gram block has feature_config["title_ngram_dim"] columns
+    (DEFAULT_TITLE_NGRAM_DIM if unset) and stays sparse, so it can be passed
+    straight to lgb.Dataset and Booster.predict.
+
+    Args:
+        data: Preprocessed DataFrame
+        feature_config: Configuration dictionary for feature engineering
+
+    Returns:
+        Tuple of (CSR feature matrix, feature names)
+    """
+    if feature_config is None:
+        feature_config = DEFAULT_FEATURE_CONFIG
+
+    dense = build_features(data, feature_config)
+    n_features = feature_config.get("title_ngram_dim", DEFAULT_TITLE_NGRAM_DIM)
+    titles = (
+        data["title"] if "title" in data.columns else pd.Series("", index=data.index)
+    )
+    ngrams = build_title_ngram_features(titles, n_features)
+
+    matrix = sp.hstack([sp.csr_matrix(dense.to_numpy()), ngrams], format="csr")
+    names = list(dense.columns) + [
+        f"{TITLE_NGRAM_PREFIX}{i}" for i in range(n_features)
+    ]
+    return matrix, names
+
+
+def _price_bin_edges(price_min: float, price_max: float, n_bins: int) -> list:
+    """
+    Equal-width price bin edges, matching pd.cut(bins=n_bins) on the fitted data.
+
+    The outer edges are open so that prices outside the fitted range still
+    fall into the first or last bin at transform time.
+    """
+    if price_min == price_max:
+        price_min -= 0.001 * abs(price_min) if price_min != 0 else 0.001
+        price_max += 0.001 * abs(price_max) if price_max != 0 else 0.001
+    edges = np.linspace(price_min, price_max, n_bins + 1)
+    edges[0], edges[-1] = -np.inf, np.inf
+    return edges.tolist()
+
+
+class FeatureTransformer:
+    """
+    Fitted version of preprocess_data + build_features.
+
+    preprocess_data fills missing prices and ratings with the median of the
+    frame it is given, and build_features derives price bins from its price
+    range. Applied to chunks separately, both give different results per
+    chunk. The transformer learns those statistics once, either from a whole
+    frame (fit) or incrementally over chunks (partial_fit), and then applies
+    them unchanged to every chunk it transforms.
+
+    With feature_config["categorical_encoding"] == "vocabulary" it also
+    learns a VocabularyEncoder (minimum frequency
+    feature_config["vocab_min_count"], default 5) and emits its codes
+    instead of the hashed seller_id/brand/subcategory columns.
+    """
+
+    def __init__(self, feature_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize transformer.
+
+        Args:
+            feature_config: Configuration dictionary for feature engineering
+        """
+        self.feature_config = dict(feature_config or DEFAULT_FEATURE_CONFIG)
+        self.fill_values: Dict[str, float] = {}
+        self.price_bin_edges: Optional[list] = None
+        self.vocabulary = self._new_vocabulary()
+        self._value_counts: Dict[str, pd.Series] = {}
+
+    def _new_vocabulary(self) -> Optional[VocabularyEncoder]:
+        """Unfitted vocabulary encoder if the config asks for one."""
+        if self.feature_config.get("categorical_encoding") != "vocabulary":
+            return None
+        return VocabularyEncoder(
+            DEFAULT_VOCAB_COLUMNS,
+            min_count=self.feature_config.get("vocab_min_count", 5),
+        )
+
+    @property
+    def categorical_features(self) -> List[str]:
+        """Feature columns to pass to LightGBM as categorical_feature."""
+        return self.vocabulary.feature_names if self.vocabulary else []
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether any data has been seen by fit/partial_fit."""
+        return bool(self._value_counts)
+
+    def partial_fit(self, raw_data: pd.DataFrame) -> "FeatureTransformer":
+        """
+        Update fitted statistics with one chunk of raw data.
+
+        Only value counts of price and rating are kept, so memory grows with
+        the number of distinct values rather than the number of rows.
+
+        Args:
+            raw_data: Raw DataFrame chunk
+
+        Returns:
+            self
+        """
+        for col in ("price", "rating"):
+            if col not in raw_data.columns:
+                continue
+            counts = raw_data[col].value_counts()
+            previous = self._value_counts.get(col)
+            if previous is not None:
+                counts = previous.add(counts, fill_value=0)
+            self._value_counts[col] = counts
+
+        if self.vocabulary is not None:
+            self.vocabulary.partial_fit(raw_data)
+
+        for col, counts in self._value_counts.items():
+            if len(counts) > 0:
+                self.fill_values[col] = median_from_counts(counts)
+
+        price_counts = self._value_counts.get("price")
+        if price_counts is not None and len(price_counts) > 0:
+            self.price_bin_edges = _price_bin_edges(
+                float(price_counts.index.min()),
+                float(price_counts.index.max()),
+                self.feature_config["price_bins"],
+            )
+        return self
+
+    def fit(self, raw_data: pd.DataFrame) -> "FeatureTransformer":
+        """
+        Fit statistics on a full raw DataFrame.
+
+        Args:
+            raw_data: Raw DataFrame
+
+        Returns:
+            self
+        """
+        self.fill_values = {}
+        self.price_bin_edges = None
+        self._value_counts = {}
+        self.vocabulary = self._new_vocabulary()
+        return self.partial_fit(raw_data)
+
+    def preprocess(self, raw_data: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """Preprocess raw data using the fitted fill values."""
+        return preprocess_data(raw_data, fill_values=self.fill_values, inplace=inplace)
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build features from preprocessed data using the fitted price bins.
+
+        Args:
+            data: Preprocessed DataFrame
+
+        Returns:
+            DataFrame with engineered features
+        """
+        feature_config = dict(self.feature_config)
+        if self.price_bin_edges is not None:
+            feature_config["price_bin_edges"] = self.price_bin_edges
+        features = build_features(data, feature_config)
+        if self.vocabulary is not None:
+            codes = self.vocabulary.transform(data).astype(float)
+            features = pd.concat([features, codes], axis=1)
+        return features
+
+    def save(self, path: str) -> None:
+        """
+        Save fitted transformer to disk.
+
+        Vocabulary fitting counts are dropped first, so a saved transformer
+        only stores the compact code tables and cannot be partial_fit further.
+        """
+        if self.vocabulary is not None:
+            self.vocabulary.compact()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "FeatureTransformer":
+        """Load fitted transformer from disk."""
+        return joblib.load(path)
+
+
 def get_feature_names() -> list:
     """
     Get list of feature names that will be created.
@@ -0,0 +1,212 @@
+"""Persistent on-disk feature store keyed by product_id."""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import (
+    DEFAULT_FEATURE_CONFIG,
+    FEATURE_VERSION,
+    FeatureTransformer,
+)
+
+INPUT_COLUMNS = [
+    "title",
+    "seller_id",
+    "brand",
+    "subcategory",
+    "price",
+    "rating",
+    "reviews_count",
+]
+
+
+def _config_hash(feature_config: Dict[str, Any]) -> str:
+    """Hash of the feature code version and feature configuration."""
+    payload = json.dumps(
+        {"feature_version": FEATURE_VERSION, "feature_config": feature_config},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _row_hashes(data: pd.DataFrame) -> np.ndarray:
+    """64-bit content hash of the feature input columns of every row."""
+    columns = [col for col in INPUT_COLUMNS if col in data.columns]
+    return pd.util.hash_pandas_object(data[columns], index=False).to_numpy(
+        dtype=np.uint64
+    )
+
+
+class FeatureStore:
+    """
+    Feature cache that only recomputes new or changed products.
+
+    Layout of store_dir:
+    - meta.json: feature version, config hash, feature names
+    - transformer.joblib: FeatureTransformer fitted when the store was created
+    - product_ids.npy: sorted product_ids (fixed-width unicode)
+    - row_hashes.npy: content hash of each product's input columns
+    - features.npy: float64 feature matrix, one row per product_id
+
+    The arrays are memory-mapped on read, so a lookup only touches the rows
+    it needs. The whole store is discarded when FEATURE_VERSION or the
+    feature configuration changes. Price bins come from the stored
+    transformer, so features stay comparable across runs.
+    """
+
+    def __init__(self, store_dir: str, feature_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize feature store.
+
+        Args:
+            store_dir: Directory holding the store
+            feature_config: Configuration dictionary for feature engineering
+        """
+        self.store_dir = Path(store_dir)
+        self.feature_config = dict(feature_config or DEFAULT_FEATURE_CONFIG)
+        self.config_hash = _config_hash(self.feature_config)
+        self.transformer: Optional[FeatureTransformer] = None
+        self.feature_names: Optional[list] = None
+        self.last_stats: Dict[str, int] = {}
+        self._load_meta()
+
+    def _load_meta(self) -> None:
+        """Load store metadata, invalidating the store if it is stale."""
+        meta_path = self.store_dir / "meta.json"
+        if not meta_path.exists():
+            return
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("config_hash") != self.config_hash:
+            print("Feature store: feature version or config changed, invalidating")
+            self.clear()
+            return
+
+        self.feature_names = meta["feature_names"]
+        self.transformer = FeatureTransformer.load(
+            str(self.store_dir / "transformer.joblib")
+        )
+
+    def clear(self) -> None:
+        """Delete all stored features."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        self.transformer = None
+        self.feature_names = None
+
+    def __len__(self) -> int:
+        if self.feature_names is None:
+            return 0
+        return len(np.load(self.store_dir / "product_ids.npy", mmap_mode="r"))
+
+    def build_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop-in replacement for build_features backed by the store.
+
+        Args:
+            data: Preprocessed DataFrame with a product_id column
+
+        Returns:
+            DataFrame with engineered features, aligned with data
+        """
+        if self.transformer is None:
+            self.transformer = FeatureTransformer(self.feature_config).fit(data)
+
+        if "product_id" not in data.columns:
+            return self.transformer.transform(data)
+
+        query_ids = data["product_id"].astype(str).to_numpy(dtype=str)
+        query_hashes = _row_hashes(data)
+
+        hit = np.zeros(len(query_ids), dtype=bool)
+        cached = None
+        if self.feature_names is not None:
+            stored_ids = np.load(self.store_dir / "product_ids.npy", mmap_mode="r")
+            stored_hashes = np.load(self.store_dir / "row_hashes.npy", mmap_mode="r")
+            stored_features = np.load(self.store_dir / "features.npy", mmap_mode="r")
+            if len(stored_ids) > 0:
+                positions = np.searchsorted(stored_ids, query_ids)
+                positions = np.minimum(positions, len(stored_ids) - 1)
+                hit = (stored_ids[positions] == query_ids) & (
+                    stored_hashes[positions] == query_hashes
+                )
+                cached = np.asarray(stored_features[positions[hit]])
+            # Release the memory maps before the files may be rewritten
+            del stored_ids, stored_hashes, stored_features
+
+        missing = ~hit
+        computed = None
+        if missing.any():
+            computed = self.transformer.transform(data[missing])
+            if self.feature_names is not None and list(computed.columns) != list(
+                self.feature_names
+            ):
+                # Input columns changed the feature set; start over
+                self.clear()
+                return self.build_features(data)
+            self.feature_names = list(computed.columns)
+
+        result = np.empty((len(data), len(self.feature_names)), dtype=np.float64)
+        if cached is not None:
+            result[hit] = cached
+        if computed is not None:
+            result[missing] = computed.to_numpy(dtype=np.float64)
+            self._update(query_ids[missing], query_hashes[missing], result[missing])
+
+        self.last_stats = {"hits": int(hit.sum()), "computed": int(missing.sum())}
+        print(
+            f"Feature store: {self.last_stats['hits']} cached, "
+            f"{self.last_stats['computed']} computed"
+        )
+        return pd.DataFrame(result, index=data.index, columns=self.feature_names)
+
+    def _update(
+        self, product_ids: np.ndarray, row_hashes: np.ndarray, features: np.ndarray
+    ) -> None:
+        """Insert or overwrite rows and rewrite the sorted arrays."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        ids_path = self.store_dir / "product_ids.npy"
+
+        if ids_path.exists():
+            product_ids = np.concatenate([np.load(ids_path), product_ids])
+            row_hashes = np.concatenate(
+                [np.load(self.store_dir / "row_hashes.npy"), row_hashes]
+            )
+            features = np.concatenate(
+                [np.load(self.store_dir / "features.npy"), features]
+            )
+
+        # Keep the newest version of each product_id, sorted for binary search
+        reversed_ids = product_ids[::-1]
+        _, last = np.unique(reversed_ids, return_index=True)
+        keep = len(product_ids) - 1 - last
+
+        for name, array in [
+            ("product_ids.npy", product_ids[keep]),
+            ("row_hashes.npy", row_hashes[keep]),
+            ("features.npy", features[keep]),
+        ]:
+            tmp_path = self.store_dir / f"{name}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            tmp_path.replace(self.store_dir / name)
+
+        self.transformer.save(str(self.store_dir / "transformer.joblib"))
+        with open(self.store_dir / "meta.json", "w") as f:
+            json.dump(
+                {
+                    "feature_version": FEATURE_VERSION,
+                    "config_hash": self.config_hash,
+                    "feature_names": self.feature_names,
+                    "n_products": int(len(keep)),
+                },
+                f,
+                indent=2,
+            )
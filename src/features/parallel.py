@@ -0,0 +1,105 @@
+"""Multi-process feature building for large frames."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import FeatureTransformer
+
+
+def _featurize_shard(
+    shard: pd.DataFrame,
+    transformer: FeatureTransformer,
+    columns: List[str],
+    shm_name: str,
+    shape: Tuple[int, int],
+    start: int,
+) -> int:
+    """
+    Featurize one row shard and write it into the shared result matrix.
+
+    Runs in a worker process. Only the row count is sent back, so the
+    feature matrix itself is never pickled.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        result = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        features = transformer.transform(shard)
+        result[start : start + len(shard)] = features[columns].to_numpy(
+            dtype=np.float64
+        )
+        del result
+    finally:
+        shm.close()
+    return len(shard)
+
+
+def build_features_parallel(
+    data: pd.DataFrame,
+    feature_config: Optional[Dict[str, Any]] = None,
+    n_jobs: Optional[int] = None,
+    n_shards: Optional[int] = None,
+    min_rows_per_shard: int = 50_000,
+) -> pd.DataFrame:
+    """
+    Build features from preprocessed data using a process pool.
+
+    The frame is split into contiguous row shards that are featurized in
+    parallel and written in place into one shared-memory float64 matrix, so
+    rows come back in input order. Price bins are fitted on the full frame
+    first, so the result equals build_features(data, feature_config).
+
+    Args:
+        data: Preprocessed DataFrame
+        feature_config: Configuration dictionary for feature engineering
+        n_jobs: Number of worker processes (defaults to os.cpu_count())
+        n_shards: Number of row shards (defaults to n_jobs)
+        min_rows_per_shard: Frames too small to give every shard this many
+            rows use fewer shards; a single shard runs in-process
+
+    Returns:
+        DataFrame with engineered features
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_shards = n_shards or n_jobs
+    n_shards = max(1, min(n_shards, len(data) // max(min_rows_per_shard, 1)))
+
+    transformer = FeatureTransformer(feature_config).fit(data)
+    if n_shards == 1 or n_jobs == 1:
+        return transformer.transform(data)
+
+    columns = list(transformer.transform(data.iloc[:1]).columns)
+    shape = (len(data), len(columns))
+    bounds = np.linspace(0, len(data), n_shards + 1, dtype=int)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_shards)) as executor:
+            futures = [
+                executor.submit(
+                    _featurize_shard,
+                    data.iloc[start:end],
+                    transformer,
+                    columns,
+                    shm.name,
+                    shape,
+                    start,
+                )
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            n_rows = sum(future.result() for future in futures)
+        if n_rows != len(data):
+            raise RuntimeError(f"Featurized {n_rows} rows, expected {len(data)}")
+
+        result = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        features = pd.DataFrame(result.copy(), index=data.index, columns=columns)
+        del result
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return features
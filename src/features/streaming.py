@@ -0,0 +1,227 @@
+"""Chunked feature pipeline for datasets larger than memory."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from src.data.load import iter_data_chunks
+from src.data.preprocess import preprocess_chunks
+from src.data.validation import (
+    DataValidator,
+    merge_reports,
+    print_validation_report,
+    validate_chunks,
+)
+from src.features.build_features import FeatureTransformer
+
+METADATA_FILE = "_metadata.json"
+TRANSFORMER_FILE = "transformer.joblib"
+QUARANTINE_FILE = "_quarantine.csv"
+
+
+def fit_transformer_chunked(
+    file_path: str,
+    chunksize: int = 100_000,
+    feature_config: Optional[Dict[str, Any]] = None,
+    validator: Optional[DataValidator] = None,
+) -> FeatureTransformer:
+    """
+    Fit a FeatureTransformer in one pass over the columns it learns from.
+
+    Args:
+        file_path: Path to the raw CSV, Parquet or Feather file
+        chunksize: Number of rows per chunk
+        feature_config: Configuration dictionary for feature engineering
+        validator: Drop rows failing its rules (their columns are read too,
+            so the same rows are rejected as in the featurizing pass)
+
+    Returns:
+        Fitted FeatureTransformer
+    """
+    transformer = FeatureTransformer(feature_config)
+    columns = ["price", "rating"]
+    if transformer.vocabulary is not None:
+        columns += transformer.vocabulary.columns
+    if validator is not None:
+        columns += sorted({rule["column"] for rule in validator.schema} - set(columns))
+    chunks = iter_data_chunks(file_path, chunksize, columns=columns)
+    if validator is not None:
+        chunks = validate_chunks(chunks, validator)
+    for chunk in chunks:
+        transformer.partial_fit(chunk)
+    return transformer
+
+
+def iter_feature_chunks(
+    file_path: str,
+    transformer: FeatureTransformer,
+    chunksize: int = 100_000,
+    target_column: str = "category",
+    validator: Optional[DataValidator] = None,
+    quarantine_path: Optional[str] = None,
+    validation_reports: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Validate, preprocess and featurize a raw file chunk by chunk.
+
+    Duplicate product_ids are dropped across chunks, keeping the first
+    occurrence as preprocess_data does for a single frame.
+
+    Args:
+        file_path: Path to the raw CSV, Parquet or Feather file
+        transformer: Fitted FeatureTransformer
+        chunksize: Number of rows per chunk
+        target_column: Target column copied into each feature chunk
+        validator: Drop rows failing its rules before preprocessing
+        quarantine_path: CSV file the rejected rows are appended to
+        validation_reports: List receiving each chunk's validation report
+
+    Yields:
+        Feature DataFrames (plus target column if present)
+    """
+    raw_chunks = iter_data_chunks(file_path, chunksize)
+    if validator is not None:
+        raw_chunks = validate_chunks(
+            raw_chunks, validator, quarantine_path, validation_reports
+        )
+    for processed in preprocess_chunks(raw_chunks, transformer.fill_values):
+        features = transformer.transform(processed)
+        if target_column in processed.columns:
+            features[target_column] = processed[target_column]
+        yield features
+
+
+def build_features_chunked(
+    file_path: str,
+    output_dir: str,
+    chunksize: int = 100_000,
+    feature_config: Optional[Dict[str, Any]] = None,
+    target_column: str = "category",
+    validator: Optional[DataValidator] = None,
+) -> Dict[str, Any]:
+    """
+    Build features for a raw file in chunks and write them to Parquet parts.
+
+    Makes two passes over the file: one to fit the transformer on price and
+    rating, one to featurize. Only one chunk is held in memory at a time.
+    With a validator, rejected rows are left out of both passes and written
+    to output_dir/_quarantine.csv.
+
+    Args:
+        file_path: Path to the raw CSV, Parquet or Feather file
+        output_dir: Directory for the Parquet parts and metadata
+        chunksize: Number of rows per chunk
+        feature_config: Configuration dictionary for feature engineering
+        target_column: Target column stored alongside the features
+        validator: Validator applied to the raw chunks
+
+    Returns:
+        Metadata dictionary (also written to output_dir/_metadata.json)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for old_part in output_dir.glob("part-*.parquet"):
+        old_part.unlink()
+    quarantine_path = output_dir / QUARANTINE_FILE
+    if quarantine_path.exists():
+        quarantine_path.unlink()
+
+    print(f"Fitting feature transformer on {file_path} (chunksize={chunksize})...")
+    transformer = fit_transformer_chunked(
+        file_path, chunksize, feature_config, validator
+    )
+    transformer.save(str(output_dir / TRANSFORMER_FILE))
+
+    files = []
+    n_rows = 0
+    feature_names: List[str] = []
+    validation_reports: List[Dict[str, Any]] = []
+    for i, features in enumerate(
+        iter_feature_chunks(
+            file_path,
+            transformer,
+            chunksize,
+            target_column,
+            validator,
+            str(quarantine_path),
+            validation_reports,
+        )
+    ):
+        part_name = f"part-{i:05d}.parquet"
+        features.to_parquet(output_dir / part_name, index=False)
+        files.append(part_name)
+        n_rows += len(features)
+        feature_names = [col for col in features.columns if col != target_column]
+
+    metadata = {
+        "source": str(file_path),
+        "chunksize": chunksize,
+        "n_rows": n_rows,
+        "files": files,
+        "feature_names": feature_names,
+        "target_column": target_column,
+    }
+    if validator is not None:
+        metadata["validation"] = merge_reports(validation_reports)
+        print_validation_report(metadata["validation"])
+    with open(output_dir / METADATA_FILE, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    print(f"✓ Wrote {n_rows} feature rows in {len(files)} chunks to {output_dir}")
+    return metadata
+
+
+def read_chunked_metadata(store_dir: str) -> Dict[str, Any]:
+    """Read the metadata written by build_features_chunked."""
+    metadata_path = Path(store_dir) / METADATA_FILE
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"No chunked feature dataset found in {store_dir}")
+    with open(metadata_path) as f:
+        return json.load(f)
+
+
+def iter_chunked_features(
+    store_dir: str, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over the feature chunks written by build_features_chunked.
+
+    Args:
+        store_dir: Directory written by build_features_chunked
+        columns: Only read these columns
+
+    Yields:
+        Feature DataFrames, one per part file
+    """
+    metadata = read_chunked_metadata(store_dir)
+    for part_name in metadata["files"]:
+        yield pd.read_parquet(Path(store_dir) / part_name, columns=columns)
+
+
+def load_chunked_features(
+    store_dir: str, columns: Optional[List[str]] = None, dtype: Any = None
+) -> pd.DataFrame:
+    """
+    Load a chunked feature dataset into one DataFrame for training.
+
+    Args:
+        store_dir: Directory written by build_features_chunked
+        columns: Only read these columns
+        dtype: Optional dtype for the feature columns (e.g. np.float32 to
+            halve memory); the target column is left unchanged
+
+    Returns:
+        DataFrame with features (and target column if stored)
+    """
+    target_column = read_chunked_metadata(store_dir)["target_column"]
+    chunks = []
+    for chunk in iter_chunked_features(store_dir, columns):
+        if dtype is not None:
+            feature_cols = [col for col in chunk.columns if col != target_column]
+            chunk[feature_cols] = chunk[feature_cols].astype(dtype)
+        chunks.append(chunk)
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,134 @@
+"""Learned vocabulary encoding for high-cardinality categoricals."""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Code for values that are rare in training or unseen
+OOV_CODE = 0
+
+DEFAULT_VOCAB_COLUMNS = ["seller_id", "brand", "subcategory"]
+
+
+class VocabularyEncoder:
+    """
+    Frequency-thresholded integer codes for categorical columns.
+
+    An alternative to hash_feature: every value seen at least min_count
+    times during fitting gets its own code (1..n), everything else maps to
+    OOV_CODE, so frequent values never collide. Each vocabulary is stored
+    as a sorted fixed-width string array and looked up with a binary search
+    (np.searchsorted), which is far cheaper than hashing every string.
+    The codes are meant to be passed to LightGBM as native categoricals.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str] = DEFAULT_VOCAB_COLUMNS,
+        min_count: int = 5,
+        max_size: Optional[int] = None,
+    ):
+        """
+        Initialize encoder.
+
+        Args:
+            columns: Categorical columns to encode
+            min_count: Minimum training frequency for a value to get a code
+            max_size: Keep at most this many of the most frequent values
+        """
+        self.columns = list(columns)
+        self.min_count = min_count
+        self.max_size = max_size
+        self.vocabularies: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, pd.Series] = {}
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the code columns produced by transform."""
+        return [f"{col}_code" for col in self.columns]
+
+    def partial_fit(self, data: pd.DataFrame) -> "VocabularyEncoder":
+        """
+        Update value counts with one chunk of data and rebuild vocabularies.
+
+        Args:
+            data: DataFrame chunk
+
+        Returns:
+            self
+        """
+        for col in self.columns:
+            if col not in data.columns:
+                continue
+            counts = data[col].dropna().astype(str).value_counts()
+            previous = self._counts.get(col)
+            if previous is not None:
+                counts = previous.add(counts, fill_value=0)
+            self._counts[col] = counts
+
+        for col, counts in self._counts.items():
+            kept = counts[counts >= self.min_count]
+            if self.max_size is not None:
+                kept = kept.nlargest(self.max_size)
+            self.vocabularies[col] = np.sort(kept.index.to_numpy(dtype=str))
+        return self
+
+    def fit(self, data: pd.DataFrame) -> "VocabularyEncoder":
+        """
+        Learn vocabularies from a full DataFrame.
+
+        Args:
+            data: Training DataFrame
+
+        Returns:
+            self
+        """
+        self.vocabularies = {}
+        self._counts = {}
+        return self.partial_fit(data)
+
+    def encode(self, values: pd.Series, column: str) -> np.ndarray:
+        """
+        Map values of one column to their codes.
+
+        Args:
+            values: Values to encode
+            column: Column whose vocabulary to use
+
+        Returns:
+            int32 array of codes (OOV_CODE for rare or unseen values)
+        """
+        vocabulary = self.vocabularies.get(column)
+        if vocabulary is None or len(vocabulary) == 0:
+            return np.full(len(values), OOV_CODE, dtype=np.int32)
+
+        # Look up each distinct value once, then broadcast through the codes
+        value_codes, uniques = pd.factorize(values)
+        keys = np.asarray(uniques, dtype=str)
+        positions = np.searchsorted(vocabulary, keys)
+        positions = np.minimum(positions, len(vocabulary) - 1)
+        found = vocabulary[positions] == keys
+        unique_codes = np.where(found, positions + 1, OOV_CODE).astype(np.int32)
+        return np.append(unique_codes, np.int32(OOV_CODE))[value_codes]
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode all vocabulary columns present in data.
+
+        Args:
+            data: DataFrame to encode
+
+        Returns:
+            DataFrame with one f"{column}_code" column per encoded column
+        """
+        codes = pd.DataFrame(index=data.index)
+        for col in self.columns:
+            if col in data.columns:
+                codes[f"{col}_code"] = self.encode(data[col], col)
+        return codes
+
+    def compact(self) -> "VocabularyEncoder":
+        """Drop the fitting counts, keeping only the code tables."""
+        self._counts = {}
+        return self
@@ -2,11 +2,12 @@
 
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import joblib
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from fastapi import FastAPI, HTTPException  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
 from pydantic import BaseModel, Field  # type: ignore
@@ -16,7 +17,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import lightgbm as lgb  # type: ignore
 
-from src.features.build_features import build_features
+from src.data.validation import DataValidator
+from src.features.build_features import (
+    TITLE_NGRAM_PREFIX,
+    FeatureTransformer,
+    build_features,
+    build_title_ngram_features,
+)
 from src.inference.drift_detection import AlgorithmicFallback, DriftDetector
 
 app = FastAPI(
@@ -40,6 +47,9 @@ label_mapping = None
 drift_detector = None
 fallback_model = None
 reference_data = None  # Store reference data for drift detection
+title_ngram_dim = 0  # Number of sparse title n-gram features the model expects
+feature_transformer = None  # Fitted FeatureTransformer saved by training, if any
+validator = DataValidator()  # Same compiled rules as the training pipeline
 
 
 class ProductRequest(BaseModel):
@@ -54,6 +64,56 @@ class ProductRequest(BaseModel):
     reviews_count: Optional[int] = Field(None, description="Number of reviews")
 
 
+def _request_frame(requests: List[ProductRequest]) -> pd.DataFrame:
+    """Raw DataFrame for a list of requests, with defaults for missing fields."""
+    return pd.DataFrame(
+        [
+            {
+                "title": req.title,
+                "seller_id": req.seller_id or "Unknown",
+                "brand": req.brand or "Unknown",
+                "subcategory": req.subcategory or "Unknown",
+                "price": req.price or 0.0,
+                "rating": req.rating or 0.0,
+                "reviews_count": req.reviews_count or 0,
+            }
+            for req in requests
+        ]
+    )
+
+
+def _request_violations(data: pd.DataFrame) -> Dict[int, List[str]]:
+    """Failed validation rules of each rejected request, by row position."""
+    masks = validator.violations(data)
+    rejected = np.zeros(len(data), dtype=bool)
+    for mask in masks.values():
+        rejected |= mask
+    return {
+        int(row): [name for name, mask in masks.items() if mask[row]]
+        for row in np.flatnonzero(rejected)
+    }
+
+
+def _build_features(data: pd.DataFrame) -> pd.DataFrame:
+    """Build request features with the training transformer when available."""
+    if feature_transformer is not None:
+        return feature_transformer.transform(data)
+    return build_features(data)
+
+
+def _model_input(data: pd.DataFrame, features: pd.DataFrame):
+    """
+    Build the model input matrix for a request frame.
+
+    Models trained on build_sparse_features output get the hashed title
+    n-grams appended as a CSR matrix; other models get the dense features.
+    """
+    if not title_ngram_dim:
+        return features
+    ngrams = build_title_ngram_features(data["title"], title_ngram_dim)
+    return sp.hstack([sp.csr_matrix(features.to_numpy()), ngrams], format="csr")
+
+
 class PredictionResponse(BaseModel):
     """Response model for predictions."""
 
@@ -67,13 +127,19 @@ def load_model(
     label_mapping_path: str = "models/label_mapping.joblib",
     reference_data_path: Optional[str] = None,
     fallback_model_path: Optional[str] = None,
+    transformer_path: str = "models/feature_transformer.joblib",
 ):
     """
     Load the trained model, label mapping, and initialize drift detection.
 
+    If training saved a FeatureTransformer (e.g. with vocabulary-encoded
+    categoricals) at transformer_path and its features match the model, it
+    is used to featurize requests instead of build_features.
+
     Design Pattern: Drift Detection & Algorithmic Fallback
     """
     global model, label_mapping, drift_detector, fallback_model, reference_data
+    global title_ngram_dim, feature_transformer
 
     try:
         # Load LightGBM model
@@ -95,6 +161,37 @@ def load_model(
                 print("Warning: Could not load model from MLflow. Using default path.")
                 model = None
 
+        title_ngram_dim = 0
+        if model is not None and hasattr(model, "feature_name"):
+            title_ngram_dim = sum(
+                name.startswith(TITLE_NGRAM_PREFIX) for name in model.feature_name()
+            )
+
+        feature_transformer = None
+        if model is not None and Path(transformer_path).exists():
+            candidate = FeatureTransformer.load(transformer_path)
+            probe = candidate.transform(
+                pd.DataFrame(
+                    [
+                        {
+                            "title": "",
+                            "seller_id": "Unknown",
+                            "brand": "Unknown",
+                            "subcategory": "Unknown",
+                            "price": 0.0,
+                            "rating": 0.0,
+                            "reviews_count": 0,
+                        }
+                    ]
+                )
+            )
+            model_features = model.feature_name()[: probe.shape[1]]
+            if list(probe.columns) == model_features:
+                feature_transformer = candidate
+                print(f"✓ Loaded feature transformer: {transformer_path}")
+            else:
+                print("ℹ Info: Feature transformer does not match the model, ignoring")
+
         # Load label mapping
         if Path(label_mapping_path).exists():
             label_mapping = joblib.load(label_mapping_path)
@@ -191,7 +288,7 @@ def load_model(
                         X_fallback = reference_data.drop(columns=["category"])
                     else:
                         # Need to build features
-                        X_fallback = build_features(reference_data)
+                        X_fallback = _build_features(reference_data)
 
                     y_fallback = reference_data["category"]
                     fallback_model.train_fallback_model(X_fallback, y_fallback)
@@ -267,24 +364,18 @@ async def predict(request: ProductRequest):
             status_code=503, detail="Model not loaded. Please train a model first."
         )
 
-    try:
-        # Convert request to DataFrame
-        data = pd.DataFrame(
-            [
-                {
-                    "title": request.title,
-                    "seller_id": request.seller_id or "Unknown",
-                    "brand": request.brand or "Unknown",
-                    "subcategory": request.subcategory or "Unknown",
-                    "price": request.price or 0.0,
-                    "rating": request.rating or 0.0,
-                    "reviews_count": request.reviews_count or 0,
-                }
-            ]
+    # Convert request to DataFrame and reject invalid input
+    data = _request_frame([request])
+    violations = _request_violations(data)
+    if violations:
+        raise HTTPException(
+            status_code=422,
+            detail={"error": "Invalid product data", "violations": violations[0]},
         )
 
+    try:
         # Build features
-        features = build_features(data)
+        features = _build_features(data)
 
         # Design Pattern: Drift Detection
         use_fallback = False
@@ -312,7 +403,9 @@ async def predict(request: ProductRequest):
             probabilities = {predicted_category: confidence}
         elif model is not None:
             # Use main model
-            predictions = model.predict(features, num_iteration=model.best_iteration)
+            predictions = model.predict(
+                _model_input(data, features), num_iteration=model.best_iteration
+            )
             predicted_class_idx = np.argmax(predictions[0])
             confidence = float(np.max(predictions[0]))
 
@@ -402,7 +495,7 @@ async def predict(request: ProductRequest):
         if fallback_model is not None:
             try:
                 print(f"Main model failed: {e}, trying fallback")
-                features = build_features(data)
+                features = _build_features(data)
                 fallback_pred, fallback_conf = fallback_model.predict_fallback(features)
                 return PredictionResponse(
                     category=str(fallback_pred[0]),
@@ -422,6 +515,9 @@ async def predict_batch(requests: List[ProductRequest]):
     """
     Predict product categories for multiple products.
 
+    Requests failing validation are not predicted; their entry holds the
+    failed rules instead.
+
     Args:
         requests: List of product information
 
@@ -434,27 +530,23 @@ async def predict_batch(requests: List[ProductRequest]):
         )
 
     try:
-        # Convert requests to DataFrame
-        data = pd.DataFrame(
-            [
-                {
-                    "title": req.title,
-                    "seller_id": req.seller_id or "Unknown",
-                    "brand": req.brand or "Unknown",
-                    "subcategory": req.subcategory or "Unknown",
-                    "price": req.price or 0.0,
-                    "rating": req.rating or 0.0,
-                    "reviews_count": req.reviews_count or 0,
-                }
-                for req in requests
-            ]
-        )
-
-        # Build features
-        features = build_features(data)
-
-        # Make predictions
-        predictions = model.predict(features, num_iteration=model.best_iteration)
+        # Convert requests to DataFrame and set invalid rows aside
+        data = _request_frame(requests)
+        violations = _request_violations(data)
+        if violations:
+            valid = np.ones(len(data), dtype=bool)
+            valid[list(violations)] = False
+            data = data[valid].reset_index(drop=True)
+
+        predictions = np.empty((0, 1))
+        if len(data) > 0:
+            # Build features
+            features = _build_features(data)
+
+            # Make predictions
+            predictions = model.predict(
+                _model_input(data, features), num_iteration=model.best_iteration
+            )
         predicted_class_indices = np.argmax(predictions, axis=1)
         confidences = np.max(predictions, axis=1)
 
@@ -484,6 +576,13 @@ async def predict_batch(requests: List[ProductRequest]):
                 }
             )
 
+        # Put rejected requests back in their positions
+        for row in sorted(violations):
+            results.insert(
+                row,
+                {"error": "Invalid product data", "violations": violations[row]},
+            )
+
         return {"predictions": results}
 
     except Exception as e:
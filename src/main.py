@@ -9,14 +9,21 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 os.environ["PYTHONPATH"] = str(project_root)
 
-from sklearn.model_selection import train_test_split
-
 import mlflow  # type: ignore
 
 # Import modules
 from src.data.load import generate_sample_data, load_data
-from src.data.preprocess import preprocess_data, split_data
-from src.features.build_features import build_features
+from src.data.preprocess import preprocess_data
+from src.data.splits import DEFAULT_SPLITS_DIR, load_or_create_splits
+from src.data.validation import DataValidator, print_validation_report
+from src.features.build_features import (
+    DEFAULT_FEATURE_CONFIG,
+    FeatureTransformer,
+    build_features,
+)
+from src.features.feature_store import FeatureStore
+from src.models.cross_validation import cross_validate
+from src.models.search import hyperparameter_search
 from src.models.train import evaluate_model, train_model
 from src.tracking_utils.tracking import setup_mlflow
 
@@ -38,7 +45,8 @@ def main():
     # Step 2: Load data
     print("\n[2/7] Loading data...")
     try:
-        data = load_data()
+        # STRING_DTYPE=pyarrow|category loads string columns without object
+        data = load_data(string_dtype=os.getenv("STRING_DTYPE"))
         print(f"✓ Loaded {len(data)} samples")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -50,29 +58,58 @@ def main():
         data.to_csv(output_path, index=False)
         print(f"✓ Generated and saved {len(data)} samples")
 
-    # Step 3: Preprocess
-    print("\n[3/7] Preprocessing data...")
-    processed_data = preprocess_data(data)
+    # Step 3: Validate and preprocess
+    print("\n[3/7] Validating and preprocessing data...")
+    # Rejected rows are kept in data/quarantine for inspection
+    data, validation_report = DataValidator().validate(
+        data, str(project_root / "data" / "quarantine" / "rejected.csv")
+    )
+    print_validation_report(validation_report)
+    processed_data = preprocess_data(data, inplace=True)
     print(f"✓ Preprocessed {len(processed_data)} samples")
 
-    # Step 4: Build features
-    print("\n[4/7] Building features...")
-    features = build_features(processed_data)
+    # Step 4: Split data
+    print("\n[4/7] Splitting data...")
+    # Stratified index arrays over the labels, persisted per dataset under
+    # data/cache/splits and reused while the labels match. Computed before
+    # the features so fitted encoders only learn from training rows.
+    splits = load_or_create_splits(
+        processed_data["category"],
+        test_size=0.2,
+        val_size=0.2,
+        random_seed=42,
+        cache_dir=str(project_root / DEFAULT_SPLITS_DIR),
+    )
+
+    # Step 5: Build features
+    print("\n[5/7] Building features...")
+    feature_store_dir = os.getenv("FEATURE_STORE_DIR")
+    categorical_features = None
+    if feature_store_dir:
+        # Only recompute features for new or changed products
+        features = FeatureStore(feature_store_dir).build_features(processed_data)
+    elif os.getenv("CATEGORICAL_ENCODING") == "vocabulary":
+        # Learned vocabulary codes as native LightGBM categoricals. Fitted on
+        # the training rows only; transform works row by row, so one call
+        # covers all three sets.
+        transformer = FeatureTransformer(
+            {**DEFAULT_FEATURE_CONFIG, "categorical_encoding": "vocabulary"}
+        ).fit(splits.take(processed_data, "train"))
+        features = transformer.transform(processed_data)
+        categorical_features = transformer.categorical_features
+        # Saved for the API, which must encode requests the same way
+        transformer.save("models/feature_transformer.joblib")
+    else:
+        features = build_features(processed_data)
     # Add target
     if "category" in processed_data.columns:
         features["category"] = processed_data["category"]
     print(f"✓ Built {features.shape[1]} features")
 
-    # Step 5: Split data
-    print("\n[5/7] Splitting data...")
-    X_train, X_test, y_train, y_test = split_data(
-        features, test_size=0.2, random_seed=42
-    )
-
-    # Further split train into train and val
-    X_train_final, X_val, y_train_final, y_val = train_test_split(
-        X_train, y_train, test_size=0.2, random_state=42, stratify=y_train
-    )
+    data_splits = splits.train_val_test(features, target_column="category")
+    X_train_final, y_train_final = data_splits["X_train"], data_splits["y_train"]
+    X_val, y_val = data_splits["X_val"], data_splits["y_val"]
+    X_test, y_test = data_splits["X_test"], data_splits["y_test"]
 
     print(f"✓ Train: {len(X_train_final)}, Val: {len(X_val)}, Test: {len(X_test)}")
 
@@ -93,6 +130,38 @@ def main():
         "random_state": 42,
     }
 
+    search_schedule = os.getenv("HPARAM_SEARCH")
+    if search_schedule:
+        # Tune on the validation split, then fit with the best parameters
+        search = hyperparameter_search(
+            X_train_final,
+            y_train_final,
+            X_val,
+            y_val,
+            config=model_config,
+            schedule=search_schedule,
+            n_trials=int(os.getenv("HPARAM_SEARCH_TRIALS", "20")),
+            n_jobs=int(os.getenv("HPARAM_SEARCH_JOBS", "1")),
+            cache_dir=os.getenv("DATASET_CACHE_DIR"),
+            categorical_features=categorical_features,
+            mlflow_experiment_name="product_classification",
+        )
+        model_config.update(search["best_params"])
+
+    cv_folds = os.getenv("CV_FOLDS")
+    if cv_folds:
+        # Fold-to-fold spread of the final config, logged to MLflow
+        cross_validate(
+            X_train_final,
+            y_train_final,
+            config=model_config,
+            n_folds=int(cv_folds),
+            n_jobs=int(os.getenv("CV_JOBS", "1")),
+            cache_dir=os.getenv("DATASET_CACHE_DIR"),
+            categorical_features=categorical_features,
+            mlflow_experiment_name="product_classification",
+        )
+
     # Enable design patterns
     model, train_metrics = train_model(
         X_train_final,
@@ -106,6 +175,9 @@ def main():
         rebalancing_method="class_weight",  # Options: "class_weight", "oversample", "undersample", "SMOTE"
         enable_checkpoints=True,  # Design Pattern: Checkpoints
         checkpoint_dir="models/checkpoints",
+        categorical_features=categorical_features,
+        # Reuse binned LightGBM Datasets across runs on unchanged data
+        dataset_cache_dir=os.getenv("DATASET_CACHE_DIR"),
     )
 
     print("-" * 60)
@@ -1,5 +1,5 @@
 """Model training and prediction modules."""
 
-from src.models.train import evaluate_model, train_model
+from src.models.train import evaluate_model, evaluate_model_chunked, train_model
 
-__all__ = ["train_model", "evaluate_model"]
+__all__ = ["train_model", "evaluate_model", "evaluate_model_chunked"]
@@ -0,0 +1,285 @@
+"""Parallel k-fold cross-validation on one shared LightGBM Dataset."""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb  # type: ignore
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+
+import mlflow  # type: ignore
+from src.data.splits import stratified_fold_indices
+from src.models.dataset_cache import (
+    binning_params,
+    cached_dataset_paths,
+    load_cached_dataset,
+)
+from src.models.train import _clean_features
+
+KEEP_MODES = ("best", "ensemble")
+
+# Full binned Dataset of the current cross-validation, one per worker process
+_dataset: Dict[str, lgb.Dataset] = {}
+
+
+def _load_dataset(path: str, config: Dict[str, Any]) -> None:
+    """Load the shared binary Dataset; the initializer of worker processes."""
+    _dataset["full"] = load_cached_dataset(path, config)
+
+
+def _train_fold(
+    fold: int,
+    folds: np.ndarray,
+    config: Dict[str, Any],
+    num_boost_round: int,
+    early_stopping_rounds: int,
+) -> Dict[str, Any]:
+    """
+    Train on all folds but one and evaluate on the held-out fold.
+
+    The fold Datasets are row subsets of the shared binned Dataset, so no
+    features are binned again. Returns the model as a string for the parent
+    process to predict the held-out rows with.
+    """
+    full = _dataset["full"]
+    params = binning_params(config)
+    train_data = full.subset(np.flatnonzero(folds != fold), params=params)
+    val_data = full.subset(np.flatnonzero(folds == fold), params=params)
+
+    evals: Dict[str, Any] = {}
+    start = time.perf_counter()
+    model = lgb.train(
+        config,
+        train_data,
+        num_boost_round=num_boost_round,
+        valid_sets=[val_data],
+        valid_names=["val"],
+        callbacks=[
+            lgb.early_stopping(
+                early_stopping_rounds, first_metric_only=True, verbose=False
+            ),
+            lgb.record_evaluation(evals),
+        ],
+    )
+    curve = next(iter(evals["val"].values()))
+    best_iteration = model.best_iteration or len(curve)
+    return {
+        "fold": fold,
+        "val_loss": float(curve[best_iteration - 1]),
+        "best_iteration": best_iteration,
+        "seconds": time.perf_counter() - start,
+        "model": model.model_to_string(num_iteration=best_iteration),
+    }
+
+
+class FoldEnsemble:
+    """
+    Average of the fold models' class probabilities.
+
+    Offers the Booster methods evaluate_model and the API use: predict()
+    and best_iteration.
+    """
+
+    best_iteration = None
+
+    def __init__(self, boosters: List[lgb.Booster]):
+        self.boosters = boosters
+
+    def predict(self, X, num_iteration: Optional[int] = None, **kwargs) -> np.ndarray:
+        """Mean predicted probabilities; num_iteration is ignored."""
+        return np.mean(
+            [booster.predict(X, **kwargs) for booster in self.boosters], axis=0
+        )
+
+    def feature_name(self) -> List[str]:
+        """Feature names of the fold models."""
+        return self.boosters[0].feature_name()
+
+
+def cross_validate(
+    X: pd.DataFrame,
+    y: pd.Series,
+    config: Dict[str, Any] = None,
+    n_folds: int = 5,
+    n_jobs: int = 1,
+    threads_per_fold: Optional[int] = None,
+    num_boost_round: int = 100,
+    early_stopping_rounds: int = 10,
+    keep: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    feature_names: list = None,
+    categorical_features: list = None,
+    mlflow_experiment_name: str = "product_classification",
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """
+    Estimate model quality with stratified k-fold cross-validation.
+
+    The features are binned into one LightGBM Dataset, saved in the binary
+    format of src.models.dataset_cache. Each fold trains on a row subset of
+    it, so binning happens once rather than once per fold. With n_jobs > 1
+    the folds train concurrently in worker processes that each load the
+    binary file once; threads_per_fold sets LightGBM's num_threads per fold
+    (keep n_jobs * threads_per_fold at or below the number of cores).
+    lgb.cv would share the Dataset too, but advances all folds in lockstep
+    on one thread pool.
+
+    Each fold stops early on its held-out loss. The held-out predictions of
+    all folds form out-of-fold (oof) predictions for every row. Fold
+    metrics are logged as nested MLflow runs; their mean and standard
+    deviation and the out-of-fold metrics go to the parent run.
+
+    Labels are encoded like train_model but without reframing or
+    rebalancing.
+
+    Args:
+        X: Training features
+        y: Training target
+        config: LightGBM parameters (objective and metric default to
+            multiclass and multi_logloss)
+        n_folds: Number of folds
+        n_jobs: Concurrent folds (worker processes)
+        threads_per_fold: LightGBM threads per fold (defaults to
+            os.cpu_count() // n_jobs)
+        num_boost_round: Maximum boosting rounds per fold
+        early_stopping_rounds: Rounds without held-out improvement before a
+            fold stops
+        keep: "best" to return the fold model with the lowest held-out
+            loss, "ensemble" to return a FoldEnsemble of all fold models,
+            None to return no model
+        cache_dir: Directory for the binary Dataset (a temporary directory
+            removed afterwards by default)
+        feature_names: Feature names for X columns
+        categorical_features: Integer-coded columns to treat as native
+            LightGBM categoricals
+        mlflow_experiment_name: MLflow experiment name
+        random_state: Seed of the fold assignment
+
+    Returns:
+        Dictionary with metrics (aggregated), folds (DataFrame with one row
+        per fold), model (per keep, else None) and idx_to_label
+    """
+    if keep is not None and keep not in KEEP_MODES:
+        raise ValueError(f"Unknown keep mode {keep!r}, expected one of {KEEP_MODES}")
+
+    class_labels = sorted(y.unique())
+    label_to_idx = {label: idx for idx, label in enumerate(class_labels)}
+    idx_to_label = {idx: label for label, idx in label_to_idx.items()}
+    y_numeric = np.asarray(y.map(label_to_idx), dtype=np.int32)
+    folds = stratified_fold_indices(y, n_folds, random_state)
+
+    n_jobs = max(1, min(n_jobs, n_folds))
+    threads_per_fold = threads_per_fold or max(1, (os.cpu_count() or 1) // n_jobs)
+    fold_config = {
+        "objective": "multiclass",
+        "metric": "multi_logloss",
+        "verbose": -1,
+        **(config or {}),
+        "num_class": len(class_labels),
+        "num_threads": threads_per_fold,
+    }
+
+    X_clean = _clean_features(X)
+    temp_dir = None
+    if cache_dir is None:
+        temp_dir = cache_dir = tempfile.mkdtemp(prefix="dataset_cache_")
+    try:
+        path, _ = cached_dataset_paths(
+            X_clean,
+            y_numeric,
+            None,
+            None,
+            fold_config,
+            cache_dir,
+            feature_name=feature_names or "auto",
+            categorical_feature=categorical_features or "auto",
+        )
+        if not path.exists():
+            raise IOError(f"Could not write the shared Dataset to {cache_dir}")
+
+        fold_args = [
+            (fold, folds, fold_config, num_boost_round, early_stopping_rounds)
+            for fold in range(n_folds)
+        ]
+        if n_jobs == 1:
+            _load_dataset(str(path), fold_config)
+            results = [_train_fold(*args) for args in fold_args]
+        else:
+            # Spawned, not forked, for the reason given in src.models.search
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_dataset,
+                initargs=(str(path), fold_config),
+            ) as executor:
+                results = list(executor.map(_train_fold, *zip(*fold_args)))
+    finally:
+        _dataset.clear()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # Out-of-fold predictions: every row is predicted by the model that did
+    # not see it
+    boosters = [lgb.Booster(model_str=result.pop("model")) for result in results]
+    oof_pred = np.empty(len(y_numeric), dtype=np.int64)
+    for result, booster in zip(results, boosters):
+        held_out = np.flatnonzero(folds == result["fold"])
+        if isinstance(X_clean, pd.DataFrame):
+            X_fold = X_clean.iloc[held_out]
+        else:
+            X_fold = X_clean[held_out]
+        pred = np.argmax(booster.predict(X_fold), axis=1)
+        oof_pred[held_out] = pred
+        result["accuracy"] = accuracy_score(y_numeric[held_out], pred)
+        result["f1"] = f1_score(
+            y_numeric[held_out], pred, average="weighted", zero_division=0
+        )
+    fold_table = pd.DataFrame(results)
+
+    metrics: Dict[str, float] = {}
+    for name in ("val_loss", "accuracy", "f1", "best_iteration"):
+        metrics[f"cv_{name}_mean"] = float(fold_table[name].mean())
+        metrics[f"cv_{name}_std"] = float(fold_table[name].std(ddof=0))
+    metrics["oof_accuracy"] = accuracy_score(y_numeric, oof_pred)
+    metrics["oof_f1"] = f1_score(
+        y_numeric, oof_pred, average="weighted", zero_division=0
+    )
+
+    mlflow.set_experiment(mlflow_experiment_name)
+    with mlflow.start_run(
+        run_name="cross_validation", nested=mlflow.active_run() is not None
+    ):
+        mlflow.log_params(fold_config)
+        mlflow.log_params({"n_folds": n_folds, "n_jobs": n_jobs, "keep": keep})
+        for result in results:
+            with mlflow.start_run(run_name=f"fold_{result['fold']}", nested=True):
+                mlflow.log_param("fold", result["fold"])
+                mlflow.log_metrics(
+                    {key: value for key, value in result.items() if key != "fold"}
+                )
+        mlflow.log_metrics(metrics)
+
+    model = None
+    if keep == "best":
+        model = boosters[int(fold_table["val_loss"].idxmin())]
+    elif keep == "ensemble":
+        model = FoldEnsemble(boosters)
+
+    print(
+        f"✓ {n_folds}-fold CV: val loss {metrics['cv_val_loss_mean']:.4f} "
+        f"± {metrics['cv_val_loss_std']:.4f}, "
+        f"accuracy {metrics['cv_accuracy_mean']:.4f} "
+        f"± {metrics['cv_accuracy_std']:.4f}"
+    )
+    return {
+        "metrics": metrics,
+        "folds": fold_table,
+        "model": model,
+        "idx_to_label": idx_to_label,
+    }
@@ -0,0 +1,319 @@
+"""Cache of constructed LightGBM Datasets in LightGBM's binary format."""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import lightgbm as lgb  # type: ignore
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Parameters that change how a Dataset is binned. They are part of the cache
+# key and the only ones passed to the Dataset, so lgb.train accepts the
+# constructed Dataset with the full training config.
+BINNING_PARAMS = (
+    "max_bin",
+    "max_bin_by_feature",
+    "min_data_in_bin",
+    "min_data_in_leaf",
+    "bin_construct_sample_cnt",
+    "data_random_seed",
+    "seed",
+    "random_seed",
+    "random_state",
+    "is_enable_sparse",
+    "enable_bundle",
+    "use_missing",
+    "zero_as_missing",
+    "feature_pre_filter",
+    "forcedbins_filename",
+    "linear_tree",
+)
+
+# Process-wide counters, reported by get_dataset_cache_stats()
+_stats: Dict[str, Any] = {"hits": 0, "misses": 0, "seconds_saved": 0.0}
+_stats_lock = threading.Lock()
+
+
+def get_dataset_cache_stats() -> Dict[str, Any]:
+    """Dataset cache hits, misses and construction time saved in this process."""
+    return dict(_stats)
+
+
+def binning_params(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The BINNING_PARAMS entries of a training config."""
+    return {key: config[key] for key in BINNING_PARAMS if key in config}
+
+
+def dataset_key(
+    X: Any,
+    label: np.ndarray,
+    params: Dict[str, Any],
+    feature_name: Any = "auto",
+    categorical_feature: Any = "auto",
+    reference_key: Optional[str] = None,
+) -> str:
+    """
+    Hash of everything a constructed Dataset depends on.
+
+    Args:
+        X: Cleaned feature DataFrame, array or CSR matrix
+        label: Integer labels
+        params: Binning parameters (see binning_params)
+        feature_name: Feature names passed to the Dataset
+        categorical_feature: Categorical features passed to the Dataset
+        reference_key: Key of the training Dataset, for validation sets
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if sp.issparse(X):
+        for array in (X.data, X.indices, X.indptr):
+            _update_digest(digest, array)
+        digest.update(str(X.shape).encode())
+    elif isinstance(X, pd.DataFrame):
+        # Column by column, so a mixed-dtype frame is never materialized
+        for _, column in X.items():
+            _update_digest(digest, column.to_numpy())
+    else:
+        _update_digest(digest, np.asarray(X))
+    columns = list(X.columns) if isinstance(X, pd.DataFrame) else None
+    _update_digest(digest, np.asarray(label))
+    digest.update(
+        json.dumps(
+            [
+                params,
+                columns,
+                feature_name,
+                categorical_feature,
+                reference_key,
+                lgb.__version__,
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def _update_digest(digest, array: np.ndarray) -> None:
+    """Hash an array's shape, dtype and bytes, reading its buffer in place."""
+    if not array.flags.c_contiguous and array.flags.f_contiguous:
+        # The transpose of a Fortran-ordered array is C-contiguous
+        array = array.T
+        digest.update(b"F")
+    array = np.ascontiguousarray(array)
+    digest.update(str((array.shape, array.dtype.str)).encode())
+    digest.update(memoryview(array).cast("B"))
+
+
+def cached_datasets(
+    X_train: Any,
+    y_train: np.ndarray,
+    X_val: Any,
+    y_val: Optional[np.ndarray],
+    config: Dict[str, Any],
+    cache_dir: str,
+    feature_name: Any = "auto",
+    categorical_feature: Any = "auto",
+    free_raw_data: bool = True,
+) -> Tuple[lgb.Dataset, Optional[lgb.Dataset]]:
+    """
+    Training and validation Datasets, loaded from cache_dir when possible.
+
+    Constructing a Dataset bins every feature, which dominates start-up time
+    on large data and does not depend on most hyperparameters. Constructed
+    Datasets are saved as LightGBM binary files named by dataset_key, so a
+    later run with the same features, labels and binning parameters loads
+    them instead. The validation Dataset is keyed on the training key too,
+    so it always carries the bin mappers of the training set it was built
+    against.
+
+    Args:
+        X_train: Cleaned training features
+        y_train: Integer training labels
+        X_val: Cleaned validation features (or None)
+        y_val: Integer validation labels (or None)
+        config: Training config; only BINNING_PARAMS affect the Datasets
+        cache_dir: Directory for the binary files
+        feature_name: Feature names passed to the training Dataset
+        categorical_feature: Categorical features passed to the training
+            Dataset
+        free_raw_data: Let newly constructed Datasets drop their reference
+            to the feature matrices once binned
+
+    Returns:
+        Tuple of (train_data, val_data); val_data is None without X_val
+    """
+    train_data, val_data, _, _ = _cached(
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        config,
+        cache_dir,
+        feature_name,
+        categorical_feature,
+        free_raw_data,
+    )
+    return train_data, val_data
+
+
+def cached_dataset_paths(
+    X_train: Any,
+    y_train: np.ndarray,
+    X_val: Any,
+    y_val: Optional[np.ndarray],
+    config: Dict[str, Any],
+    cache_dir: str,
+    feature_name: Any = "auto",
+    categorical_feature: Any = "auto",
+) -> Tuple[Path, Optional[Path]]:
+    """
+    Binary files of the training and validation Datasets, built if missing.
+
+    Takes the same arguments as cached_datasets. Other processes can load
+    the files with load_cached_dataset instead of receiving pickled
+    features.
+
+    Returns:
+        Tuple of (train_path, val_path); val_path is None without X_val
+    """
+    _, _, train_path, val_path = _cached(
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        config,
+        cache_dir,
+        feature_name,
+        categorical_feature,
+    )
+    return train_path, val_path
+
+
+def load_cached_dataset(
+    path: Path, config: Dict[str, Any], reference: Optional[lgb.Dataset] = None
+) -> lgb.Dataset:
+    """Load a binary Dataset from cached_dataset_paths."""
+    return lgb.Dataset(
+        str(path), reference=reference, params=binning_params(config)
+    ).construct()
+
+
+def _cached(
+    X_train: Any,
+    y_train: np.ndarray,
+    X_val: Any,
+    y_val: Optional[np.ndarray],
+    config: Dict[str, Any],
+    cache_dir: str,
+    feature_name: Any,
+    categorical_feature: Any,
+    free_raw_data: bool = True,
+) -> Tuple[lgb.Dataset, Optional[lgb.Dataset], Path, Optional[Path]]:
+    """Datasets and binary file paths for cached_datasets and cached_dataset_paths."""
+    cache_root = Path(cache_dir)
+    cache_root.mkdir(parents=True, exist_ok=True)
+    params = binning_params(config)
+
+    train_key = dataset_key(X_train, y_train, params, feature_name, categorical_feature)
+    train_data = _load_or_construct(
+        cache_root,
+        train_key,
+        params,
+        lambda: lgb.Dataset(
+            X_train,
+            label=y_train,
+            feature_name=feature_name,
+            categorical_feature=categorical_feature,
+            params=params,
+            free_raw_data=free_raw_data,
+        ),
+        "training",
+    )
+
+    val_data = val_path = None
+    if X_val is not None and y_val is not None:
+        val_key = dataset_key(X_val, y_val, params, reference_key=train_key)
+        val_data = _load_or_construct(
+            cache_root,
+            val_key,
+            params,
+            lambda: lgb.Dataset(
+                X_val,
+                label=y_val,
+                reference=train_data,
+                params=params,
+                free_raw_data=free_raw_data,
+            ),
+            "validation",
+            reference=train_data,
+        )
+        val_path = cache_root / f"{val_key}.bin"
+    return train_data, val_data, cache_root / f"{train_key}.bin", val_path
+
+
+def _load_or_construct(
+    cache_root: Path,
+    key: str,
+    params: Dict[str, Any],
+    build,
+    kind: str,
+    reference: Optional[lgb.Dataset] = None,
+) -> lgb.Dataset:
+    """Load the binary Dataset for key, or construct it and save it."""
+    binary_path = cache_root / f"{key}.bin"
+    meta_path = cache_root / f"{key}.json"
+
+    if binary_path.exists() and meta_path.exists():
+        with open(meta_path) as f:
+            meta = json.load(f)
+        start = time.perf_counter()
+        dataset = lgb.Dataset(
+            str(binary_path), reference=reference, params=params
+        ).construct()
+        elapsed = time.perf_counter() - start
+        saved = max(meta["construct_seconds"] - elapsed, 0.0)
+        with _stats_lock:
+            _stats["hits"] += 1
+            _stats["seconds_saved"] += saved
+        print(
+            f"✓ Dataset cache hit ({kind}): loaded in {elapsed:.2f}s "
+            f"(construction took {meta['construct_seconds']:.2f}s, "
+            f"saved {saved:.2f}s)"
+        )
+        return dataset
+
+    start = time.perf_counter()
+    dataset = build().construct()
+    construct_seconds = time.perf_counter() - start
+    with _stats_lock:
+        _stats["misses"] += 1
+    print(f"Dataset cache miss ({kind}): constructed in {construct_seconds:.2f}s")
+
+    try:
+        tmp_path = cache_root / f"{key}.bin.tmp"
+        dataset.save_binary(str(tmp_path))
+        tmp_path.replace(binary_path)
+        with open(meta_path, "w") as f:
+            json.dump(
+                {
+                    "kind": kind,
+                    "num_data": dataset.num_data(),
+                    "num_feature": dataset.num_feature(),
+                    "params": params,
+                    "construct_seconds": construct_seconds,
+                },
+                f,
+                indent=2,
+                default=str,
+            )
+    except Exception as e:
+        print(f"Warning: could not write dataset cache: {e}")
+    return dataset
@@ -0,0 +1,578 @@
+"""Parallel hyperparameter search with pruning and MLflow trial logging."""
+
+import itertools
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb  # type: ignore
+import numpy as np
+import pandas as pd
+from mlflow.entities import Metric  # type: ignore
+from mlflow.tracking import MlflowClient  # type: ignore
+
+import mlflow  # type: ignore
+from src.models.dataset_cache import (
+    BINNING_PARAMS,
+    cached_dataset_paths,
+    load_cached_dataset,
+)
+from src.models.train import _clean_features
+
+# Values searched unless a search_space is given. Lists are choices; random
+# and halving schedules also accept (low, high) ranges, sampled uniformly
+# (as integers if both bounds are) or log-uniformly as (low, high, "log").
+# Binning parameters such as min_data_in_leaf are fixed by the shared
+# Dataset and cannot be searched.
+DEFAULT_SEARCH_SPACE: Dict[str, Any] = {
+    "num_leaves": [15, 31, 63, 127],
+    "learning_rate": [0.02, 0.05, 0.1, 0.2],
+    "feature_fraction": [0.6, 0.8, 1.0],
+    "bagging_fraction": [0.6, 0.8, 1.0],
+    "lambda_l2": [0.0, 1.0, 10.0],
+    "min_sum_hessian_in_leaf": [1e-3, 1e-1, 1.0],
+}
+
+SCHEDULES = ("random", "grid", "halving")
+
+# Datasets of the current search, loaded once per worker process
+_datasets: Dict[str, lgb.Dataset] = {}
+
+
+def _load_datasets(train_path: str, val_path: str, config: Dict[str, Any]) -> None:
+    """Load the shared binary Datasets; the initializer of worker processes."""
+    train_data = load_cached_dataset(train_path, config)
+    _datasets["train"] = train_data
+    _datasets["val"] = load_cached_dataset(val_path, config, reference=train_data)
+
+
+class _MedianPruner:
+    """
+    Callback recording the validation loss and pruning unpromising trials.
+
+    Every interval rounds, the best loss so far is compared with the median
+    best loss of finished trials after the same number of rounds (the
+    reference curve); a trial doing worse is stopped.
+    """
+
+    order = 40  # after early stopping
+
+    def __init__(self, reference: Optional[np.ndarray], interval: int):
+        self.reference = reference
+        self.interval = interval
+        self.curve: List[float] = []
+        self.pruned = False
+
+    def __call__(self, env) -> None:
+        val_results = [r for r in env.evaluation_result_list if r[0] == "val"]
+        self.curve.append(float(val_results[0][2]))
+        rounds = len(self.curve)
+        if (
+            self.reference is None
+            or rounds % self.interval
+            or rounds > len(self.reference)
+        ):
+            return
+        if min(self.curve) > self.reference[rounds - 1]:
+            self.pruned = True
+            best = int(np.argmin(self.curve))
+            raise lgb.callback.EarlyStopException(
+                env.begin_iteration + best, env.evaluation_result_list
+            )
+
+
+def _run_trial(
+    trial_id: int,
+    params: Dict[str, Any],
+    config: Dict[str, Any],
+    num_boost_round: int,
+    early_stopping_rounds: int,
+    reference: Optional[np.ndarray],
+    prune_interval: int,
+) -> Dict[str, Any]:
+    """
+    Train one configuration on the shared Datasets.
+
+    Runs in a worker process (or in-process with n_jobs=1); only the
+    trial's summary and loss curve are sent back.
+    """
+    pruner = _MedianPruner(reference, prune_interval)
+    start = time.perf_counter()
+    model = lgb.train(
+        {**config, **params},
+        _datasets["train"],
+        num_boost_round=num_boost_round,
+        valid_sets=[_datasets["val"]],
+        valid_names=["val"],
+        callbacks=[
+            lgb.early_stopping(
+                early_stopping_rounds, first_metric_only=True, verbose=False
+            ),
+            pruner,
+        ],
+    )
+    return {
+        "trial": trial_id,
+        "params": params,
+        "val_loss": min(pruner.curve),
+        "best_iteration": model.best_iteration or len(pruner.curve),
+        "rounds": len(pruner.curve),
+        "pruned": pruner.pruned,
+        "seconds": time.perf_counter() - start,
+        "curve": pruner.curve,
+    }
+
+
+def _sample(spec: Any, rng: np.random.Generator) -> Any:
+    """Draw one value of a search space entry."""
+    if isinstance(spec, list):
+        return spec[rng.integers(len(spec))]
+    low, high = spec[0], spec[1]
+    if len(spec) > 2 and spec[2] == "log":
+        return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+    if isinstance(low, int) and isinstance(high, int):
+        return int(rng.integers(low, high + 1))
+    return float(rng.uniform(low, high))
+
+
+def sample_configs(
+    search_space: Dict[str, Any],
+    schedule: str,
+    n_trials: Optional[int],
+    random_state: int = 42,
+) -> List[Dict[str, Any]]:
+    """
+    Parameter sets of a search.
+
+    Args:
+        search_space: Parameter name -> list of choices or (low, high) range
+        schedule: "grid" for the full product of the lists (a random subset
+            of n_trials points if given), otherwise n_trials random draws
+        n_trials: Number of configurations
+        random_state: Random seed
+
+    Returns:
+        List of parameter dicts
+    """
+    rng = np.random.default_rng(random_state)
+    names = list(search_space)
+    if schedule == "grid":
+        ranges = [name for name in names if not isinstance(search_space[name], list)]
+        if ranges:
+            raise ValueError(f"Grid search needs lists of values, got ranges {ranges}")
+        grid = [
+            dict(zip(names, values))
+            for values in itertools.product(*(search_space[name] for name in names))
+        ]
+        if n_trials is not None and n_trials < len(grid):
+            picks = rng.choice(len(grid), size=n_trials, replace=False)
+            grid = [grid[i] for i in sorted(picks)]
+        return grid
+    return [
+        {name: _sample(search_space[name], rng) for name in names}
+        for _ in range(n_trials or 20)
+    ]
+
+
+def _reference_curve(
+    finished: List[Dict[str, Any]], num_boost_round: int, startup_trials: int
+) -> Optional[np.ndarray]:
+    """Median best-so-far loss of finished, unpruned trials per round."""
+    curves = [r["curve"] for r in finished if not r["pruned"]]
+    if len(curves) < startup_trials:
+        return None
+    best_so_far = np.full((len(curves), num_boost_round), np.nan)
+    for row, curve in zip(best_so_far, curves):
+        running = np.minimum.accumulate(curve)
+        row[: len(running)] = running
+        # Early-stopped trials keep their best loss for later rounds
+        row[len(running) :] = running[-1]
+    return np.median(best_so_far, axis=0)
+
+
+def _run_trials(
+    configs: List[Dict[str, Any]],
+    first_id: int,
+    base_config: Dict[str, Any],
+    num_boost_round: int,
+    early_stopping_rounds: int,
+    executor: Optional[ProcessPoolExecutor],
+    n_jobs: int,
+    prune: bool,
+    startup_trials: int,
+    prune_interval: int,
+    on_result,
+) -> List[Dict[str, Any]]:
+    """
+    Run configurations, at most n_jobs at a time.
+
+    A trial is submitted when a slot frees up, so its pruning reference
+    includes every trial finished before it started.
+    """
+    results: List[Dict[str, Any]] = []
+    pending = list(enumerate(configs, start=first_id))
+    running = set()
+
+    def submit(trial_id: int, params: Dict[str, Any]):
+        reference = (
+            _reference_curve(results, num_boost_round, startup_trials)
+            if prune
+            else None
+        )
+        args = (
+            trial_id,
+            params,
+            base_config,
+            num_boost_round,
+            early_stopping_rounds,
+            reference,
+            prune_interval,
+        )
+        if executor is None:
+            return _run_trial(*args)
+        return executor.submit(_run_trial, *args)
+
+    while pending or running:
+        if executor is None:
+            result = submit(*pending.pop(0))
+            results.append(result)
+            on_result(result)
+            continue
+        while pending and len(running) < n_jobs:
+            running.add(submit(*pending.pop(0)))
+        done, running = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            results.append(result)
+            on_result(result)
+    return sorted(results, key=lambda r: r["trial"])
+
+
+def hyperparameter_search(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    config: Dict[str, Any] = None,
+    search_space: Dict[str, Any] = None,
+    schedule: str = "random",
+    n_trials: Optional[int] = None,
+    n_jobs: int = 1,
+    threads_per_trial: Optional[int] = None,
+    num_boost_round: int = 100,
+    early_stopping_rounds: int = 10,
+    prune: bool = True,
+    startup_trials: int = 3,
+    prune_interval: int = 10,
+    halving_factor: int = 3,
+    min_rounds: int = 10,
+    cache_dir: Optional[str] = None,
+    feature_names: list = None,
+    categorical_features: list = None,
+    mlflow_experiment_name: str = "product_classification",
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """
+    Search LightGBM hyperparameters on a fixed training/validation split.
+
+    The training and validation Datasets are binned once and saved in
+    LightGBM's binary format (see src.models.dataset_cache). With n_jobs > 1
+    every worker process loads those files once and trains its trials on
+    them, so features are never pickled per trial. Each trial uses
+    threads_per_trial LightGBM threads; keep n_jobs * threads_per_trial at
+    or below the number of cores.
+
+    Schedules:
+        random: n_trials draws from search_space
+        grid: every combination of search_space (or n_trials of them)
+        halving: successive halving over n_trials random draws. All
+            configurations train for min_rounds rounds, the best
+            1/halving_factor are kept and retrained with halving_factor
+            times the rounds, until num_boost_round is reached or one
+            configuration is left.
+
+    Random and grid trials stop early when the validation loss stops
+    improving, and, with prune=True, when their best loss is worse than the
+    median of the finished trials after the same number of rounds (checked
+    every prune_interval rounds once startup_trials trials have finished).
+
+    Every trial is logged as a nested MLflow run under one search run, with
+    its parameters, validation loss curve and pruned flag.
+
+    Labels are encoded like train_model but without reframing or
+    rebalancing; pass the best parameters to train_model to fit the model.
+
+    Args:
+        X_train: Training features
+        y_train: Training target
+        X_val: Validation features
+        y_val: Validation target
+        config: Fixed parameters shared by all trials (objective, metric,
+            binning parameters, ...); searched parameters override them
+        search_space: Parameters to search (defaults to DEFAULT_SEARCH_SPACE)
+        schedule: One of SCHEDULES
+        n_trials: Number of configurations (default 20; all points for grid)
+        n_jobs: Concurrent trials (worker processes)
+        threads_per_trial: LightGBM threads per trial (defaults to
+            os.cpu_count() // n_jobs)
+        num_boost_round: Maximum boosting rounds per trial
+        early_stopping_rounds: Rounds without validation improvement before
+            a trial stops
+        prune: Enable median pruning for random and grid schedules
+        startup_trials: Finished trials needed before pruning starts
+        prune_interval: Rounds between pruning checks
+        halving_factor: Elimination factor of the halving schedule
+        min_rounds: Rounds of the first halving rung
+        cache_dir: Directory for the binary Datasets (a temporary directory
+            removed afterwards by default)
+        feature_names: Feature names for X_train columns
+        categorical_features: Integer-coded columns to treat as native
+            LightGBM categoricals
+        mlflow_experiment_name: MLflow experiment name
+        random_state: Seed for sampling configurations
+
+    Returns:
+        Dictionary with best_params, best_val_loss, best_iteration and
+        trials (DataFrame with one row per trial)
+    """
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule {schedule!r}, expected one of {SCHEDULES}")
+    search_space = DEFAULT_SEARCH_SPACE if search_space is None else search_space
+    fixed = [name for name in search_space if name in BINNING_PARAMS]
+    if fixed:
+        raise ValueError(f"Binning parameters cannot be searched: {fixed}")
+
+    class_labels = sorted(y_train.unique())
+    label_to_idx = {label: idx for idx, label in enumerate(class_labels)}
+    y_train_numeric = y_train.map(label_to_idx)
+    y_val_numeric = y_val.map(label_to_idx)
+    if y_val_numeric.isna().any():
+        unmapped = y_val[y_val_numeric.isna()].unique()
+        raise ValueError(f"Found unmapped labels in validation data: {unmapped}")
+
+    n_jobs = max(1, n_jobs)
+    threads_per_trial = threads_per_trial or max(1, (os.cpu_count() or 1) // n_jobs)
+    base_config = {
+        "objective": "multiclass",
+        "metric": "multi_logloss",
+        "verbose": -1,
+        "random_state": random_state,
+        **(config or {}),
+        "num_class": len(class_labels),
+        "num_threads": threads_per_trial,
+    }
+    configs = sample_configs(search_space, schedule, n_trials, random_state)
+
+    temp_dir = None
+    if cache_dir is None:
+        temp_dir = cache_dir = tempfile.mkdtemp(prefix="dataset_cache_")
+    executor = None
+    try:
+        train_path, val_path = cached_dataset_paths(
+            _clean_features(X_train),
+            np.asarray(y_train_numeric, dtype=np.int32),
+            _clean_features(X_val),
+            np.asarray(y_val_numeric, dtype=np.int32),
+            base_config,
+            cache_dir,
+            feature_name=feature_names or "auto",
+            categorical_feature=categorical_features or "auto",
+        )
+        if not (train_path.exists() and val_path.exists()):
+            raise IOError(f"Could not write the shared Datasets to {cache_dir}")
+
+        dataset_args = (str(train_path), str(val_path), base_config)
+        if n_jobs == 1:
+            _load_datasets(*dataset_args)
+        else:
+            # LightGBM's OpenMP runtime is not fork-safe once the parent has
+            # used it to bin the Datasets, so workers are spawned
+            executor = ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_datasets,
+                initargs=dataset_args,
+            )
+
+        mlflow.set_experiment(mlflow_experiment_name)
+        with mlflow.start_run(
+            run_name=f"search_{schedule}", nested=mlflow.active_run() is not None
+        ) as search_run:
+            mlflow.log_params(
+                {
+                    "schedule": schedule,
+                    "n_trials": len(configs),
+                    "n_jobs": n_jobs,
+                    "threads_per_trial": threads_per_trial,
+                    "num_boost_round": num_boost_round,
+                    "prune": prune,
+                }
+            )
+            logger = _TrialLogger(search_run.info.experiment_id, base_config)
+            results = _search(
+                schedule,
+                configs,
+                base_config,
+                num_boost_round,
+                early_stopping_rounds,
+                executor,
+                n_jobs,
+                prune,
+                startup_trials,
+                prune_interval,
+                halving_factor,
+                min_rounds,
+                logger,
+            )
+
+            # Halving compares the configurations of its last rung only
+            last_rung = max(r.get("rung", 0) for r in results)
+            candidates = [
+                r for r in results if not r["pruned"] and r.get("rung", 0) == last_rung
+            ] or results
+            best = min(candidates, key=lambda r: r["val_loss"])
+            trials = pd.DataFrame(
+                [
+                    {
+                        **{k: v for k, v in r.items() if k not in ("params", "curve")},
+                        **r["params"],
+                    }
+                    for r in results
+                ]
+            )
+            mlflow.log_metric("best_val_loss", best["val_loss"])
+            mlflow.log_metric("n_pruned", int(trials["pruned"].sum()))
+            mlflow.log_params({f"best_{k}": v for k, v in best["params"].items()})
+            mlflow.log_text(trials.to_csv(index=False), "search_trials.csv")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _datasets.clear()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(
+        f"✓ Searched {len(trials)} trials ({int(trials['pruned'].sum())} pruned), "
+        f"best val loss {best['val_loss']:.4f}: {best['params']}"
+    )
+    return {
+        "best_params": best["params"],
+        "best_val_loss": best["val_loss"],
+        "best_iteration": best["best_iteration"],
+        "trials": trials,
+    }
+
+
+def _search(
+    schedule: str,
+    configs: List[Dict[str, Any]],
+    base_config: Dict[str, Any],
+    num_boost_round: int,
+    early_stopping_rounds: int,
+    executor: Optional[ProcessPoolExecutor],
+    n_jobs: int,
+    prune: bool,
+    startup_trials: int,
+    prune_interval: int,
+    halving_factor: int,
+    min_rounds: int,
+    logger: "_TrialLogger",
+) -> List[Dict[str, Any]]:
+    """Run the trials of a schedule and return their results."""
+    if schedule != "halving":
+        return _run_trials(
+            configs,
+            0,
+            base_config,
+            num_boost_round,
+            early_stopping_rounds,
+            executor,
+            n_jobs,
+            prune,
+            startup_trials,
+            prune_interval,
+            logger,
+        )
+
+    results: List[Dict[str, Any]] = []
+    survivors = configs
+    rounds = min(min_rounds, num_boost_round)
+    rung = 0
+    while True:
+        # Logged once the rung is ranked, so eliminations show as pruned
+        rung_results = _run_trials(
+            survivors,
+            len(results),
+            base_config,
+            rounds,
+            early_stopping_rounds,
+            executor,
+            n_jobs,
+            False,
+            startup_trials,
+            prune_interval,
+            lambda result: None,
+        )
+        ranked = sorted(rung_results, key=lambda r: r["val_loss"])
+        n_kept = max(1, len(ranked) // halving_factor)
+        if rounds >= num_boost_round:
+            n_kept = len(ranked)
+        last = n_kept == 1 or rounds >= num_boost_round
+        for position, result in enumerate(ranked):
+            result["rung"] = rung
+            result["pruned"] = position >= n_kept
+        for result in rung_results:
+            logger(result)
+        results.extend(rung_results)
+        if last:
+            return results
+        survivors = [r["params"] for r in ranked[:n_kept]]
+        rounds = min(rounds * halving_factor, num_boost_round)
+        rung += 1
+
+
+class _TrialLogger:
+    """Log each finished trial as a nested MLflow run of the search run."""
+
+    def __init__(self, experiment_id: str, base_config: Dict[str, Any]):
+        self.client = MlflowClient()
+        self.experiment_id = experiment_id
+        self.base_config = base_config
+
+    def __call__(self, result: Dict[str, Any]) -> None:
+        params = {**self.base_config, **result["params"]}
+        with mlflow.start_run(
+            run_name=f"trial_{result['trial']}", nested=True
+        ) as trial_run:
+            mlflow.log_params(params)
+            if "rung" in result:
+                mlflow.log_param("rung", result["rung"])
+            mlflow.set_tag("pruned", result["pruned"])
+            timestamp = int(time.time() * 1000)
+            # One batched write for the whole curve instead of one per round
+            self.client.log_batch(
+                trial_run.info.run_id,
+                metrics=[
+                    Metric("val_loss_curve", value, timestamp, step)
+                    for step, value in enumerate(result["curve"])
+                    if math.isfinite(value)
+                ],
+            )
+            mlflow.log_metrics(
+                {
+                    "val_loss": result["val_loss"],
+                    "best_iteration": result["best_iteration"],
+                    "rounds": result["rounds"],
+                    "seconds": result["seconds"],
+                }
+            )
+        status = "pruned" if result["pruned"] else "done"
+        print(
+            f"  trial {result['trial']}: val loss {result['val_loss']:.4f} "
+            f"after {result['rounds']} rounds ({status})"
+        )
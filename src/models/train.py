@@ -2,12 +2,13 @@
 
 import os
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Tuple
 
 import joblib
 import lightgbm as lgb  # type: ignore
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -18,6 +19,7 @@ from sklearn.metrics import (
 
 # Import actual MLflow package
 import mlflow  # type: ignore
+from src.data.cache import get_cache_stats
 
 # Import design patterns
 from src.data.rebalancing import (
@@ -27,6 +29,7 @@ from src.data.rebalancing import (
     reframe_problem,
 )
 from src.models.checkpoints import ModelCheckpoint
+from src.models.dataset_cache import cached_datasets, get_dataset_cache_stats
 
 # Try to import mlflow.lightgbm, use generic logging if not available
 try:
@@ -49,6 +52,10 @@ def train_model(
     rebalancing_method: str = "class_weight",
     enable_checkpoints: bool = True,
     checkpoint_dir: str = "models/checkpoints",
+    feature_names: list = None,
+    categorical_features: list = None,
+    dataset_cache_dir: str = None,
+    free_raw_data: bool = True,
 ) -> Tuple[lgb.Booster, Dict[str, float]]:
     """
     Train LightGBM model for product classification.
@@ -65,6 +72,15 @@ def train_model(
         rebalancing_method: Rebalancing method ('class_weight', 'oversample', 'undersample', 'SMOTE')
         enable_checkpoints: Enable checkpoint pattern (save model during training)
         checkpoint_dir: Directory for checkpoints
+        feature_names: Feature names for X_train columns. Needed for sparse
+            inputs (e.g. from build_sparse_features), which carry no names
+        categorical_features: Integer-coded columns to treat as native
+            LightGBM categoricals (e.g. FeatureTransformer.categorical_features)
+        dataset_cache_dir: Reuse constructed (binned) training and validation
+            Datasets saved here by earlier runs on the same data and binning
+            parameters (see src.models.dataset_cache)
+        free_raw_data: Let the LightGBM Datasets drop their reference to
+            the feature matrices once binned
 
     Returns:
         Tuple of (trained_model, metrics_dict)
@@ -179,7 +195,7 @@ def train_model(
         # Log parameters
         mlflow.log_params(config)
         mlflow.log_param("n_features", X_train.shape[1])
-        mlflow.log_param("n_samples", len(X_train))
+        mlflow.log_param("n_samples", X_train.shape[0])
         mlflow.log_param("n_classes", n_classes)
         mlflow.log_param("reframing_enabled", enable_reframing)
         mlflow.log_param("rebalancing_enabled", enable_rebalancing)
@@ -190,39 +206,67 @@ def train_model(
         mlflow.log_metric("imbalance_ratio", imbalance_info["imbalance_ratio"])
         mlflow.log_param("is_imbalanced", imbalance_info["is_imbalanced"])
 
+        # Raw data cache counters of this process (see src.data.cache)
+        mlflow.log_metrics(
+            {f"data_cache_{name}": value for name, value in get_cache_stats().items()}
+        )
+
         # Prepare data for LightGBM - ensure all features are numeric
-        # Convert to numeric and fill any NaN
-        X_train_clean = X_train.copy()
-        for col in X_train_clean.columns:
-            X_train_clean[col] = pd.to_numeric(
-                X_train_clean[col], errors="coerce"
-            ).fillna(0)
-        X_train_clean = X_train_clean.astype(float)
+        X_train_clean = _clean_features(X_train)
 
         # Use numeric labels for training - ensure it's a numpy array with int dtype
         y_train_numeric_array = np.array(y_train_numeric, dtype=np.int32)
-        train_data = lgb.Dataset(X_train_clean, label=y_train_numeric_array)
 
         if X_val is not None and y_val_numeric is not None:
             # Clean validation data too
-            X_val_clean = X_val.copy()
-            for col in X_val_clean.columns:
-                X_val_clean[col] = pd.to_numeric(
-                    X_val_clean[col], errors="coerce"
-                ).fillna(0)
-            X_val_clean = X_val_clean.astype(float)
+            X_val_clean = _clean_features(X_val)
 
             # Use numeric labels for validation - ensure it's a numpy array with int dtype
             y_val_numeric_array = np.array(y_val_numeric, dtype=np.int32)
-            val_data = lgb.Dataset(
-                X_val_clean, label=y_val_numeric_array, reference=train_data
+        else:
+            X_val_clean = y_val_numeric_array = None
+
+        if dataset_cache_dir:
+            # Binned Datasets are reused while data and binning params match
+            seconds_saved = get_dataset_cache_stats()["seconds_saved"]
+            train_data, val_data = cached_datasets(
+                X_train_clean,
+                y_train_numeric_array,
+                X_val_clean,
+                y_val_numeric_array,
+                config,
+                dataset_cache_dir,
+                feature_name=feature_names or "auto",
+                categorical_feature=categorical_features or "auto",
+                free_raw_data=free_raw_data,
+            )
+            mlflow.log_metric(
+                "dataset_cache_seconds_saved",
+                get_dataset_cache_stats()["seconds_saved"] - seconds_saved,
+            )
+        else:
+            train_data = lgb.Dataset(
+                X_train_clean,
+                label=y_train_numeric_array,
+                feature_name=feature_names or "auto",
+                categorical_feature=categorical_features or "auto",
+                free_raw_data=free_raw_data,
             )
+            val_data = None
+            if X_val_clean is not None:
+                val_data = lgb.Dataset(
+                    X_val_clean,
+                    label=y_val_numeric_array,
+                    reference=train_data,
+                    free_raw_data=free_raw_data,
+                )
+
+        if val_data is not None:
             callbacks = [
                 lgb.early_stopping(stopping_rounds=10),
                 lgb.log_evaluation(period=10),
             ]
         else:
-            val_data = None
             callbacks = [lgb.log_evaluation(period=10)]
 
         # Train model with checkpointing
@@ -364,16 +408,98 @@ def evaluate_model(
     label_mapping = joblib.load(label_mapping_path)
     idx_to_label = label_mapping["idx_to_label"]
 
+    y_pred_labels = _predict_labels(model, X_test, idx_to_label)
+    return _test_metrics(y_test, y_pred_labels)
+
+
+def evaluate_model_chunked(
+    model: lgb.Booster,
+    feature_chunks: Iterable[pd.DataFrame],
+    target_column: str = "category",
+    label_mapping_path: str = "models/label_mapping.joblib",
+) -> Dict[str, float]:
+    """
+    Evaluate trained model on feature chunks without concatenating them.
+
+    Only the true and predicted labels are kept in memory, so this works on
+    chunked feature datasets (see src.features.streaming) larger than RAM.
+
+    Args:
+        model: Trained LightGBM model
+        feature_chunks: Iterable of feature DataFrames including target_column
+        target_column: Name of the target column
+        label_mapping_path: Path to label mapping file
+
+    Returns:
+        Dictionary of evaluation metrics
+    """
+    label_mapping = joblib.load(label_mapping_path)
+    idx_to_label = label_mapping["idx_to_label"]
+
+    y_true = []
+    y_pred_labels = []
+    for chunk in feature_chunks:
+        X_chunk = chunk.drop(columns=[target_column])
+        y_true.extend(chunk[target_column].tolist())
+        y_pred_labels.extend(_predict_labels(model, X_chunk, idx_to_label))
+
+    return _test_metrics(y_true, y_pred_labels)
+
+
+def _is_clean(X) -> bool:
+    """
+    Whether X can go to LightGBM as is.
+
+    True for float NumPy matrices and for DataFrames whose columns all have
+    NumPy numeric dtypes and no NaN (the output of build_features). The NaN
+    check reads one column at a time.
+    """
+    if isinstance(X, np.ndarray):
+        return X.ndim == 2 and X.dtype in (np.float32, np.float64)
+    if not isinstance(X, pd.DataFrame):
+        return False
+    for dtype in X.dtypes:
+        if not isinstance(dtype, np.dtype) or dtype.kind not in "biuf":
+            return False
+    return not any(
+        np.isnan(X[col].to_numpy()).any()
+        for col, dtype in X.dtypes.items()
+        if dtype.kind == "f"
+    )
+
+
+def _clean_features(X):
+    """
+    Convert features to the numeric input LightGBM expects.
+
+    Sparse matrices are passed through as CSR without densifying, and clean
+    inputs (see _is_clean) without copying: LightGBM reads float32/float64
+    matrices and single-dtype frames in place. Other DataFrames are copied
+    with their columns coerced to float and NaN filled by 0.
+    """
+    if sp.issparse(X):
+        return X.tocsr()
+    if _is_clean(X):
+        return X
+
+    X_clean = X.copy()
+    for col in X_clean.columns:
+        X_clean[col] = pd.to_numeric(X_clean[col], errors="coerce").fillna(0)
+    return X_clean.astype(float)
+
+
+def _predict_labels(model: lgb.Booster, X, idx_to_label: Dict[int, Any]) -> list:
+    """Predict string labels for a feature frame or sparse matrix."""
     # Make predictions - ensure numeric types
-    X_test_clean = X_test.copy()
-    for col in X_test_clean.columns:
-        X_test_clean[col] = pd.to_numeric(X_test_clean[col], errors="coerce").fillna(0)
-    X_test_clean = X_test_clean.astype(float)
+    X_clean = _clean_features(X)
 
-    y_pred_proba = model.predict(X_test_clean, num_iteration=model.best_iteration)
+    y_pred_proba = model.predict(X_clean, num_iteration=model.best_iteration)
     y_pred_class = np.argmax(y_pred_proba, axis=1)
-    y_pred_labels = [idx_to_label[idx] for idx in y_pred_class]
+    return [idx_to_label[idx] for idx in y_pred_class]
+
 
+def _test_metrics(y_test, y_pred_labels) -> Dict[str, float]:
+    """Compute test metrics and print the classification report."""
     # Calculate metrics
     accuracy = accuracy_score(y_test, y_pred_labels)
     precision = precision_score(
@@ -14,9 +14,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import actual MLflow package
 import mlflow  # type: ignore
 from src.data.load import load_data
-from src.data.preprocess import preprocess_data, split_data
+from src.data.preprocess import preprocess_data
+from src.data.splits import (
+    DEFAULT_SPLITS_DIR,
+    DatasetSplit,
+    iter_split_chunks,
+    load_or_create_splits,
+    split_chunked_features,
+)
+from src.data.validation import DataValidator, print_validation_report
 from src.features.build_features import build_features
-from src.models.train import evaluate_model, train_model
+from src.features.feature_store import FeatureStore
+from src.features.streaming import build_features_chunked, read_chunked_metadata
+from src.models.train import evaluate_model, evaluate_model_chunked, train_model
 from src.tracking_utils.tracking import register_model, setup_mlflow
 
 
@@ -29,6 +39,17 @@ def load_raw_data_task(data_path: str = None) -> pd.DataFrame:
     return data
 
 
+@task(name="validate_data", log_prints=True)
+def validate_data_task(
+    raw_data: pd.DataFrame, quarantine_path: str = "data/quarantine/rejected.csv"
+) -> pd.DataFrame:
+    """Drop rows failing the validation rules, writing them to quarantine_path."""
+    print("Validating data...")
+    valid_data, report = DataValidator().validate(raw_data, quarantine_path)
+    print_validation_report(report)
+    return valid_data
+
+
 @task(name="preprocess_data", log_prints=True)
 def preprocess_data_task(raw_data: pd.DataFrame) -> pd.DataFrame:
     """Preprocess data."""
@@ -39,41 +60,100 @@ def preprocess_data_task(raw_data: pd.DataFrame) -> pd.DataFrame:
 
 
 @task(name="build_features", log_prints=True)
-def build_features_task(processed_data: pd.DataFrame) -> pd.DataFrame:
-    """Build features."""
+def build_features_task(
+    processed_data: pd.DataFrame, feature_store_dir: str = None
+) -> pd.DataFrame:
+    """Build features, reusing stored features for unchanged products."""
     print("Building features...")
-    features = build_features(processed_data)
+    if feature_store_dir:
+        features = FeatureStore(feature_store_dir).build_features(processed_data)
+    else:
+        features = build_features(processed_data)
     print(f"Built {features.shape[1]} features")
     return features
 
 
+@task(name="build_features_chunked", log_prints=True)
+def build_features_chunked_task(
+    data_path: str, output_dir: str, chunksize: int
+) -> Dict[str, Any]:
+    """Build features chunk by chunk and write them to output_dir."""
+    print(f"Building features in chunks of {chunksize} rows...")
+    metadata = build_features_chunked(
+        data_path, output_dir, chunksize=chunksize, validator=DataValidator()
+    )
+    print(
+        f"Built {len(metadata['feature_names'])} features for "
+        f"{metadata['n_rows']} samples"
+    )
+    return metadata
+
+
+def _float32_features(chunk: pd.DataFrame, target_column: str) -> pd.DataFrame:
+    """Cast the feature columns of a chunk to float32, halving its memory."""
+    feature_cols = [col for col in chunk.columns if col != target_column]
+    chunk[feature_cols] = chunk[feature_cols].astype("float32")
+    return chunk
+
+
 @task(name="split_data", log_prints=True)
 def split_data_task(
-    processed_data: pd.DataFrame, test_size: float = 0.2, random_seed: int = 42
+    processed_data: pd.DataFrame,
+    test_size: float = 0.2,
+    random_seed: int = 42,
+    splits_path: str = None,
 ) -> Dict[str, Any]:
-    """Split data into train/val/test sets."""
+    """
+    Split data into train/val/test sets, reusing splits saved at splits_path.
+
+    Without splits_path, each dataset's split is kept in DEFAULT_SPLITS_DIR.
+    """
     print("Splitting data...")
-    X_train, X_test, y_train, y_test = split_data(
-        processed_data, test_size=test_size, random_seed=random_seed
+    splits = load_or_create_splits(
+        processed_data["category"],
+        splits_path,
+        test_size=test_size,
+        val_size=0.2,
+        random_seed=random_seed,
+        cache_dir=DEFAULT_SPLITS_DIR,
     )
+    data_splits = splits.train_val_test(processed_data, target_column="category")
+
+    sizes = splits.sizes()
+    print(f"Train: {sizes['train']}, Val: {sizes['val']}, Test: {sizes['test']}")
+    return data_splits
 
-    # Further split train into train and val
-    from sklearn.model_selection import train_test_split
 
-    X_train_final, X_val, y_train_final, y_val = train_test_split(
-        X_train, y_train, test_size=0.2, random_state=random_seed, stratify=y_train
+@task(name="split_chunked_features", log_prints=True)
+def split_chunked_features_task(
+    features_dir: str, test_size: float = 0.2, random_seed: int = 42
+) -> DatasetSplit:
+    """Split chunked features by their target column, saved in features_dir."""
+    print("Splitting data...")
+    splits = split_chunked_features(
+        features_dir, test_size=test_size, val_size=0.2, random_seed=random_seed
     )
 
-    print(f"Train: {len(X_train_final)}, Val: {len(X_val)}, Test: {len(X_test)}")
+    sizes = splits.sizes()
+    print(f"Train: {sizes['train']}, Val: {sizes['val']}, Test: {sizes['test']}")
+    return splits
 
-    return {
-        "X_train": X_train_final,
-        "X_val": X_val,
-        "X_test": X_test,
-        "y_train": y_train_final,
-        "y_val": y_val,
-        "y_test": y_test,
-    }
+
+@task(name="load_split_chunked", log_prints=True)
+def load_split_chunked_task(
+    features_dir: str, splits: DatasetSplit, name: str
+) -> tuple:
+    """Read one set of chunked features, cast to float32 chunk by chunk."""
+    target_column = read_chunked_metadata(features_dir)["target_column"]
+    chunks = [
+        _float32_features(chunk, target_column)
+        for chunk in iter_split_chunks(features_dir, splits, name)
+    ]
+    data = pd.concat(chunks)
+    del chunks
+    y = data.pop(target_column)
+    print(f"Loaded {len(data)} {name} samples")
+    return data, y
 
 
 @task(name="train_model", log_prints=True)
@@ -102,6 +182,22 @@ def evaluate_model_task(
     return metrics
 
 
+@task(name="evaluate_model_chunked", log_prints=True)
+def evaluate_model_chunked_task(
+    model: Any, features_dir: str, splits: DatasetSplit
+) -> Dict[str, float]:
+    """Evaluate model on the test set of chunked features, chunk by chunk."""
+    print("Evaluating model...")
+    target_column = read_chunked_metadata(features_dir)["target_column"]
+    test_chunks = (
+        _float32_features(chunk, target_column)
+        for chunk in iter_split_chunks(features_dir, splits, "test")
+    )
+    metrics = evaluate_model_chunked(model, test_chunks, target_column)
+    print(f"Test Accuracy: {metrics.get('test_accuracy', 0):.4f}")
+    return metrics
+
+
 @task(name="register_model", log_prints=True)
 def register_model_task(model_name: str = "product_classifier") -> None:
     """Register model in MLflow."""
@@ -138,55 +234,79 @@ def product_classification_pipeline(
     mlflow_experiment_name: str = "product_classification",
     model_config: Dict[str, Any] = None,
     register_model_flag: bool = True,
+    chunksize: int = None,
+    features_dir: str = "data/features",
+    feature_store_dir: str = None,
 ):
     """
     Main Prefect pipeline for product classification.
 
     Pipeline steps:
     1. Load raw data
-    2. Preprocess data
+    2. Validate and preprocess data
     3. Build features
     4. Split data
     5. Train model
     6. Evaluate model
     7. Register model (optional)
+
+    If chunksize is set (and data_path points to a raw file), steps 1-3 run
+    chunk by chunk and the features are written to features_dir, so the raw
+    and preprocessed frames never need to fit in memory. The split reads
+    only the target column, the training and validation sets are read from
+    disk as float32, and the test set is evaluated chunk by chunk without
+    being loaded. Otherwise, if feature_store_dir is set, features of
+    unchanged products are read from the persistent feature store instead
+    of being recomputed.
     """
     print("Starting product classification pipeline...")
 
     # Setup MLflow
     setup_mlflow(mlflow_tracking_uri, mlflow_experiment_name)
 
-    # Step 1: Load data
-    raw_data = load_raw_data_task(data_path)
-
-    # Step 2: Preprocess
-    processed_data = preprocess_data_task(raw_data)
-
-    # Step 3: Build features
-    features = build_features_task(processed_data)
-
-    # Combine features with target
-    if "category" in processed_data.columns:
-        features["category"] = processed_data["category"]
-
-    # Step 4: Split data
-    data_splits = split_data_task(
-        features, test_size=test_size, random_seed=random_seed
-    )
+    chunked = bool(chunksize and data_path)
+    if chunked:
+        # Steps 1-3: Load, preprocess and build features chunk by chunk
+        build_features_chunked_task(data_path, features_dir, chunksize)
+
+        # Step 4: Split data (index arrays saved next to the chunked features)
+        splits = split_chunked_features_task(features_dir, test_size, random_seed)
+        X_train, y_train = load_split_chunked_task(features_dir, splits, "train")
+        X_val, y_val = load_split_chunked_task(features_dir, splits, "val")
+    else:
+        # Step 1: Load data
+        raw_data = load_raw_data_task(data_path)
+
+        # Step 2: Validate and preprocess
+        raw_data = validate_data_task(raw_data)
+        processed_data = preprocess_data_task(raw_data)
+
+        # Step 3: Build features
+        features = build_features_task(processed_data, feature_store_dir)
+
+        # Combine features with target
+        if "category" in processed_data.columns:
+            features["category"] = processed_data["category"]
+
+        # Step 4: Split data (kept per dataset in DEFAULT_SPLITS_DIR)
+        data_splits = split_data_task(
+            features, test_size=test_size, random_seed=random_seed
+        )
+        X_train, y_train = data_splits["X_train"], data_splits["y_train"]
+        X_val, y_val = data_splits["X_val"], data_splits["y_val"]
 
     # Step 5: Train model
     model, train_metrics = train_model_task(
-        data_splits["X_train"],
-        data_splits["y_train"],
-        data_splits["X_val"],
-        data_splits["y_val"],
-        config=model_config,
+        X_train, y_train, X_val, y_val, config=model_config
     )
 
     # Step 6: Evaluate model
-    test_metrics = evaluate_model_task(
-        model, data_splits["X_test"], data_splits["y_test"]
-    )
+    if chunked:
+        test_metrics = evaluate_model_chunked_task(model, features_dir, splits)
+    else:
+        test_metrics = evaluate_model_task(
+            model, data_splits["X_test"], data_splits["y_test"]
+        )
 
     # Step 7: Register model
     if register_model_flag:
@@ -1,15 +1,60 @@
 """Unit tests for data loading and preprocessing."""
 
+import gzip
+import hashlib
+import json
+import shutil
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
-from src.data.load import generate_sample_data, load_data
-from src.data.preprocess import preprocess_data, split_data
+import src.data.preprocess as preprocess_module
+from src.data.cache import get_cache_stats
+from src.data.download import _url_key, download_dataset
+from src.data.ingest import IngestStore
+from src.data.load import (
+    COLUMN_DTYPES,
+    generate_sample_data,
+    iter_data_chunks,
+    load_data,
+    load_partitioned,
+    save_data,
+)
+from src.data.preprocess import (
+    fit_fill_values,
+    normalize_titles,
+    preprocess_chunks,
+    preprocess_data,
+    split_data,
+)
+from src.data.rebalancing import (
+    nearest_neighbors,
+    rebalance_data,
+    smote_oversample,
+    stratified_reservoir_sample,
+)
+from src.data.splits import (
+    DatasetSplit,
+    load_or_create_splits,
+    stratified_fold_indices,
+)
+from src.data.synthetic import (
+    SKEWED_PROFILE,
+    generate_products,
+    generate_request_stream,
+    generate_to_files,
+    resolve_profile,
+)
+from src.data.validation import VIOLATIONS_COLUMN, DataValidator
+from src.features.build_features import build_features
 
 
 class TestData(unittest.TestCase):
@@ -53,6 +98,492 @@ class TestData(unittest.TestCase):
         self.assertEqual(len(X_train), len(y_train))
         self.assertEqual(len(X_test), len(y_test))
 
+    def test_columnar_formats(self):
+        """Test Parquet/Feather round trip with column projection and dtypes."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=100)
+            data["unused"] = 1
+            for name in ["products.parquet", "products.feather"]:
+                path = str(Path(temp_dir) / name)
+                save_data(data, path)
+
+                loaded = load_data(path, auto_generate=False)
+                self.assertNotIn("unused", loaded.columns)
+                self.assertEqual(len(loaded), 100)
+                self.assertEqual(loaded["price"].dtype, "float64")
+                self.assertEqual(loaded["reviews_count"].dtype, "int64")
+                self.assertEqual(list(loaded["title"]), list(data["title"]))
+
+                arrow = load_data(path, auto_generate=False, string_dtype="category")
+                self.assertEqual(arrow["title"].dtype, "string")
+                self.assertEqual(arrow["brand"].dtype, "category")
+                self.assertEqual(list(arrow["title"]), list(data["title"]))
+
+                chunks = list(iter_data_chunks(path, chunksize=30, columns=["price"]))
+                self.assertEqual([len(chunk) for chunk in chunks], [30, 30, 30, 10])
+                self.assertEqual(list(chunks[0].columns), ["price"])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_columnar_features_match_csv(self):
+        """Test CSV, Parquet and Feather inputs produce identical features."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=200)
+            data["reviews_count"] *= 10_000_019
+            with_missing = data.copy()
+            with_missing.loc[::9, "reviews_count"] = None
+            for frame in [data, with_missing]:
+                features = []
+                for name in ["products.csv", "products.parquet", "products.feather"]:
+                    path = str(Path(temp_dir) / name)
+                    save_data(frame, path)
+                    loaded = load_data(path, auto_generate=False)
+                    features.append(build_features(preprocess_data(loaded)))
+                for columnar in features[1:]:
+                    pd.testing.assert_frame_equal(
+                        columnar, features[0], check_exact=True
+                    )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_feather_chunks_by_record_batch(self):
+        """Test compressed Feather files are read record batch by record batch."""
+        import pyarrow.feather as feather
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=100)
+            path = str(Path(temp_dir) / "products.feather")
+            feather.write_feather(data, path, compression="lz4", chunksize=40)
+
+            chunks = list(iter_data_chunks(path, chunksize=30))
+            self.assertEqual([len(chunk) for chunk in chunks], [30, 10, 30, 10, 20])
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks, ignore_index=True), data.astype(COLUMN_DTYPES)
+            )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_csv_cache(self):
+        """Test the binary cache is reused until the CSV changes."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = str(Path(temp_dir) / "products.csv")
+            cache_dir = str(Path(temp_dir) / "cache")
+            generate_sample_data(n_samples=50).to_csv(path, index=False)
+
+            before = get_cache_stats()
+            first = load_data(path, auto_generate=False, cache_dir=cache_dir)
+            second = load_data(path, auto_generate=False, cache_dir=cache_dir)
+            after = get_cache_stats()
+            self.assertEqual(after["misses"] - before["misses"], 1)
+            self.assertEqual(after["hits"] - before["hits"], 1)
+            pd.testing.assert_frame_equal(first, second)
+
+            generate_sample_data(n_samples=60).to_csv(path, index=False)
+            third = load_data(path, auto_generate=False, cache_dir=cache_dir)
+            self.assertEqual(len(third), 60)
+            self.assertEqual(get_cache_stats()["misses"] - after["misses"], 1)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_download_cache(self):
+        """Test downloads resume, decompress, verify and are cached by content."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            csv_path = Path(temp_dir) / "products.csv"
+            generate_sample_data(n_samples=200).to_csv(csv_path, index=False)
+            gz_path = Path(temp_dir) / "products.csv.gz"
+            gz_bytes = gzip.compress(csv_path.read_bytes())
+            gz_path.write_bytes(gz_bytes)
+            url = gz_path.as_uri()
+            cache_dir = Path(temp_dir) / "downloads"
+
+            # An interrupted download left the first half behind
+            (cache_dir / "partial").mkdir(parents=True)
+            part_path = cache_dir / "partial" / f"{_url_key(url)}.part"
+            part_path.write_bytes(gz_bytes[: len(gz_bytes) // 2])
+
+            checksum = hashlib.sha256(gz_bytes).hexdigest()
+            path = download_dataset(url, str(cache_dir), sha256=checksum, chunk_size=64)
+            self.assertEqual(path.read_bytes(), csv_path.read_bytes())
+            self.assertEqual(
+                path.name, hashlib.sha256(path.read_bytes()).hexdigest() + ".csv"
+            )
+            self.assertFalse(part_path.exists())
+
+            # Cached: no access to the source at all
+            gz_path.unlink()
+            self.assertEqual(download_dataset(url, str(cache_dir)), path)
+            data = load_data(url, auto_generate=False, cache_dir=temp_dir)
+            self.assertEqual(len(data), 200)
+
+            gz_path.write_bytes(gz_bytes)
+            with self.assertRaises(ValueError):
+                download_dataset(url, str(cache_dir), sha256="0" * 64, refresh=True)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_validation_rules(self):
+        """Test invalid rows are counted per rule and quarantined."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=100)
+            data.loc[3, "price"] = -1.0
+            data.loc[5, "rating"] = 7.5
+            data.loc[5, "title"] = "   "
+            data.loc[8, "reviews_count"] = 10**9
+            data.loc[9, "title"] = None
+            data.loc[10, "price"] = None
+            data["title"] = data["title"].astype("category")
+
+            quarantine_path = str(Path(temp_dir) / "rejected.csv")
+            valid, report = DataValidator().validate(data, quarantine_path)
+            self.assertEqual(len(valid), 96)
+            self.assertEqual(report["n_rejected"], 4)
+            self.assertEqual(report["violations"]["price_negative"], 1)
+            self.assertEqual(report["violations"]["title_empty"], 2)
+            self.assertEqual(report["violations"]["title_too_long"], 0)
+
+            quarantined = pd.read_csv(quarantine_path)
+            self.assertEqual(
+                list(quarantined["product_id"]),
+                list(data.loc[[3, 5, 8, 9], "product_id"]),
+            )
+            self.assertEqual(
+                quarantined[VIOLATIONS_COLUMN].iloc[1],
+                "rating_out_of_range;title_empty",
+            )
+
+            with self.assertRaises(ValueError):
+                DataValidator([{"name": "x", "column": "price", "kind": "regex"}])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_rebalance_resampling(self):
+        """Test over- and undersampling keep rows aligned with their labels."""
+        y = pd.Series(["a"] * 60 + ["b"] * 25 + ["c"] * 5, index=range(100, 190))
+        X = pd.DataFrame({"row": np.arange(90)}, index=y.index)
+
+        X_over, y_over = rebalance_data(X, y, method="oversample")
+        self.assertEqual(y_over.value_counts().to_dict(), {"a": 60, "b": 60, "c": 60})
+        self.assertEqual(set(X_over["row"]), set(range(90)))
+        np.testing.assert_array_equal(y.to_numpy()[X_over["row"]], y_over.to_numpy())
+        self.assertEqual(list(X_over.index), list(range(180)))
+
+        X_under, y_under = rebalance_data(X, y, method="undersample")
+        self.assertEqual(y_under.value_counts().to_dict(), {"a": 5, "b": 5, "c": 5})
+        self.assertFalse(X_under["row"].duplicated().any())
+        np.testing.assert_array_equal(y.to_numpy()[X_under["row"]], y_under.to_numpy())
+
+    def test_smote_oversample(self):
+        """Test blockwise neighbours and SMOTE interpolation within classes."""
+        from sklearn.neighbors import NearestNeighbors
+
+        rng = np.random.default_rng(0)
+        points = rng.random((300, 4))
+        expected = NearestNeighbors(n_neighbors=6).fit(points).kneighbors(points)[1]
+        neighbors = nearest_neighbors(points, 5, block_elements=1000)
+        np.testing.assert_array_equal(neighbors, expected[:, 1:])
+
+        X = pd.DataFrame(
+            {
+                "x": np.concatenate([rng.random(80), rng.random(20) + 10.0]),
+                "flag": rng.integers(0, 2, 100),
+            }
+        )
+        y = pd.Series(["a"] * 80 + ["b"] * 20)
+        X_res, y_res = smote_oversample(X, y, batch_size=16, block_elements=100)
+        self.assertEqual(y_res.value_counts().to_dict(), {"a": 80, "b": 80})
+        pd.testing.assert_frame_equal(X_res.iloc[:100], X)
+        synthetic = X_res.iloc[100:]
+        self.assertTrue(synthetic["x"].between(10.0, 11.0).all())
+        self.assertEqual(X_res["flag"].dtype, X["flag"].dtype)
+
+        X_again, _ = smote_oversample(X, y, batch_size=16, block_elements=100)
+        pd.testing.assert_frame_equal(X_res, X_again)
+
+    def test_smote_oversample_sparse(self):
+        """Test SMOTE keeps sparse input sparse and matches the dense result."""
+        import scipy.sparse as sp
+
+        rng = np.random.default_rng(0)
+        dense = rng.random((100, 30), dtype=np.float32)
+        dense[dense < 0.7] = 0
+        X = sp.csr_matrix(dense)
+        y = pd.Series(["a"] * 80 + ["b"] * 20)
+
+        np.testing.assert_array_equal(
+            nearest_neighbors(X, 5, block_elements=100),
+            nearest_neighbors(dense, 5, block_elements=100),
+        )
+        X_res, y_res = smote_oversample(X, y, batch_size=16, block_elements=100)
+        X_dense, y_dense = smote_oversample(dense, y, batch_size=16, block_elements=100)
+        self.assertTrue(sp.isspmatrix_csr(X_res))
+        self.assertEqual(X_res.dtype, np.float32)
+        np.testing.assert_array_equal(X_res.toarray(), X_dense.to_numpy())
+        pd.testing.assert_series_equal(y_res, y_dense)
+
+    def test_stratified_reservoir_sample(self):
+        """Test one-pass sampling quotas and reproducibility."""
+        data = pd.DataFrame(
+            {
+                "row": np.arange(1000),
+                "category": ["a"] * 700 + ["b"] * 250 + ["c"] * 50,
+            }
+        ).sample(frac=1.0, random_state=0)
+
+        def chunks():
+            return (data.iloc[i : i + 64] for i in range(0, len(data), 64))
+
+        X, y = stratified_reservoir_sample(chunks(), sample_size=90)
+        self.assertEqual(y.value_counts().to_dict(), {"a": 30, "b": 30, "c": 30})
+        self.assertEqual(list(X.columns), ["row"])
+        np.testing.assert_array_equal(
+            data.set_index("row").loc[X["row"], "category"], y
+        )
+
+        X_again, _ = stratified_reservoir_sample(chunks(), sample_size=90)
+        pd.testing.assert_frame_equal(X, X_again)
+
+        _, y = stratified_reservoir_sample(
+            chunks(), sample_size=200, strategy="capped", class_cap=100
+        )
+        counts = y.value_counts()
+        self.assertEqual(len(y), 200)
+        self.assertLessEqual(counts["a"], 100)
+
+        _, y = stratified_reservoir_sample(
+            chunks(), sample_size=100, strategy="proportional", quotas={"c": 0}
+        )
+        self.assertEqual(len(y), 100)
+        self.assertNotIn("c", set(y))
+
+    def test_partitioned_directory(self):
+        """Test every partition is read and partition filters prune files."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=90)
+            dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+            for i, date in enumerate(dates):
+                part = data.iloc[i * 30 : (i + 1) * 30]
+                suffix = "csv" if i == 0 else "parquet"
+                path = Path(temp_dir) / f"date={date}" / f"part-0.{suffix}"
+                path.parent.mkdir()
+                save_data(part, str(path))
+            cache_dir = str(Path(temp_dir) / "cache")
+
+            loaded = load_data(temp_dir, auto_generate=False, cache_dir=cache_dir)
+            self.assertEqual(len(loaded), 90)
+            self.assertEqual(loaded["price"].dtype, "float64")
+            self.assertEqual(list(loaded["date"].unique()), dates)
+            self.assertEqual(list(loaded["product_id"]), list(data["product_id"]))
+
+            recent = load_partitioned(
+                temp_dir,
+                partition_filter={"date": lambda d: d >= "2024-01-02"},
+                cache_dir=cache_dir,
+            )
+            self.assertEqual(list(recent["date"].unique()), dates[1:])
+
+            globbed = load_data(
+                str(Path(temp_dir) / "date=*" / "*.parquet"), auto_generate=False
+            )
+            self.assertEqual(len(globbed), 60)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_sharded_generation(self):
+        """Test sharded output is the same for any number of workers."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            expected = generate_products(250, seed=7, shard_size=100)
+            self.assertEqual(expected["product_id"].iloc[-1], "PROD_000250")
+            self.assertTrue(expected["product_id"].is_unique)
+
+            for n_jobs in [1, 2]:
+                output_dir = str(Path(temp_dir) / f"jobs_{n_jobs}")
+                written = generate_to_files(
+                    250, output_dir, seed=7, shard_size=100, n_jobs=n_jobs
+                )
+                self.assertEqual(written, 250)
+                loaded = load_data(output_dir, auto_generate=False)
+                pd.testing.assert_frame_equal(
+                    loaded,
+                    expected.astype(COLUMN_DTYPES),
+                )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_skewed_and_drifted_generation(self):
+        """Test skew profiles, drift scenarios and request streams."""
+        skewed = generate_products(5000, profile=SKEWED_PROFILE)
+        self.assertGreater(skewed["brand"].value_counts(normalize=True).iloc[0], 0.2)
+
+        drifted = generate_products(
+            5000, profile=resolve_profile(drift="new_brands"), period=2
+        )
+        self.assertTrue(drifted["brand"].str.startswith("NewBrand_").any())
+        self.assertFalse(drifted["product_id"].isin(skewed["product_id"]).any())
+
+        inflated = generate_products(
+            5000, profile=resolve_profile(drift="price_inflation"), period=10
+        )
+        self.assertGreater(inflated["price"].mean(), skewed["price"].mean())
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = str(Path(temp_dir) / "requests.jsonl")
+            generate_request_stream(500, path, repeat_ratio=0.4)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 500)
+            self.assertIn("title", records[0]["request"])
+            n_unique = len({record["product_id"] for record in records})
+            self.assertTrue(250 < n_unique < 350)
+            self.assertTrue(records[0]["product_id"].startswith("REQ_"))
+            # Not the products of a neighbouring dataset seed
+            training_titles = set(generate_products(n_unique, seed=43)["title"])
+            self.assertLess(
+                sum(r["request"]["title"] in training_titles for r in records), 10
+            )
+
+            generate_request_stream(500, path + ".2", repeat_ratio=0.4)
+            with open(path) as a, open(path + ".2") as b:
+                self.assertEqual(a.read(), b.read())
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_preprocess_inplace_and_chunks(self):
+        """Test fused title cleaning, in-place mode and chunked preprocessing."""
+        titles = pd.Series(["  Nike  PRO\tShoe ", None, "a\n b", "  Nike  PRO\tShoe "])
+        expected = (
+            titles.fillna("Unknown Product")
+            .str.lower()
+            .str.strip()
+            .str.replace(r"\s+", " ", regex=True)
+        )
+        pd.testing.assert_series_equal(normalize_titles(titles), expected)
+
+        data = generate_sample_data(n_samples=300)
+        data.loc[::7, "price"] = None
+        data.loc[::5, "title"] = None
+        data = pd.concat([data, data.iloc[:10]], ignore_index=True)
+
+        copied = preprocess_data(data)
+        self.assertTrue(data["price"].isna().any())
+        inplace = preprocess_data(data.copy(), inplace=True)
+        pd.testing.assert_frame_equal(inplace, copied)
+
+        chunks = [data.iloc[i : i + 100].copy() for i in range(0, len(data), 100)]
+        fill_values = fit_fill_values(chunks)
+        self.assertEqual(fill_values["price"], data["price"].median())
+        chunked = pd.concat(preprocess_chunks(chunks, fill_values))
+        pd.testing.assert_frame_equal(chunked, copied)
+
+    def test_preprocess_chunks_dedup_index(self):
+        """Test cross-chunk dedup when the seen-id index spans many blocks."""
+        data = generate_sample_data(n_samples=200)
+        rng = np.random.default_rng(0)
+        data = data.iloc[rng.integers(0, len(data), 500)].reset_index(drop=True)
+        chunks = [data.iloc[i : i + 30].copy() for i in range(0, len(data), 30)]
+        fill_values = fit_fill_values(chunks)
+
+        block_rows = preprocess_module._INDEX_BLOCK_ROWS
+        preprocess_module._INDEX_BLOCK_ROWS = 7
+        try:
+            chunked = pd.concat(preprocess_chunks(chunks, fill_values))
+        finally:
+            preprocess_module._INDEX_BLOCK_ROWS = block_rows
+        pd.testing.assert_frame_equal(chunked, preprocess_data(data, fill_values))
+
+    def test_ingest_store(self):
+        """Test batches are deduplicated against everything ingested before."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=300)
+            IngestStore(temp_dir).append(data.iloc[:200])
+
+            # Reopen so the index is read back from disk
+            store = IngestStore(temp_dir)
+            delta = pd.concat([data.iloc[150:], data.iloc[250:260]])
+            stats = store.append(delta)
+            self.assertEqual(stats["skipped"], 50)
+            self.assertEqual(stats["duplicates"], 10)
+            self.assertEqual(stats["appended"], 100)
+            loaded = load_data(temp_dir, auto_generate=False)
+            self.assertEqual(sorted(loaded["product_id"]), list(data["product_id"]))
+
+            updated = data.iloc[:5].copy()
+            updated["price"] = -1.0
+            stats = store.append(updated, mode="replace")
+            self.assertEqual(stats["replaced"], 5)
+            current = store.load()
+            self.assertEqual(len(current), len(store))
+            self.assertEqual(len(current), 300)
+            self.assertTrue(current["product_id"].is_unique)
+            self.assertEqual((current["price"] == -1.0).sum(), 5)
+            np.testing.assert_array_equal(
+                store.contains(pd.Series(["PROD_000001", "PROD_999999"])),
+                [True, False],
+            )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_index_splits(self):
+        """Test stratified index splits are disjoint, persisted and reused."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data = generate_sample_data(n_samples=1000)
+            path = str(Path(temp_dir) / "splits.npz")
+            splits = load_or_create_splits(data["category"], path, random_seed=1)
+
+            all_rows = np.concatenate([splits["train"], splits["val"], splits["test"]])
+            np.testing.assert_array_equal(np.sort(all_rows), np.arange(len(data)))
+            sizes = splits.sizes()
+            self.assertAlmostEqual(sizes["test"], 200, delta=12)
+            self.assertAlmostEqual(sizes["val"], 160, delta=12)
+            test_share = (
+                splits.take(data["category"], "test").value_counts()
+                / data["category"].value_counts()
+            )
+            self.assertTrue(((test_share - 0.2).abs() < 0.05).all())
+
+            sets = splits.train_val_test(data)
+            self.assertNotIn("category", sets["X_train"].columns)
+            self.assertEqual(len(sets["X_val"]), sizes["val"])
+            self.assertTrue(sets["y_test"].index.equals(sets["X_test"].index))
+
+            reused = load_or_create_splits(data["category"], path, random_seed=1)
+            np.testing.assert_array_equal(reused["test"], splits["test"])
+            changed = data["category"].iloc[::-1].reset_index(drop=True)
+            recomputed = load_or_create_splits(changed, path, random_seed=1)
+            self.assertNotEqual(
+                recomputed.meta["labels_hash"], splits.meta["labels_hash"]
+            )
+            self.assertEqual(DatasetSplit.load(path).meta, recomputed.meta)
+
+            # Without a path, each dataset keeps its own file in cache_dir
+            cache_dir = str(Path(temp_dir) / "splits")
+            load_or_create_splits(data["category"], cache_dir=cache_dir)
+            load_or_create_splits(changed, cache_dir=cache_dir)
+            self.assertEqual(len(list(Path(cache_dir).glob("*.npz"))), 2)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_stratified_folds(self):
+        """Test every class is spread evenly over the folds."""
+        labels = generate_sample_data(n_samples=1000)["category"]
+        folds = stratified_fold_indices(labels, n_folds=5, random_seed=1)
+
+        self.assertEqual(set(folds), set(range(5)))
+        counts = pd.crosstab(labels, folds)
+        self.assertTrue(((counts.max(axis=1) - counts.min(axis=1)) <= 1).all())
+        with self.assertRaises(ValueError):
+            stratified_fold_indices(labels, n_folds=1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,220 @@
+"""Unit tests for feature engineering."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+from src.data.load import apply_string_dtype, generate_sample_data
+from src.data.preprocess import preprocess_data
+from src.data.splits import SPLITS_FILE, iter_split_chunks, split_chunked_features
+from src.data.validation import DataValidator
+from src.features.build_features import (
+    FeatureTransformer,
+    build_features,
+    build_title_ngram_features,
+    hash_feature,
+)
+from src.features.feature_store import FeatureStore
+from src.features.parallel import build_features_parallel
+from src.features.streaming import (
+    QUARANTINE_FILE,
+    build_features_chunked,
+    fit_transformer_chunked,
+    load_chunked_features,
+)
+from src.features.vocabulary import OOV_CODE, VocabularyEncoder
+
+
+class TestFeatures(unittest.TestCase):
+    """Test cases for feature engineering."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.temp_dir = tempfile.mkdtemp()
+        raw_data = generate_sample_data(n_samples=1000)
+        raw_data.loc[::7, "price"] = np.nan
+        raw_data.loc[::11, "rating"] = np.nan
+        self.raw_data = raw_data
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_build_features_matches_per_row_computation(self):
+        """Test factorized features equal computing every row separately."""
+        data = self.raw_data.copy()
+        data.loc[::5, "brand"] = np.nan
+        data.loc[::9, "title"] = np.nan
+        features = build_features(data)
+
+        for col in ["seller_id", "brand", "subcategory"]:
+            expected = data[col].apply(hash_feature)
+            np.testing.assert_array_equal(features[f"{col}_hashed"], expected)
+
+        price_bins = pd.cut(
+            data["price"], bins=5, labels=[f"price_range_{i}" for i in range(5)]
+        )
+        cross = (data["brand"].astype(str) + "_" + price_bins.astype(str)).apply(
+            hash_feature
+        )
+        np.testing.assert_array_equal(features["brand_price_cross_hashed"], cross)
+
+        title_length = data["title"].str.len().fillna(0)
+        np.testing.assert_array_equal(features["title_length"], title_length)
+        has_pro = data["title"].str.contains("pro", case=False, na=False)
+        np.testing.assert_array_equal(features["title_has_pro"], has_pro.astype(int))
+
+        ngrams = build_title_ngram_features(data["title"], 64)
+        self.assertEqual(ngrams.shape, (len(data), 64))
+        self.assertEqual(ngrams[0].nnz, 0)
+        np.testing.assert_array_equal(
+            ngrams[1].toarray(),
+            build_title_ngram_features(data["title"].iloc[1:2], 64).toarray(),
+        )
+
+    def test_transformer_matches_build_features(self):
+        """Test fitted transformer reproduces in-memory features."""
+        expected = build_features(preprocess_data(self.raw_data))
+
+        transformer = FeatureTransformer().fit(self.raw_data)
+        actual = transformer.transform(transformer.preprocess(self.raw_data))
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_string_dtypes_match_object_features(self):
+        """Test Arrow and categorical strings survive preprocessing unchanged."""
+        raw_data = self.raw_data.copy()
+        raw_data.loc[::5, "brand"] = np.nan
+        raw_data.loc[::9, "title"] = np.nan
+        expected = build_features(preprocess_data(raw_data))
+
+        for string_dtype in ["pyarrow", "category"]:
+            processed = preprocess_data(apply_string_dtype(raw_data, string_dtype))
+            self.assertEqual(processed["title"].dtype, "string")
+            if string_dtype == "category":
+                self.assertEqual(processed["brand"].dtype, "category")
+            pd.testing.assert_frame_equal(build_features(processed), expected)
+
+    def test_vocabulary_encoder(self):
+        """Test frequent values get distinct codes and rare/unseen map to OOV."""
+        train = pd.DataFrame({"brand": ["a"] * 3 + ["b"] * 2 + ["c"]})
+        encoder = VocabularyEncoder(columns=["brand"], min_count=2).fit(train)
+
+        codes = encoder.encode(pd.Series(["a", "b", "c", "unseen", None]), "brand")
+
+        self.assertEqual(len({codes[0], codes[1]}), 2)
+        self.assertNotIn(OOV_CODE, codes[:2])
+        self.assertTrue((codes[2:] == OOV_CODE).all())
+
+    def test_transformer_vocabulary_encoding(self):
+        """Test vocabulary encoding replaces the hashed categoricals."""
+        transformer = FeatureTransformer(
+            {
+                "hash_buckets": 1000,
+                "price_bins": 5,
+                "categorical_encoding": "vocabulary",
+            }
+        ).fit(self.raw_data)
+        features = transformer.transform(transformer.preprocess(self.raw_data))
+
+        self.assertEqual(
+            transformer.categorical_features,
+            ["seller_id_code", "brand_code", "subcategory_code"],
+        )
+        for col in transformer.categorical_features:
+            self.assertIn(col, features.columns)
+        self.assertNotIn("seller_id_hashed", features.columns)
+        self.assertGreater(features["brand_code"].nunique(), 1)
+
+    def test_build_features_parallel(self):
+        """Test parallel feature building matches serial output and order."""
+        processed = preprocess_data(self.raw_data)
+        expected = build_features(processed)
+
+        actual = build_features_parallel(
+            processed, n_jobs=2, n_shards=3, min_rows_per_shard=1
+        )
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_feature_store_recomputes_changed_rows(self):
+        """Test feature store only recomputes new or changed products."""
+        processed = preprocess_data(self.raw_data)
+        store_dir = str(Path(self.temp_dir) / "store")
+
+        first = FeatureStore(store_dir).build_features(processed)
+        pd.testing.assert_frame_equal(first, build_features(processed))
+
+        changed = processed.copy()
+        changed.loc[changed.index[0], "reviews_count"] += 1
+        store = FeatureStore(store_dir)
+        second = store.build_features(changed)
+        self.assertEqual(store.last_stats, {"hits": len(processed) - 1, "computed": 1})
+        self.assertEqual(
+            second["reviews_count"].iloc[0], first["reviews_count"].iloc[0] + 1
+        )
+        pd.testing.assert_frame_equal(second.iloc[1:], first.iloc[1:])
+
+        store = FeatureStore(
+            store_dir, feature_config={"hash_buckets": 10, "price_bins": 5}
+        )
+        store.build_features(processed)
+        self.assertEqual(store.last_stats["hits"], 0)
+
+    def test_build_features_chunked(self):
+        """Test chunked feature dataset matches in-memory features."""
+        processed = preprocess_data(self.raw_data)
+        expected = build_features(processed)
+        expected["category"] = processed["category"]
+
+        csv_path = Path(self.temp_dir) / "products.csv"
+        self.raw_data.to_csv(csv_path, index=False)
+        store_dir = Path(self.temp_dir) / "features"
+        metadata = build_features_chunked(str(csv_path), str(store_dir), chunksize=128)
+
+        self.assertEqual(metadata["n_rows"], len(expected))
+        self.assertEqual(len(metadata["files"]), 8)
+        actual = load_chunked_features(str(store_dir))
+        pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
+
+        splits = split_chunked_features(str(store_dir))
+        self.assertTrue((store_dir / SPLITS_FILE).exists())
+        test_rows = pd.concat(iter_split_chunks(str(store_dir), splits, "test"))
+        pd.testing.assert_frame_equal(test_rows, splits.take(actual, "test"))
+
+        invalid = self.raw_data.copy()
+        invalid.loc[[0, 500], "price"] = -1.0
+        invalid.to_csv(csv_path, index=False)
+        metadata = build_features_chunked(
+            str(csv_path), str(store_dir), chunksize=128, validator=DataValidator()
+        )
+        self.assertEqual(metadata["validation"]["n_rejected"], 2)
+        self.assertEqual(len(pd.read_csv(store_dir / QUARANTINE_FILE)), 2)
+
+        # Rows failing only the title rules stay out of the fit pass too
+        invalid = self.raw_data.copy()
+        invalid.loc[[0, 500], "title"] = " "
+        invalid.loc[[0, 500], "price"] = 1e9
+        invalid.to_csv(csv_path, index=False)
+        valid_path = Path(self.temp_dir) / "valid.csv"
+        self.raw_data.drop(index=[0, 500]).to_csv(valid_path, index=False)
+        fitted = fit_transformer_chunked(
+            str(csv_path), chunksize=128, validator=DataValidator()
+        )
+        reference = fit_transformer_chunked(str(valid_path), chunksize=128)
+        pd.testing.assert_frame_equal(
+            fitted.transform(processed), reference.transform(processed)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 """Unit tests for model training."""
 
+import shutil
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -10,8 +12,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.data.load import generate_sample_data
 from src.data.preprocess import preprocess_data, split_data
-from src.features.build_features import build_features
-from src.models.train import train_model
+from src.features.build_features import build_features, build_sparse_features
+from src.models.cross_validation import FoldEnsemble, cross_validate
+from src.models.dataset_cache import get_dataset_cache_stats
+from src.models.search import hyperparameter_search, sample_configs
+from src.models.train import _clean_features, train_model
 
 
 class TestModels(unittest.TestCase):
@@ -60,6 +65,187 @@ class TestModels(unittest.TestCase):
         self.assertIn("train_accuracy", metrics)
         self.assertGreater(metrics["train_accuracy"], 0)
 
+        run = mlflow.get_run(mlflow.last_active_run().info.run_id)
+        for name in ["hits", "misses", "seconds_saved"]:
+            self.assertIn(f"data_cache_{name}", run.data.metrics)
+
+    def test_train_model_sparse_title_ngrams(self):
+        """Test training on sparse hashed title n-gram features."""
+        from sklearn.model_selection import train_test_split
+
+        import mlflow
+
+        mlflow.set_tracking_uri("file:./mlruns")
+
+        raw_data = generate_sample_data(n_samples=200)
+        processed_data = preprocess_data(raw_data)
+        X, feature_names = build_sparse_features(
+            processed_data,
+            {"hash_buckets": 1000, "price_bins": 5, "title_ngram_dim": 64},
+        )
+        y = processed_data["category"].reset_index(drop=True)
+        train_idx, val_idx = train_test_split(
+            range(X.shape[0]), test_size=0.2, random_state=42, stratify=y
+        )
+
+        model, metrics = train_model(
+            X[train_idx],
+            y.iloc[train_idx],
+            X[val_idx],
+            y.iloc[val_idx],
+            mlflow_experiment_name="test_experiment",
+            enable_reframing=False,
+            enable_checkpoints=False,
+            feature_names=feature_names,
+        )
+
+        self.assertEqual(model.feature_name(), feature_names)
+        self.assertEqual(model.predict(X[val_idx]).shape[0], len(val_idx))
+        self.assertIn("val_accuracy", metrics)
+
+    def test_train_model_dataset_cache(self):
+        """Test cached binary Datasets give the same model as fresh ones."""
+        import numpy as np
+
+        import mlflow
+
+        mlflow.set_tracking_uri("file:./mlruns")
+        temp_dir = tempfile.mkdtemp()
+        try:
+            config = {"objective": "multiclass", "max_bin": 63, "verbose": -1}
+            models = []
+            before = get_dataset_cache_stats()
+            for _ in range(2):
+                model, _ = train_model(
+                    self.X_train,
+                    self.y_train,
+                    self.X_test,
+                    self.y_test,
+                    config=dict(config),
+                    mlflow_experiment_name="test_experiment",
+                    enable_reframing=False,
+                    enable_checkpoints=False,
+                    dataset_cache_dir=temp_dir,
+                )
+                models.append(model)
+            after = get_dataset_cache_stats()
+
+            self.assertEqual(after["misses"] - before["misses"], 2)
+            self.assertEqual(after["hits"] - before["hits"], 2)
+            X = self.X_test.to_numpy(dtype=float)
+            np.testing.assert_allclose(models[0].predict(X), models[1].predict(X))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_clean_features_zero_copy(self):
+        """Test clean float inputs pass through and dirty frames are filled."""
+        import numpy as np
+        import pandas as pd
+
+        matrix = np.random.rand(10, 3).astype(np.float32)
+        self.assertIs(_clean_features(matrix), matrix)
+        frame = pd.DataFrame(matrix, columns=["a", "b", "c"])
+        self.assertIs(_clean_features(frame), frame)
+
+        frame.loc[0, "a"] = np.nan
+        cleaned = _clean_features(frame)
+        self.assertIsNot(cleaned, frame)
+        self.assertEqual(cleaned.loc[0, "a"], 0)
+        self.assertTrue(np.isnan(frame.loc[0, "a"]))
+
+    def test_sample_configs(self):
+        """Test grid and random schedules draw from the search space."""
+        space = {"num_leaves": [15, 31], "learning_rate": [0.05, 0.1, 0.2]}
+        grid = sample_configs(space, "grid", None)
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(len(sample_configs(space, "grid", 4)), 4)
+
+        ranges = {"num_leaves": (8, 64), "learning_rate": (0.01, 0.3, "log")}
+        for params in sample_configs(ranges, "random", 10):
+            self.assertIsInstance(params["num_leaves"], int)
+            self.assertTrue(8 <= params["num_leaves"] <= 64)
+            self.assertTrue(0.01 <= params["learning_rate"] <= 0.3)
+        with self.assertRaises(ValueError):
+            sample_configs(ranges, "grid", None)
+
+    def test_hyperparameter_search(self):
+        """Test random and halving searches log one nested run per trial."""
+        import mlflow
+
+        mlflow.set_tracking_uri("file:./mlruns")
+        space = {"num_leaves": [7, 15, 31], "learning_rate": [0.05, 0.2]}
+        for schedule, n_jobs in (("random", 1), ("halving", 2)):
+            result = hyperparameter_search(
+                self.X_train,
+                self.y_train,
+                self.X_test,
+                self.y_test,
+                search_space=space,
+                schedule=schedule,
+                n_trials=6,
+                n_jobs=n_jobs,
+                threads_per_trial=1,
+                num_boost_round=30,
+                startup_trials=2,
+                mlflow_experiment_name="test_search",
+            )
+            trials = result["trials"]
+            self.assertEqual(set(result["best_params"]), set(space))
+            self.assertEqual(result["best_val_loss"], trials["val_loss"].min())
+
+            search_run = mlflow.search_runs(
+                experiment_names=["test_search"],
+                filter_string=f"tags.mlflow.runName = 'search_{schedule}'",
+                max_results=1,
+            ).iloc[0]
+            children = mlflow.search_runs(
+                experiment_names=["test_search"],
+                filter_string=f"tags.mlflow.parentRunId = '{search_run.run_id}'",
+            )
+            self.assertEqual(len(children), len(trials))
+        # Halving trains 6 configurations, then the best 2 for longer
+        self.assertEqual(trials["rung"].tolist(), [0] * 6 + [1] * 2)
+
+    def test_cross_validate(self):
+        """Test sequential and parallel folds agree and models are kept."""
+        import numpy as np
+
+        import mlflow
+
+        mlflow.set_tracking_uri("file:./mlruns")
+        results = [
+            cross_validate(
+                self.X_train,
+                self.y_train,
+                n_folds=3,
+                n_jobs=n_jobs,
+                threads_per_fold=1,
+                keep=keep,
+                mlflow_experiment_name="test_cv",
+            )
+            for n_jobs, keep in ((1, "ensemble"), (3, "best"))
+        ]
+        sequential, parallel = results
+
+        self.assertEqual(len(sequential["folds"]), 3)
+        self.assertEqual(
+            sequential["folds"]["val_loss"].tolist(),
+            parallel["folds"]["val_loss"].tolist(),
+        )
+        self.assertGreater(sequential["metrics"]["oof_accuracy"], 0)
+        self.assertIn("cv_val_loss_std", sequential["metrics"])
+
+        ensemble = sequential["model"]
+        self.assertIsInstance(ensemble, FoldEnsemble)
+        proba = ensemble.predict(self.X_test)
+        self.assertEqual(proba.shape[0], len(self.X_test))
+        np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+        best_fold = parallel["folds"]["val_loss"].idxmin()
+        self.assertEqual(
+            parallel["model"].model_to_string(),
+            ensemble.boosters[best_fold].model_to_string(),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -10,13 +10,15 @@ os.environ['PYTHONPATH'] = str(project_root)
 
 # Import modules
 from src.data.load import load_data, generate_sample_data
-from src.data.preprocess import preprocess_data, split_data
+from src.data.preprocess import preprocess_data
+from src.data.splits import DEFAULT_SPLITS_DIR, load_or_create_splits
+from src.data.validation import DataValidator, print_validation_report
 from src.features.build_features import build_features
+from src.features.feature_store import FeatureStore
 from src.models.train import train_model, evaluate_model
 from src.tracking_utils.tracking import setup_mlflow
 import mlflow  # type: ignore
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 def main():
     """Simple training pipeline without Prefect."""
@@ -35,14 +37,24 @@ def main():
     data = load_data(auto_generate=True)  # Automatically generates sample data if none exists
     print(f"✓ Dataset ready: {len(data)} samples")
     
-    # Step 3: Preprocess
-    print("\n[3/6] Preprocessing data...")
-    processed_data = preprocess_data(data)
+    # Step 3: Validate and preprocess
+    print("\n[3/6] Validating and preprocessing data...")
+    # Rejected rows are kept in data/quarantine for inspection
+    data, validation_report = DataValidator().validate(
+        data, str(project_root / "data" / "quarantine" / "rejected.csv")
+    )
+    print_validation_report(validation_report)
+    processed_data = preprocess_data(data, inplace=True)
     print(f"✓ Preprocessed {len(processed_data)} samples")
     
     # Step 4: Build features
     print("\n[4/6] Building features...")
-    features = build_features(processed_data)
+    feature_store_dir = os.getenv("FEATURE_STORE_DIR")
+    if feature_store_dir:
+        # Only recompute features for new or changed products
+        features = FeatureStore(feature_store_dir).build_features(processed_data)
+    else:
+        features = build_features(processed_data)
     # Add target
     if "category" in processed_data.columns:
         features["category"] = processed_data["category"]
@@ -50,14 +62,19 @@ def main():
     
     # Step 5: Split data
     print("\n[5/6] Splitting data...")
-    X_train, X_test, y_train, y_test = split_data(
-        features, test_size=0.2, random_seed=42
-    )
-    
-    # Further split train into train and val
-    X_train_final, X_val, y_train_final, y_val = train_test_split(
-        X_train, y_train, test_size=0.2, random_state=42, stratify=y_train
+    # Stratified index arrays, persisted per dataset under data/cache/splits
+    # and reused while the labels match
+    splits = load_or_create_splits(
+        features["category"],
+        test_size=0.2,
+        val_size=0.2,
+        random_seed=42,
+        cache_dir=str(project_root / DEFAULT_SPLITS_DIR)
     )
+    data_splits = splits.train_val_test(features, target_column="category")
+    X_train_final, y_train_final = data_splits["X_train"], data_splits["y_train"]
+    X_val, y_val = data_splits["X_val"], data_splits["y_val"]
+    X_test, y_test = data_splits["X_test"], data_splits["y_test"]
     
     print(f"✓ Train: {len(X_train_final)}, Val: {len(X_val)}, Test: {len(X_test)}")
     